@@ -0,0 +1,53 @@
+"""
+Compares the time and memory it takes to construct clients:
+
+    python benchmarks/client_construction.py --package autoboto --service s3 -n 20
+
+"""
+import argparse
+import gc
+import importlib
+import time
+import tracemalloc
+
+import boto3
+
+
+def measure(name, func, n):
+    gc.collect()
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    clients = [func() for _ in range(n)]
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<40} {elapsed / n * 1000:>10.2f} ms {peak / n / 1024:>10.1f} KiB")
+    return clients
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--package", default="autoboto")
+    parser.add_argument("--service", default="s3")
+    parser.add_argument("--region", default="us-east-1")
+    parser.add_argument("-n", type=int, default=20)
+    args = parser.parse_args()
+
+    autoboto = importlib.import_module(args.package)
+    client_class = importlib.import_module(f"{args.package}.services.{args.service}").Client
+
+    print(f"{'per client':<40} {'time':>13} {'memory':>14}")
+    measure("boto3.client()", lambda: boto3.client(args.service, region_name=args.region), args.n)
+    # Lazy: the boto client is not created until the first operation call.
+    measure("Client()", lambda: client_class(region_name=args.region), args.n)
+    measure("Client()._boto_client", lambda: client_class(region_name=args.region)._boto_client, args.n)
+    pool = autoboto.ClientPool()
+    measure(
+        "ClientPool.get_client()._boto_client",
+        lambda: pool.get_client(client_class, region_name=args.region)._boto_client,
+        args.n,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Measures, each in a new interpreter, the time it takes to import the client and the shapes of a service
+and to use one of the shapes from the generated package directory, with and without bytecode,
+and from its bundle written by botogen with ``bundle`` on:
+
+    python benchmarks/cold_import.py --tree autoboto --bundle autoboto-cpython-37.zip --service ec2 -n 5
+
+boto3 is imported before the timer starts. The filesystem calls are the stat() and listdir() calls
+made while importing, each of which is a round trip on network filesystems.
+"""
+import argparse
+import compileall
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+TEMPLATE = """
+import sys
+sys.path.insert(0, {path!r})
+import boto3
+import posix
+import time
+
+# Count the stat() and listdir() calls through which the import system looks for modules.
+num_calls = 0
+
+def counting(func):
+    def wrapper(*args, **kwargs):
+        global num_calls
+        num_calls += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+posix.stat = counting(posix.stat)
+posix.listdir = counting(posix.listdir)
+
+started_at = time.perf_counter()
+from {package}.services.{service} import client, shapes
+shapes.{shape}
+print(time.perf_counter() - started_at, num_calls)
+"""
+
+
+def measure(code, n, python_args=()):
+    """
+    Returns the median time and the number of filesystem calls.
+    """
+    times = []
+    for _ in range(n):
+        output = subprocess.run(
+            [sys.executable, *python_args, "-c", code],
+            check=True,
+            stdout=subprocess.PIPE,
+        ).stdout
+        elapsed, num_calls = output.split()
+        times.append(float(elapsed))
+    return statistics.median(times), int(num_calls)
+
+
+def report(name, result):
+    elapsed, num_calls = result
+    print(f"{name:<50} {elapsed * 1000:>7.1f} ms {num_calls:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tree", required=True, help="directory of the generated package")
+    parser.add_argument("--bundle", required=True, help="zip archive of the generated package")
+    parser.add_argument("--service", default="ec2")
+    parser.add_argument("--shape", default="Instance")
+    parser.add_argument("-n", type=int, default=5)
+    args = parser.parse_args()
+
+    tree = Path(args.tree).resolve()
+    package = tree.name
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # A copy without bytecode
+        shutil.copytree(str(tree), str(Path(temp_dir) / package), ignore=shutil.ignore_patterns("__pycache__"))
+
+        def make_code(path):
+            return TEMPLATE.format(path=str(path), package=package, service=args.service, shape=args.shape)
+
+        num_files = sum(1 for path in (Path(temp_dir) / package).rglob("*") if path.is_file())
+        print(f"{'median of ' + str(args.n):<50} {'time':>10} {'fs calls':>10}")
+
+        # -B keeps Python from writing the bytecode so every run compiles the modules.
+        report(
+            f"directory tree of {num_files} files, no bytecode",
+            measure(make_code(temp_dir), args.n, python_args=["-B"]),
+        )
+
+        compileall.compile_dir(str(Path(temp_dir) / package), quiet=1)
+        report("directory tree, bytecode in __pycache__", measure(make_code(temp_dir), args.n))
+
+    report("bundle", measure(make_code(Path(args.bundle).resolve()), args.n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Measures the throughput of ``from_boto()`` and ``to_boto()`` on a payload of a shape with every
+attribute set, in one or more generated packages, for example a pure Python one
+and one built with ``compile`` on:
+
+    python benchmarks/conversion.py --tree autoboto --tree compiled/autoboto --service ec2 --shape Instance
+
+Each package is measured in a new interpreter. Lists in the payload have three items
+and recursive shapes are cut off after a few levels.
+"""
+import argparse
+import datetime
+import importlib
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+MAX_DEPTH = 4
+LIST_LENGTH = 3
+
+
+def sample_payload(type_info_class, type_, depth=0):
+    type_info = type_info_class(type_)
+    if type_info.is_any or type_info.type is str:
+        return "value"
+    elif type_info.type is datetime.datetime:
+        return datetime.datetime(2020, 1, 1)
+    elif type_info.type in (int, float, bool):
+        return type_info.type(1)
+    elif type_info.is_enum:
+        return next(iter(type_info.type)).value
+    elif type_info.is_primitive:
+        return "value"
+    elif type_info.is_sequence:
+        return [sample_payload(type_info_class, type_info.list_item_type, depth) for _ in range(LIST_LENGTH)]
+    elif type_info.is_dict:
+        return {
+            f"key{i}": sample_payload(type_info_class, type_info.dict_value_type, depth)
+            for i in range(LIST_LENGTH)
+        }
+    elif type_info.is_dataclass:
+        if depth >= MAX_DEPTH:
+            return {}
+        return {
+            boto_name: sample_payload(type_info_class, attr_type.type, depth + 1)
+            for _, boto_name, attr_type in type_info.type._get_cached_boto_mapping()
+        }
+    raise TypeError(type_)
+
+
+def measure(tree: Path, service: str, shape: str, duration: float):
+    sys.path.insert(0, str(tree.parent))
+    package = importlib.import_module(tree.name)
+    shape_type = getattr(importlib.import_module(f"{tree.name}.services.{service}.shapes"), shape)
+    convert = sys.modules.get(f"{tree.name}._convert")
+
+    payload = sample_payload(package.TypeInfo, shape_type)
+    value = shape_type.from_boto(payload)
+    assert value.to_boto() == payload
+
+    results = []
+    for name, func in [("from_boto", lambda: shape_type.from_boto(payload)), ("to_boto", value.to_boto)]:
+        func()
+        num_calls = 0
+        started_at = time.perf_counter()
+        while time.perf_counter() - started_at < duration:
+            for _ in range(10):
+                func()
+            num_calls += 10
+        results.append((name, num_calls / (time.perf_counter() - started_at)))
+
+    compiled = convert is not None and not convert.__file__.endswith(".py")
+    for name, calls_per_second in results:
+        print(f"{str(tree):<40} {'compiled' if compiled else 'pure':<10} {name:<10} {calls_per_second:>10.0f}/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tree", action="append", required=True, help="directory of a generated package")
+    parser.add_argument("--service", default="ec2")
+    parser.add_argument("--shape", default="Instance")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per measurement")
+    parser.add_argument("--in-process", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.in_process:
+        measure(Path(args.tree[0]).resolve(), args.service, args.shape, args.duration)
+        return
+
+    for tree in args.tree:
+        subprocess.run(
+            [
+                sys.executable, __file__, "--in-process", "--tree", tree,
+                "--service", args.service, "--shape", args.shape, "--duration", str(args.duration),
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measures, each in a new interpreter, the time it takes to import the shapes of a service,
+to use one of them, and to use all of them:
+
+    python benchmarks/import_time.py --package autoboto --service ec2 --shape Instance -n 5
+
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import textwrap
+
+SCENARIOS = {
+    "import shapes": "",
+    "import shapes + {shape}": """
+        shapes.{shape}
+    """,
+    "import shapes + {shape}.from_boto()": """
+        shapes.{shape}.from_boto({{}})
+    """,
+    "import shapes + all shapes": """
+        for name in dir(shapes):
+            getattr(shapes, name)
+    """,
+}
+
+TEMPLATE = """
+import time
+started_at = time.perf_counter()
+from {package}.services.{service} import shapes
+{scenario}
+print(time.perf_counter() - started_at)
+"""
+
+
+def make_code(args, scenario):
+    return TEMPLATE.format(
+        package=args.package,
+        service=args.service,
+        scenario=textwrap.dedent(scenario.format(shape=args.shape)),
+    )
+
+
+def measure(code, n):
+    times = []
+    for _ in range(n):
+        output = subprocess.run([sys.executable, "-c", code], check=True, stdout=subprocess.PIPE).stdout
+        times.append(float(output))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--package", default="autoboto")
+    parser.add_argument("--service", default="ec2")
+    parser.add_argument("--shape", default="Instance")
+    parser.add_argument("-n", type=int, default=5)
+    args = parser.parse_args()
+
+    # Write the bytecode of all modules before measuring.
+    measure(make_code(args, SCENARIOS["import shapes + all shapes"]), 1)
+
+    print(f"{'median of ' + str(args.n):<50} {'time':>10}")
+    for name, scenario in SCENARIOS.items():
+        elapsed = measure(make_code(args, scenario), args.n)
+        print(f"{name.format(shape=args.shape):<50} {elapsed * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
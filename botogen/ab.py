@@ -8,6 +8,7 @@ from typing import ClassVar, Dict, Iterator, Optional
 import botocore.loaders
 import botocore.model
 import botocore.paginate
+from botocore.exceptions import DataNotFoundError
 from cached_property import cached_property
 
 
@@ -138,6 +139,15 @@ class AbShapeResolver(botocore.model.ShapeResolver):
 
 
 class AbOperationModel(botocore.model.OperationModel):
+    READ_ONLY_PREFIXES = ("Describe", "Get", "Head", "List")
+
+    @property
+    def is_read_only(self):
+        """
+        botocore models do not mark operations as side-effect free so we rely
+        on the naming convention that all AWS APIs follow.
+        """
+        return self.name.startswith(self.READ_ONLY_PREFIXES)
 
     def get_paginator(self) -> Optional[Dict]:
         if self._service_model.paginator_model:
@@ -153,8 +163,8 @@ class AbPaginatorModel(botocore.paginate.PaginatorModel):
 
 
 class AbServiceModel(botocore.model.ServiceModel):
+    # Used unless a loader is passed to __init__.
     loader: ClassVar = botocore.loaders.Loader()
-    services_with_paginators: ClassVar = loader.list_available_services("paginators-1")
     autoboto_shape_map_additions: ClassVar = {
         "ResponseMetadataKey": {
             "type": "string",
@@ -175,13 +185,17 @@ class AbServiceModel(botocore.model.ServiceModel):
 
     paginator_model: Optional[AbPaginatorModel] = None
 
-    def __init__(self, service_name):
+    def __init__(self, service_name, loader: botocore.loaders.Loader = None):
+        loader = loader or self.loader
         super().__init__(
-            self.loader.load_service_model(service_name, "service-2"),
+            loader.load_service_model(service_name, "service-2"),
             service_name,
         )
-        if service_name in self.services_with_paginators:
-            self.paginator_model = AbPaginatorModel(self.loader.load_service_model(service_name, "paginators-1"))
+        try:
+            self.paginator_model = AbPaginatorModel(loader.load_service_model(service_name, "paginators-1"))
+        except DataNotFoundError:
+            # The service has no paginators
+            pass
         self._shape_resolver = AbShapeResolver(
             shape_map=self._service_description.get('shapes', {}),
             operations_map=self._service_description.get('operations', {}),
@@ -0,0 +1,62 @@
+__version__ = "0.4.3"
+
+from typing import TYPE_CHECKING, Tuple
+
+from .core.lazy import lazy_package
+
+if TYPE_CHECKING:
+    from .core import (
+        AdaptiveRateController, CachePolicy, ClientBase, ClientPool, DiskCredentialCache, HedgingPolicy,
+        OutputShapeBase, ResponseCache, S3ObjectCache, ShapeBase, SqliteResponseCache, TypeInfo, from_boto,
+        issubtype, shared_client_pool, shared_rate_controller, to_boto, warmup
+    )
+
+# The core modules are imported on first access of the classes and functions they define.
+lazy_package(__name__, {
+    "AdaptiveRateController": (".core", "AdaptiveRateController"),
+    "CachePolicy": (".core", "CachePolicy"),
+    "ClientBase": (".core", "ClientBase"),
+    "ClientPool": (".core", "ClientPool"),
+    "DiskCredentialCache": (".core", "DiskCredentialCache"),
+    "HedgingPolicy": (".core", "HedgingPolicy"),
+    "OutputShapeBase": (".core", "OutputShapeBase"),
+    "ResponseCache": (".core", "ResponseCache"),
+    "S3ObjectCache": (".core", "S3ObjectCache"),
+    "ShapeBase": (".core", "ShapeBase"),
+    "SqliteResponseCache": (".core", "SqliteResponseCache"),
+    "TypeInfo": (".core", "TypeInfo"),
+    "from_boto": (".core", "from_boto"),
+    "issubtype": (".core", "issubtype"),
+    "shared_client_pool": (".core", "shared_client_pool"),
+    "shared_rate_controller": (".core", "shared_rate_controller"),
+    "to_boto": (".core", "to_boto"),
+    "warmup": (".core", "warmup"),
+})
+
+botocore_version: Tuple[int, int, int] = None
+try:
+    from .versions import botocore_version  # noqa
+except ImportError:
+    pass
+
+__all__ = [
+    "AdaptiveRateController",
+    "CachePolicy",
+    "ClientBase",
+    "ClientPool",
+    "DiskCredentialCache",
+    "HedgingPolicy",
+    "OutputShapeBase",
+    "ResponseCache",
+    "S3ObjectCache",
+    "ShapeBase",
+    "SqliteResponseCache",
+    "TypeInfo",
+    "from_boto",
+    "issubtype",
+    "shared_client_pool",
+    "shared_rate_controller",
+    "to_boto",
+    "warmup",
+    "botocore_version",
+]
@@ -0,0 +1,217 @@
+"""
+Conversion of values between boto and shapes, re-exported by ``core.shapes``.
+
+This module is the hot path of conversion-heavy code, so it is written in the subset of Python
+which mypyc compiles to a C extension: types are explicit, classes are final, and the kind of
+conversion of each type is worked out once instead of on every value. botogen compiles it when
+``compile`` is on, and the pure Python module is used where the extension is missing or was built
+for another interpreter.
+
+It is not in ``core`` because the compiled module is looked up through the attributes of its
+parent packages, and ``core`` only becomes an attribute of the package once it is imported.
+"""
+import typing
+
+from typing_extensions import Final, final
+
+from .core.type_info import TypeInfo
+
+# Kinds of conversion
+_AS_IS: Final = 0
+_ENUM: Final = 1
+_SEQUENCE: Final = 2
+_DICT: Final = 3
+_SHAPE: Final = 4
+_UNSUPPORTED: Final = 5
+
+
+@final
+class _Falsey:
+    def __init__(self, name: str) -> None:
+        assert name
+        self._name = name
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return self._name
+
+    def __str__(self) -> str:
+        return self._name
+
+
+# Value of attributes of shapes which are not set, see ShapeBase.NOT_SET.
+NOT_SET = _Falsey("NOT_SET")
+
+
+@final
+class Converter:
+    """
+    How to convert values of a type.
+    """
+
+    def __init__(self, type_info: TypeInfo) -> None:
+        self.type_info = type_info
+        self.type: typing.Any = type_info.type
+        self.item: typing.Optional[Converter] = None
+        # Mapping of attributes of shapes, resolved on first use because shapes refer to each other.
+        self._fields: typing.Optional[typing.List[typing.Tuple[str, str, Converter]]] = None
+
+        if type_info.is_any or type_info.is_primitive:
+            self.kind = _AS_IS
+        elif type_info.is_enum:
+            self.kind = _ENUM
+        elif type_info.is_sequence:
+            self.kind = _SEQUENCE
+            self.item = converter_for(type_info.list_item_type)
+        elif type_info.is_dict:
+            self.kind = _DICT
+            self.item = converter_for(type_info.dict_value_type)
+        elif type_info.is_dataclass:
+            self.kind = _SHAPE
+        else:
+            self.kind = _UNSUPPORTED
+
+        # Lists and dicts are built directly unless the annotation asks for another type.
+        self.builds_list = self.kind == _SEQUENCE and type_info([]).__class__ is list
+        self.builds_dict = self.kind == _DICT and type_info({}).__class__ is dict
+
+    @property
+    def fields(self) -> typing.List[typing.Tuple[str, str, "Converter"]]:
+        fields = self._fields
+        if fields is None:
+            fields = [
+                (attr_name, boto_name, converter_for(attr_type))
+                for attr_name, boto_name, attr_type in self.type._get_cached_boto_mapping()
+            ]
+            self._fields = fields
+        return fields
+
+
+_converters: typing.Dict[typing.Any, Converter] = {}
+
+
+def converter_for(type_: typing.Any) -> Converter:
+    """
+    Converter of a type or of a ``TypeInfo``, created on first use.
+    """
+    try:
+        return _converters[type_]
+    except (KeyError, TypeError):
+        # Not seen yet, or not hashable like TypeInfo
+        pass
+
+    if isinstance(type_, TypeInfo):
+        type_info = type_
+        type_ = type_info.type
+        try:
+            return _converters[type_]
+        except (KeyError, TypeError):
+            pass
+    else:
+        type_info = TypeInfo(type_)
+
+    converter = Converter(type_info)
+    try:
+        _converters[type_] = converter
+    except TypeError:
+        pass
+    return converter
+
+
+def from_boto(type_info: typing.Any, payload: typing.Any) -> typing.Any:
+    """
+    Converts ``payload`` as returned by boto to a value of the type.
+    """
+    if payload is None:
+        return None
+    return _from_boto(converter_for(type_info), payload)
+
+
+def _from_boto(converter: Converter, payload: typing.Any) -> typing.Any:
+    if payload is None:
+        return None
+
+    kind = converter.kind
+    if kind == _AS_IS:
+        return payload
+
+    elif kind == _ENUM:
+        try:
+            return converter.type(payload)
+        except ValueError:
+            # Return raw value for unexpected values because it looks
+            # like the lists aren't complete.
+            return payload
+
+    elif kind == _SEQUENCE:
+        item = converter.item
+        assert item is not None
+        items = [_from_boto(item, v) for v in payload]
+        return items if converter.builds_list else converter.type_info(items)
+
+    elif kind == _DICT:
+        value = converter.item
+        assert value is not None
+        values = {k: _from_boto(value, v) for k, v in payload.items()}
+        return values if converter.builds_dict else converter.type_info(values)
+
+    elif kind == _SHAPE:
+        payload = dict(payload)
+        attrs: typing.Dict[str, typing.Any] = {}
+        for attr_name, boto_name, attr_converter in converter.fields:
+            if boto_name not in payload:
+                continue
+            attr_value = payload.pop(boto_name)
+            if attr_value is not NOT_SET:
+                attrs[attr_name] = _from_boto(attr_converter, attr_value)
+
+        if payload:
+            raise ValueError(
+                f"Unexpected fields found in payload for {converter.type_info.name}: {', '.join(payload.keys())}"
+            )
+
+        return converter.type(**attrs)
+
+    raise TypeError((converter.type_info, payload))
+
+
+def to_boto(type_info: typing.Any, payload: typing.Any) -> typing.Any:
+    """
+    Converts ``payload``, a value of the type, to what boto expects.
+    """
+    if payload is None:
+        return None
+    return _to_boto(converter_for(type_info), payload)
+
+
+def _to_boto(converter: Converter, payload: typing.Any) -> typing.Any:
+    if payload is None:
+        return None
+
+    kind = converter.kind
+    if kind == _AS_IS or kind == _ENUM:
+        return payload
+
+    elif kind == _SEQUENCE:
+        item = converter.item
+        assert item is not None
+        items = [_to_boto(item, v) for v in payload]
+        return items if converter.builds_list else converter.type_info(items)
+
+    elif kind == _DICT:
+        value = converter.item
+        assert value is not None
+        values = {k: _to_boto(value, v) for k, v in payload.items()}
+        return values if converter.builds_dict else converter.type_info(values)
+
+    elif kind == _SHAPE:
+        boto_dict: typing.Dict[str, typing.Any] = {}
+        for attr_name, boto_name, attr_converter in converter.fields:
+            attr_value = getattr(payload, attr_name)
+            if attr_value is not NOT_SET:
+                boto_dict[boto_name] = _to_boto(attr_converter, attr_value)
+        return boto_dict
+
+    raise TypeError((converter.type_info, payload))
@@ -0,0 +1,116 @@
+import typing
+
+from .lazy import lazy_package
+
+if typing.TYPE_CHECKING:
+    from .batch_executor import (
+        BatchExecutor, BatchResult, BatchSpec, BatchStats, dynamodb_batch_write_item, kinesis_put_records,
+        s3_delete_objects, sqs_send_message_batch
+    )
+    from .batching import AutoBatchingClient
+    from .caching import CachePolicy, CacheStats, ResponseCache
+    from .client import ClientBase
+    from .client_pool import ClientPool, shared_client_pool
+    from .credentials import DiskCredentialCache
+    from .hedging import HedgingPolicy, LatencyHistogram
+    from .inventory import (
+        InventoryDiff, ResourceInventory, ResourceType, cloudformation_stacks, ec2_instances, s3_buckets
+    )
+    from .pipeline import Pipeline, PipelineCancelled, StageStats
+    from .rate_limiting import AdaptiveRateController, RateMetrics, shared_rate_controller
+    from .s3_object_cache import CachedObject, S3ObjectCache, S3ObjectCacheStats
+    from .shapes import OutputShapeBase, ShapeBase, from_boto, to_boto
+    from .sqlite_cache import SqliteResponseCache
+    from .type_info import TypeInfo, issubtype
+    from .warmup import WarmupReport, warmup
+
+# Imported on first access so that importing the package doesn't import every module of it.
+lazy_package(__name__, {
+    "BatchExecutor": (".batch_executor", "BatchExecutor"),
+    "BatchResult": (".batch_executor", "BatchResult"),
+    "BatchSpec": (".batch_executor", "BatchSpec"),
+    "BatchStats": (".batch_executor", "BatchStats"),
+    "dynamodb_batch_write_item": (".batch_executor", "dynamodb_batch_write_item"),
+    "kinesis_put_records": (".batch_executor", "kinesis_put_records"),
+    "s3_delete_objects": (".batch_executor", "s3_delete_objects"),
+    "sqs_send_message_batch": (".batch_executor", "sqs_send_message_batch"),
+    "AutoBatchingClient": (".batching", "AutoBatchingClient"),
+    "CachePolicy": (".caching", "CachePolicy"),
+    "CacheStats": (".caching", "CacheStats"),
+    "ResponseCache": (".caching", "ResponseCache"),
+    "ClientBase": (".client", "ClientBase"),
+    "ClientPool": (".client_pool", "ClientPool"),
+    "shared_client_pool": (".client_pool", "shared_client_pool"),
+    "DiskCredentialCache": (".credentials", "DiskCredentialCache"),
+    "HedgingPolicy": (".hedging", "HedgingPolicy"),
+    "LatencyHistogram": (".hedging", "LatencyHistogram"),
+    "InventoryDiff": (".inventory", "InventoryDiff"),
+    "ResourceInventory": (".inventory", "ResourceInventory"),
+    "ResourceType": (".inventory", "ResourceType"),
+    "cloudformation_stacks": (".inventory", "cloudformation_stacks"),
+    "ec2_instances": (".inventory", "ec2_instances"),
+    "s3_buckets": (".inventory", "s3_buckets"),
+    "Pipeline": (".pipeline", "Pipeline"),
+    "PipelineCancelled": (".pipeline", "PipelineCancelled"),
+    "StageStats": (".pipeline", "StageStats"),
+    "AdaptiveRateController": (".rate_limiting", "AdaptiveRateController"),
+    "RateMetrics": (".rate_limiting", "RateMetrics"),
+    "shared_rate_controller": (".rate_limiting", "shared_rate_controller"),
+    "CachedObject": (".s3_object_cache", "CachedObject"),
+    "S3ObjectCache": (".s3_object_cache", "S3ObjectCache"),
+    "S3ObjectCacheStats": (".s3_object_cache", "S3ObjectCacheStats"),
+    "OutputShapeBase": (".shapes", "OutputShapeBase"),
+    "ShapeBase": (".shapes", "ShapeBase"),
+    "from_boto": (".shapes", "from_boto"),
+    "to_boto": (".shapes", "to_boto"),
+    "SqliteResponseCache": (".sqlite_cache", "SqliteResponseCache"),
+    "TypeInfo": (".type_info", "TypeInfo"),
+    "issubtype": (".type_info", "issubtype"),
+    "WarmupReport": (".warmup", "WarmupReport"),
+    "warmup": (".warmup", "warmup"),
+})
+
+__all__ = [
+    "AdaptiveRateController",
+    "AutoBatchingClient",
+    "BatchExecutor",
+    "BatchResult",
+    "BatchSpec",
+    "BatchStats",
+    "CachePolicy",
+    "CacheStats",
+    "CachedObject",
+    "ClientBase",
+    "ClientPool",
+    "DiskCredentialCache",
+    "HedgingPolicy",
+    "InventoryDiff",
+    "LatencyHistogram",
+    "OutputShapeBase",
+    "Pipeline",
+    "PipelineCancelled",
+    "RateMetrics",
+    "ResourceInventory",
+    "ResourceType",
+    "ResponseCache",
+    "S3ObjectCache",
+    "S3ObjectCacheStats",
+    "ShapeBase",
+    "SqliteResponseCache",
+    "StageStats",
+    "WarmupReport",
+    "from_boto",
+    "to_boto",
+    "TypeInfo",
+    "issubtype",
+    "cloudformation_stacks",
+    "dynamodb_batch_write_item",
+    "ec2_instances",
+    "kinesis_put_records",
+    "s3_buckets",
+    "s3_delete_objects",
+    "sqs_send_message_batch",
+    "shared_client_pool",
+    "shared_rate_controller",
+    "warmup",
+]
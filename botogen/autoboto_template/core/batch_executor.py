@@ -0,0 +1,311 @@
+import concurrent.futures
+import heapq
+import importlib
+import itertools
+import random
+import time
+import typing
+
+import dataclasses
+from botocore.exceptions import ClientError
+
+from .rate_limiting import THROTTLING_ERROR_CODES
+from .shapes import ShapeBase
+
+# Error codes of individual entries which are worth retrying.
+RETRYABLE_ERROR_CODES = THROTTLING_ERROR_CODES.union([
+    "InternalError",
+    "InternalFailure",
+    "InternalServerError",
+    "ServiceUnavailable",
+    "Unprocessed",
+    # Errors of requests which didn't get a response, see BatchExecutor._send_chunk
+    "ConnectTimeoutError",
+    "ConnectionClosedError",
+    "EndpointConnectionError",
+    "ReadTimeoutError",
+])
+
+FailedEntries = typing.List[typing.Tuple[typing.Any, str]]
+
+
+@dataclasses.dataclass
+class BatchSpec:
+    """
+    Describes a batch API: its limits, how to send a chunk of entries,
+    and how to find the entries that failed.
+    """
+
+    # Maximum number of entries per request
+    max_count: int
+
+    # Sends a list of entries with the client and returns the response
+    send: typing.Callable[[typing.Any, typing.List], typing.Any]
+
+    # Given the entries sent and the response, returns a list of (entry, error_code) of failed entries.
+    get_failed: typing.Callable[[typing.List, typing.Any], FailedEntries]
+
+    # Maximum total size of entries per request, in bytes
+    max_bytes: typing.Optional[int] = None
+
+    # Size of one entry, in bytes.
+    entry_size: typing.Callable[[typing.Any], int] = None
+
+    retryable_error_codes: typing.FrozenSet[str] = RETRYABLE_ERROR_CODES
+
+    def get_entry_size(self, entry) -> int:
+        if self.entry_size is not None:
+            return self.entry_size(entry)
+        return payload_size(entry.to_boto() if isinstance(entry, ShapeBase) else entry)
+
+
+@dataclasses.dataclass
+class BatchStats:
+    num_entries: int = 0
+    num_succeeded: int = 0
+    num_failed: int = 0
+    num_requests: int = 0
+    num_retried_entries: int = 0
+    elapsed_time: float = 0.0
+
+
+@dataclasses.dataclass
+class BatchResult:
+    # Responses of all requests sent
+    responses: typing.List = dataclasses.field(default_factory=list)
+
+    # (entry, error_code) of entries that failed permanently or ran out of attempts
+    failed: FailedEntries = dataclasses.field(default_factory=list)
+
+    stats: BatchStats = dataclasses.field(default_factory=BatchStats)
+
+
+class BatchExecutor:
+    """
+    Sends an unbounded stream of entries to a batch API of a generated client.
+
+    Entries are chunked to the limits of the ``spec``, chunks are sent concurrently
+    by up to ``max_workers`` threads, and entries that come back unprocessed or failed
+    with a retryable error are re-queued with exponential backoff for up to
+    ``max_attempts`` attempts.
+
+    Usage:
+
+        result = BatchExecutor(sqs_client, sqs_send_message_batch(queue_url)).run(entries)
+
+    """
+
+    def __init__(
+        self,
+        client,
+        spec: BatchSpec,
+        max_workers: int = 4,
+        max_attempts: int = 5,
+        backoff_base: float = 0.1,
+        backoff_max: float = 20.0,
+    ):
+        self.client = client
+        self.spec = spec
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def run(self, entries: typing.Iterable) -> BatchResult:
+        started_at = time.monotonic()
+        result = BatchResult()
+        source = iter(entries)
+        pending = []  # entries taken from source which did not fit in the previous chunk
+        retries = []  # heap of (ready_at, sequence, attempt, entry)
+        sequence = itertools.count()
+        in_flight = set()
+        source_exhausted = False
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                while len(in_flight) < self.max_workers:
+                    chunk = []
+                    chunk_size = 0
+                    now = time.monotonic()
+
+                    while retries and retries[0][0] <= now and len(chunk) < self.spec.max_count:
+                        _, _, attempt, entry = retries[0]
+                        size = self.spec.get_entry_size(entry)
+                        if self.spec.max_bytes and chunk and chunk_size + size > self.spec.max_bytes:
+                            break
+                        heapq.heappop(retries)
+                        chunk.append((attempt, entry))
+                        chunk_size += size
+
+                    while len(chunk) < self.spec.max_count:
+                        if not pending:
+                            try:
+                                entry = next(source)
+                            except StopIteration:
+                                source_exhausted = True
+                                break
+                            result.stats.num_entries += 1
+                            pending.append(entry)
+                        entry = pending[0]
+                        size = self.spec.get_entry_size(entry)
+                        if self.spec.max_bytes and size > self.spec.max_bytes:
+                            pending.pop(0)
+                            result.failed.append((entry, "EntryTooLarge"))
+                            result.stats.num_failed += 1
+                            continue
+                        if self.spec.max_bytes and chunk_size + size > self.spec.max_bytes:
+                            break
+                        pending.pop(0)
+                        chunk.append((1, entry))
+                        chunk_size += size
+
+                    if not chunk:
+                        break
+                    in_flight.add(pool.submit(self._send_chunk, chunk))
+                    result.stats.num_requests += 1
+
+                if not in_flight:
+                    if source_exhausted and not pending and not retries:
+                        break
+                    if retries:
+                        time.sleep(max(0.0, retries[0][0] - time.monotonic()))
+                    continue
+
+                timeout = max(0.0, retries[0][0] - time.monotonic()) if retries else None
+                done, in_flight = concurrent.futures.wait(
+                    in_flight, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in done:
+                    chunk, response, failed = future.result()
+                    if response is not None:
+                        result.responses.append(response)
+                    result.stats.num_succeeded += len(chunk) - len(failed)
+                    for attempt, entry, error_code in failed:
+                        if error_code in self.spec.retryable_error_codes and attempt < self.max_attempts:
+                            ready_at = time.monotonic() + self._get_backoff(attempt)
+                            heapq.heappush(retries, (ready_at, next(sequence), attempt + 1, entry))
+                            result.stats.num_retried_entries += 1
+                        else:
+                            result.failed.append((entry, error_code))
+                            result.stats.num_failed += 1
+
+        result.stats.elapsed_time = time.monotonic() - started_at
+        return result
+
+    def _send_chunk(self, chunk):
+        entries = [entry for _, entry in chunk]
+        attempts = {id(entry): attempt for attempt, entry in chunk}
+        try:
+            response = self.spec.send(self.client, entries)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code")
+            return chunk, None, [(attempt, entry, error_code) for attempt, entry in chunk]
+        except Exception as e:
+            # Connection errors, timeouts, invalid parameters and the like fail the entries of the chunk only.
+            # The name of the exception class stands for the error code, like "EndpointConnectionError".
+            return chunk, None, [(attempt, entry, type(e).__name__) for attempt, entry in chunk]
+
+        failed = []
+        for entry, error_code in self.spec.get_failed(entries, response):
+            # Entries returned by the service as unprocessed are new objects
+            # so they don't have an attempt number. Attribute the highest one.
+            attempt = attempts.get(id(entry), max(attempts.values()))
+            failed.append((attempt, entry, error_code))
+        return chunk, response, failed
+
+    def _get_backoff(self, attempt) -> float:
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+def payload_size(payload) -> int:
+    """
+    Approximate size of a boto payload in bytes.
+    """
+    if payload is None:
+        return 0
+    elif isinstance(payload, bytes):
+        return len(payload)
+    elif isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    elif isinstance(payload, dict):
+        return sum(payload_size(k) + payload_size(v) for k, v in payload.items())
+    elif isinstance(payload, (list, tuple)):
+        return sum(payload_size(v) for v in payload)
+    else:
+        return len(str(payload))
+
+
+def _get_shapes_module(client):
+    return importlib.import_module(type(client).__module__).shapes
+
+
+def s3_delete_objects(bucket: str, quiet: bool = True) -> BatchSpec:
+    """
+    Batch spec for s3 ``delete_objects``; entries are ``ObjectIdentifier`` shapes.
+    """
+
+    def send(client, entries):
+        shapes = _get_shapes_module(client)
+        return client.delete_objects(bucket=bucket, delete=shapes.Delete(objects=entries, quiet=quiet))
+
+    def get_failed(entries, response):
+        by_key = {(e.key, e.version_id or None): e for e in entries}
+        return [
+            (by_key[(error.key, error.version_id or None)], error.code)
+            for error in response.errors or ()
+            if (error.key, error.version_id or None) in by_key
+        ]
+
+    return BatchSpec(max_count=1000, send=send, get_failed=get_failed)
+
+
+def dynamodb_batch_write_item(table_name: str) -> BatchSpec:
+    """
+    Batch spec for dynamodb ``batch_write_item`` to a single table; entries are ``WriteRequest`` shapes.
+    """
+
+    def send(client, entries):
+        return client.batch_write_item(request_items={table_name: entries})
+
+    def get_failed(entries, response):
+        return [(entry, "Unprocessed") for entry in (response.unprocessed_items or {}).get(table_name, ())]
+
+    return BatchSpec(max_count=25, max_bytes=16 * 1024 * 1024, send=send, get_failed=get_failed)
+
+
+def sqs_send_message_batch(queue_url: str) -> BatchSpec:
+    """
+    Batch spec for sqs ``send_message_batch``; entries are ``SendMessageBatchRequestEntry`` shapes
+    with ids unique within the stream.
+    """
+
+    def send(client, entries):
+        return client.send_message_batch(queue_url=queue_url, entries=entries)
+
+    def get_failed(entries, response):
+        by_id = {e.id: e for e in entries}
+        return [
+            (by_id[failure.id], "SenderFault" if failure.sender_fault else failure.code)
+            for failure in response.failed or ()
+        ]
+
+    return BatchSpec(max_count=10, max_bytes=256 * 1024, send=send, get_failed=get_failed)
+
+
+def kinesis_put_records(stream_name: str) -> BatchSpec:
+    """
+    Batch spec for kinesis ``put_records``; entries are ``PutRecordsRequestEntry`` shapes.
+    """
+
+    def send(client, entries):
+        return client.put_records(stream_name=stream_name, records=entries)
+
+    def get_failed(entries, response):
+        return [
+            (entry, record.error_code)
+            for entry, record in zip(entries, response.records or ())
+            if record.error_code
+        ]
+
+    return BatchSpec(max_count=500, max_bytes=5 * 1024 * 1024, send=send, get_failed=get_failed)
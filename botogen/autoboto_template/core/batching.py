@@ -0,0 +1,120 @@
+import threading
+import typing
+
+import dataclasses
+
+from .shapes import ShapeBase
+
+
+class _Batch:
+    def __init__(self):
+        self.ids = []
+        self.callers = []
+        self.is_full = threading.Event()
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class AutoBatchingClient:
+    """
+    Wraps a generated client so that concurrent single-id calls to batchable
+    operations (for example, ec2 ``describe_volumes(volume_ids=[...])``) made
+    within ``window`` seconds of each other are merged into one request.
+
+    Each caller gets its own copy of the response with the result list filtered
+    down to the ids that it asked for.
+
+    All other attributes are delegated to the wrapped client.
+    """
+
+    DEFAULT_MAX_BATCH_SIZE = 100
+
+    def __init__(self, client, window: float = 0.01, max_batch_size: int = None):
+        self._client = client
+        self._window = window
+        self._max_batch_size = max_batch_size or self.DEFAULT_MAX_BATCH_SIZE
+        self._lock = threading.Lock()
+        self._open_batches: typing.Dict[typing.Tuple, _Batch] = {}
+
+    def __getattr__(self, name):
+        if name in self._client._batchable_operations:
+            def call(_request: ShapeBase = None, **params):
+                return self._call(name, _request, **params)
+            return call
+        return getattr(self._client, name)
+
+    def _call(self, operation_name, _request=None, **params):
+        spec = self._client._batchable_operations[operation_name]
+        method = getattr(self._client, operation_name)
+
+        if _request is not None:
+            params = {
+                f.name: getattr(_request, f.name)
+                for f in dataclasses.fields(_request)
+                if getattr(_request, f.name) is not ShapeBase.NOT_SET
+            }
+
+        ids = params.get(spec["id_param"])
+        max_ids = min(self._max_batch_size, spec["max_ids"] or self._max_batch_size)
+        if not ids or len(ids) > max_ids:
+            return method(**params)
+
+        other_params = {k: v for k, v in params.items() if k != spec["id_param"]}
+        batch_key = (operation_name, repr(sorted(other_params.items())))
+
+        with self._lock:
+            batch = self._open_batches.get(batch_key)
+            if batch is None or len(set(batch.ids).union(ids)) > max_ids:
+                batch = self._open_batches[batch_key] = _Batch()
+                is_leader = True
+            else:
+                is_leader = False
+            batch.ids.extend(i for i in ids if i not in batch.ids)
+            batch.callers.append(ids)
+            if len(batch.ids) >= max_ids:
+                batch.is_full.set()
+
+        if is_leader:
+            batch.is_full.wait(self._window)
+            with self._lock:
+                if self._open_batches.get(batch_key) is batch:
+                    del self._open_batches[batch_key]
+            try:
+                batch.response = method(**dict(other_params, **{spec["id_param"]: list(batch.ids)}))
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            if len(batch.callers) > 1:
+                # One invalid id fails the whole merged request so
+                # retry on our own to get our own response or error.
+                return method(**params)
+            raise batch.error
+
+        return self._split_response(batch.response, spec["result_path"], spec["result_id_attr"], set(ids))
+
+    @classmethod
+    def _split_response(cls, response, result_path, result_id_attr, ids):
+        return dataclasses.replace(response, **{
+            result_path[0]: cls._filter_items(
+                getattr(response, result_path[0]), result_path[1:], result_id_attr, ids,
+            ),
+        })
+
+    @classmethod
+    def _filter_items(cls, items, result_path, result_id_attr, ids):
+        if not items:
+            return items
+        if not result_path:
+            return [item for item in items if getattr(item, result_id_attr) in ids]
+        filtered = []
+        for item in items:
+            item = cls._split_response(item, result_path, result_id_attr, ids)
+            if getattr(item, result_path[0]):
+                filtered.append(item)
+        return filtered
@@ -0,0 +1,214 @@
+import collections
+import hashlib
+import json
+import threading
+import time
+import typing
+
+import dataclasses
+
+CacheKey = typing.Tuple[str, ...]
+
+
+@dataclasses.dataclass
+class CachePolicy:
+    # How long, in seconds, a response is fresh.
+    ttl: float
+
+    # Maximum number of responses of the operation to keep.
+    max_size: int = 1000
+
+    # For how long, in seconds, after the response has expired it can still be served
+    # while it is being refreshed in the background.
+    stale_while_revalidate: float = 0.0
+
+    # What to store: "shape" -- the converted output shape which is then shared by all callers,
+    # or "raw" -- the boto payload which is converted to a new output shape on every hit.
+    store: str = "shape"
+
+    def __post_init__(self):
+        assert self.store in ("shape", "raw")
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+@dataclasses.dataclass
+class CacheEntry:
+    value: typing.Any
+
+    # time.time() when the response was received
+    stored_at: float
+
+    # True if value is the boto payload, False if it is the converted output shape.
+    is_raw: bool = True
+
+
+def request_fingerprint(params: typing.Dict) -> str:
+    """
+    Canonical fingerprint of request parameters as returned by ``to_boto()``.
+    """
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def is_streaming(response: typing.Dict) -> bool:
+    return any(hasattr(value, "read") for value in response.values())
+
+
+class ResponseCache:
+    """
+    In-memory cache of responses of read-only operations, configured per operation method name:
+
+        cf_client = cloudformation.Client(response_cache=ResponseCache(
+            policies={"describe_stacks": CachePolicy(ttl=60, stale_while_revalidate=300)},
+            invalidations={"update_stack": ["describe_stacks"]},
+        ))
+
+    ``invalidations`` maps a mutating operation to read operations whose cached responses
+    are dropped when the mutating operation succeeds. Use ``"*"`` to drop all.
+
+    Responses with streaming bodies (like s3 ``get_object``) are never cached.
+    """
+
+    # Set to False in caches that can only store boto payloads.
+    can_store_shapes = True
+
+    def __init__(
+        self,
+        policies: typing.Dict[str, CachePolicy],
+        invalidations: typing.Dict[str, typing.Iterable[str]] = None,
+    ):
+        self.policies = policies
+        self.invalidations = {k: list(v) for k, v in (invalidations or {}).items()}
+        self._entries: typing.Dict[str, collections.OrderedDict] = collections.defaultdict(collections.OrderedDict)
+        self._stats: typing.Dict[str, CacheStats] = collections.defaultdict(CacheStats)
+        self._refreshing = set()
+        self._lock = threading.RLock()
+
+    @property
+    def stats(self) -> typing.Dict[str, CacheStats]:
+        """
+        Copy of cache statistics per operation method name.
+        """
+        with self._lock:
+            return {k: dataclasses.replace(v) for k, v in self._stats.items()}
+
+    def make_key(self, client, method_name: str, params: typing.Dict) -> CacheKey:
+        return self.client_scope(client) + (method_name, request_fingerprint(params))
+
+    @staticmethod
+    def client_scope(client) -> CacheKey:
+        """
+        The part of cache keys which identifies the responses of a client: its service and region.
+        """
+        return (client._service_name, client._boto_client.meta.region_name)
+
+    def get_response(self, client, method_name: str, params: typing.Dict, output_type):
+        """
+        Called by the client instead of sending the request.
+        """
+        policy = self.policies.get(method_name)
+        if policy is None or method_name not in client._read_only_operations:
+            response = client._send_request(method_name, params)
+            self._invalidate_after(client, method_name)
+            return output_type.from_boto(response) if output_type is not None else None
+
+        key = self.make_key(client, method_name, params)
+        entry = self._load(key)
+        now = time.time()
+        if entry is not None:
+            age = now - entry.stored_at
+            if age <= policy.ttl:
+                self._count(method_name, "hits")
+                return self._to_output(entry, policy, output_type)
+            if age <= policy.ttl + policy.stale_while_revalidate:
+                self._count(method_name, "stale_hits")
+                self._refresh_in_background(client, key, method_name, params, output_type, policy)
+                return self._to_output(entry, policy, output_type)
+
+        self._count(method_name, "misses")
+        entry = self._fetch(client, key, method_name, params, output_type, policy)
+        return self._to_output(entry, policy, output_type)
+
+    def invalidate(self, method_names: typing.Iterable[str] = None, client=None):
+        """
+        Drops cached responses of the specified operations, or of all operations.
+        If ``client`` is passed, only the responses of its service and region are dropped.
+        """
+        scope = self.client_scope(client) if client is not None else None
+        with self._lock:
+            for method_name in list(self._entries) if method_names is None else method_names:
+                entries = self._entries[method_name]
+                keys = [key for key in entries if scope is None or key[:2] == scope]
+                for key in keys:
+                    del entries[key]
+                self._stats[method_name].invalidations += len(keys)
+
+    def _invalidate_after(self, client, method_name: str):
+        if method_name in self.invalidations:
+            targets = self.invalidations[method_name]
+            self.invalidate(None if "*" in targets else targets, client=client)
+
+    def _fetch(self, client, key, method_name, params, output_type, policy) -> CacheEntry:
+        response = client._send_request(method_name, params)
+        if policy.store == "shape" and output_type is not None and self.can_store_shapes:
+            entry = CacheEntry(value=output_type.from_boto(response), stored_at=time.time(), is_raw=False)
+        else:
+            entry = CacheEntry(value=response, stored_at=time.time())
+        if not is_streaming(response):
+            self._store(key, entry, policy)
+        return entry
+
+    def _refresh_in_background(self, client, key, method_name, params, output_type, policy):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch(client, key, method_name, params, output_type, policy)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        thread = threading.Thread(target=refresh, name=f"autoboto-refresh-{method_name}")
+        thread.daemon = True
+        thread.start()
+
+    def _to_output(self, entry: CacheEntry, policy: CachePolicy, output_type):
+        if output_type is None:
+            return None
+        if entry.is_raw:
+            return output_type.from_boto(entry.value)
+        return entry.value
+
+    def _count(self, method_name, counter):
+        with self._lock:
+            stats = self._stats[method_name]
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def _load(self, key: CacheKey) -> typing.Optional[CacheEntry]:
+        method_name = key[2]
+        with self._lock:
+            entries = self._entries[method_name]
+            if key in entries:
+                entries.move_to_end(key)
+                return entries[key]
+        return None
+
+    def _store(self, key: CacheKey, entry: CacheEntry, policy: CachePolicy):
+        method_name = key[2]
+        with self._lock:
+            entries = self._entries[method_name]
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > policy.max_size:
+                entries.popitem(last=False)
+                self._stats[method_name].evictions += 1
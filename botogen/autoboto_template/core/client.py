@@ -0,0 +1,146 @@
+import os
+import threading
+import typing
+
+import boto3
+
+from .batching import AutoBatchingClient
+from .caching import ResponseCache
+from .credentials import DiskCredentialCache
+from .hedging import HedgingPolicy
+from .model_snapshot import install_service_snapshot
+from .rate_limiting import AdaptiveRateController
+from .shapes import OutputShapeBase, ShapeBase
+
+# boto3 sessions, including the default one, are not thread-safe so all boto clients are created under this lock.
+_create_lock = threading.Lock()
+
+
+def _reset_create_lock():
+    global _create_lock
+    _create_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    # Another thread may have held the lock at the time of fork.
+    os.register_at_fork(after_in_child=_reset_create_lock)
+
+
+class ClientBase:
+    """
+    Base class for all generated clients.
+
+    Methods that are not generated by autoboto (for example, ``s3.upload_file``)
+    are delegated to the underlying boto3 client.
+
+    Pass ``hedging_policy`` to hedge slow calls of read-only operations,
+    see :class:`HedgingPolicy`.
+
+    Pass ``rate_controller`` to rate-limit all requests of this client,
+    see :class:`AdaptiveRateController`.
+
+    Pass ``response_cache`` to cache responses of read-only operations,
+    see :class:`ResponseCache`.
+
+    The underlying boto client is created on first use, from ``session`` if passed,
+    or from the session that ``session_factory`` returns when it is first needed,
+    or from the default boto3 session. It is created again in a child process after
+    ``fork`` because connection pools can't be shared between processes.
+    Service models are loaded from the snapshot that botogen embeds in the generated
+    package, if it matches the installed botocore, instead of botocore's JSON files.
+    To share clients within the process, see :class:`ClientPool`.
+
+    Pass ``credential_cache`` to share assumed-role credentials between processes,
+    see :class:`DiskCredentialCache`.
+    """
+
+    # Generated by botogen: names of methods of operations that have no side effects.
+    _read_only_operations = frozenset()
+
+    # Generated by botogen for operations whose single-id calls can be merged.
+    # Maps method name to a dictionary with keys:
+    #   id_param        -- name of the request attribute holding the list of ids
+    #   result_path     -- names of the (nested) list attributes of the response holding the results
+    #   result_id_attr  -- name of the attribute of a result that holds its id
+    #   max_ids         -- maximum number of ids per request as declared in the service model, or None
+    _batchable_operations = {}
+
+    def __init__(
+        self,
+        service_name,
+        *args,
+        hedging_policy: HedgingPolicy = None,
+        rate_controller: AdaptiveRateController = None,
+        response_cache: ResponseCache = None,
+        session: boto3.session.Session = None,
+        credential_cache: DiskCredentialCache = None,
+        session_factory: typing.Callable[[], boto3.session.Session] = None,
+        **kwargs
+    ):
+        self._service_name = service_name
+        self._hedging_policy = hedging_policy
+        self._rate_controller = rate_controller
+        self._response_cache = response_cache
+        self._session = session
+        self._session_factory = session_factory
+        self._credential_cache = credential_cache
+        self._client_args = args
+        self._client_kwargs = kwargs
+        self._client_pid = None
+        self._client = None
+
+    @property
+    def _boto_client(self):
+        if self._client_pid != os.getpid():
+            with _create_lock:
+                if self._client_pid != os.getpid():
+                    self._client = self._create_boto_client()
+                    self._client_pid = os.getpid()
+        return self._client
+
+    def _create_boto_client(self):
+        session = self._session
+        if session is None:
+            session = self._session_factory() if self._session_factory is not None else boto3._get_default_session()
+        install_service_snapshot(session._session, self._service_name, type(self).__module__.rsplit(".", 1)[0])
+        if self._credential_cache is not None:
+            self._credential_cache.install(session._session)
+        boto_client = session.client(self._service_name, *self._client_args, **self._client_kwargs)
+        if self._rate_controller is not None:
+            self._rate_controller.register(boto_client, self._service_name)
+        return boto_client
+
+    def __getattr__(self, name):
+        if name.startswith("__") or name in ("_client", "_client_pid"):
+            # Don't create the boto client for copy, pickle and such probing.
+            raise AttributeError(name)
+        return getattr(self._boto_client, name)
+
+    def _call_operation(
+        self,
+        method_name: str,
+        request: typing.Optional[ShapeBase],
+        output_type: typing.Optional[typing.Type[OutputShapeBase]],
+    ) -> typing.Optional[OutputShapeBase]:
+        """
+        All generated operation methods, except paginated ones, end up here.
+        """
+        params = request.to_boto() if request is not None else {}
+        if self._response_cache is not None:
+            return self._response_cache.get_response(self, method_name, params, output_type)
+        response = self._send_request(method_name, params)
+        if output_type is not None:
+            return output_type.from_boto(response)
+
+    def _send_request(self, method_name: str, params: typing.Dict) -> typing.Dict:
+        method = getattr(self._boto_client, method_name)
+        if self._hedging_policy is not None and method_name in self._read_only_operations:
+            return self._hedging_policy.call((self._service_name, method_name), lambda: method(**params))
+        return method(**params)
+
+    def auto_batching(self, window: float = 0.01, max_batch_size: int = None) -> AutoBatchingClient:
+        """
+        Returns a wrapper of this client which merges concurrent single-id calls
+        of batchable operations made within ``window`` seconds into one request.
+        """
+        return AutoBatchingClient(self, window=window, max_batch_size=max_batch_size)
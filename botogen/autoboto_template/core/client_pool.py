@@ -0,0 +1,110 @@
+import functools
+import json
+import os
+import threading
+import typing
+
+import boto3
+from botocore.config import Config
+
+from .client import ClientBase
+
+PoolKey = typing.Tuple[typing.Type[ClientBase], typing.Optional[str], typing.Optional[str], typing.Hashable]
+
+_C = typing.TypeVar("_C", bound=ClientBase)
+
+
+def _config_key(config: typing.Union[Config, typing.Mapping[str, typing.Any], None]) -> typing.Hashable:
+    # Options are compared by value, Config objects by identity as their options aren't public.
+    if config is None or isinstance(config, Config):
+        return config
+    return json.dumps(config, sort_keys=True, default=repr)
+
+
+class ClientPool:
+    """
+    Process-wide registry of shared clients, one per (service, region, profile, config).
+
+        s3_client = shared_client_pool.get_client(s3.Client, region_name="eu-west-1")
+
+    Generated clients are thread-safe once their boto client has been created,
+    and they create it lazily on the first operation call, so getting a client
+    from the pool is cheap. One boto3 session is kept per profile, created when
+    the first client of the profile creates its boto client.
+
+    ``config`` is either a dictionary of the options of a botocore ``Config``,
+    with which clients are shared when the options are equal:
+
+        shared_client_pool.get_client(s3.Client, config={"retries": {"max_attempts": 2}})
+
+    or a ``Config``, with which clients are only shared when the same object is passed.
+
+    After ``fork`` the child process starts with an empty pool. Clients obtained
+    from the pool before the fork remain usable in the child: they create new
+    boto clients there, from new sessions of the pool.
+    """
+
+    def __init__(self):
+        self._clients: typing.Dict[PoolKey, ClientBase] = {}
+        self._sessions: typing.Dict[typing.Optional[str], boto3.session.Session] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def get_client(
+        self,
+        client_class: typing.Type[_C],
+        region_name: str = None,
+        profile_name: str = None,
+        config: typing.Union[Config, typing.Mapping[str, typing.Any]] = None,
+        **kwargs
+    ) -> _C:
+        """
+        Returns the shared client for the arguments, creating it if necessary.
+        ``kwargs`` (``hedging_policy`` and such) are only used when the client is created.
+        """
+        key = (client_class, region_name, profile_name, _config_key(config))
+        self._check_pid()
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if config is not None and not isinstance(config, Config):
+                    config = Config(**config)
+                client = client_class(
+                    session_factory=functools.partial(self._get_session, profile_name),
+                    region_name=region_name,
+                    config=config,
+                    **kwargs
+                )
+                self._clients[key] = client
+            return client
+
+    def _get_session(self, profile_name: typing.Optional[str]) -> boto3.session.Session:
+        self._check_pid()
+        with self._lock:
+            session = self._sessions.get(profile_name)
+            if session is None:
+                session = boto3.session.Session(profile_name=profile_name)
+                self._sessions[profile_name] = session
+            return session
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+            self._sessions.clear()
+
+    def __len__(self):
+        self._check_pid()
+        with self._lock:
+            return len(self._clients)
+
+    def _check_pid(self):
+        # Checked outside of the lock because the lock may have been held by another thread at the time of fork.
+        if self._pid != os.getpid():
+            self._clients = {}
+            self._sessions = {}
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+
+
+# The pool that clients in the same process can share.
+shared_client_pool = ClientPool()
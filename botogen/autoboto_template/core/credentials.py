@@ -0,0 +1,202 @@
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+import typing
+from pathlib import Path
+
+from botocore.utils import parse_timestamp
+from dateutil.tz import tzutc
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# Credential providers of botocore which fetch credentials from STS and accept a cache.
+CACHING_PROVIDERS = ("assume-role", "assume-role-with-web-identity")
+
+
+def _serialize(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {value!r}")
+
+
+class DiskCredentialCache:
+    """
+    Cache of assumed-role credentials shared by all processes of the user through files
+    in ``directory`` (readable by the owner only).
+
+    When the credentials are missing or due to expire within ``refresh_margin`` seconds,
+    the first process takes an exclusive lock on the cache entry and calls STS while the
+    other processes wait for it and then read the credentials it has stored, so only one
+    process per expiry window pays for the round-trip.
+
+    Pass it to clients created with an assume-role profile:
+
+        credential_cache = DiskCredentialCache()
+        ec2_client = ec2.Client(session=boto3.session.Session(profile_name="ops"), credential_cache=credential_cache)
+
+    The cache must be installed before the session resolves its credentials,
+    that is before any client of the session has been created.
+
+    Threads of one process wait for each other the same way. If the call to STS fails,
+    the lock is released so that other processes and threads don't wait for it.
+    """
+
+    # botocore refreshes credentials that expire within 15 minutes; refresh a bit earlier
+    # so that botocore never considers credentials served from this cache expired.
+    DEFAULT_REFRESH_MARGIN = 20 * 60
+
+    def __init__(
+        self,
+        directory: typing.Union[str, Path] = "~/.cache/autoboto/credentials",
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        lock_timeout: float = 60.0,
+    ):
+        self.directory = Path(directory).expanduser()
+        self.refresh_margin = refresh_margin
+        self.lock_timeout = lock_timeout
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # (lock file or None, thread ident) of the entries locked by this process
+        self._locks: typing.Dict[str, typing.Tuple[typing.Optional[typing.IO], int]] = {}
+        # Locks of the entries between threads of this process, held together with the lock files.
+        self._entry_locks: typing.Dict[str, threading.Lock] = {}
+        self._thread_lock = threading.Lock()
+
+    def install(self, botocore_session):
+        """
+        Makes the assume-role credential providers of the botocore session use this cache.
+        """
+        resolver = botocore_session.get_component("credential_provider")
+        for method in CACHING_PROVIDERS:
+            provider = resolver.get_provider(method)
+            if provider is not None:
+                provider.cache = self
+                provider.load = self._releasing_locks_on_failure(provider.load)
+
+    def _releasing_locks_on_failure(self, load: typing.Callable) -> typing.Callable:
+        """
+        Wraps ``load()`` of a credential provider so that the function with which the credentials
+        it returns are fetched releases the locks taken by its thread when it fails,
+        as then ``__setitem__`` is never called.
+        """
+
+        def fetch_releasing_locks(fetch):
+            def fetch_credentials():
+                try:
+                    return fetch()
+                except BaseException:
+                    self._unlock_all_of_thread()
+                    raise
+
+            return fetch_credentials
+
+        def load_releasing_locks():
+            credentials = load()
+            if getattr(credentials, "_refresh_using", None) is not None:
+                credentials._refresh_using = fetch_releasing_locks(credentials._refresh_using)
+            return credentials
+
+        return load_releasing_locks
+
+    def __contains__(self, cache_key: str) -> bool:
+        # Called by botocore before it decides to call STS. When the credentials
+        # are not usable, the entry is locked until __setitem__ stores new ones.
+        if self._is_fresh(self._read(cache_key)):
+            return True
+        self._lock(cache_key)
+        # Another process may have refreshed the credentials while this one waited for the lock.
+        if self._is_fresh(self._read(cache_key)):
+            self._unlock(cache_key)
+            return True
+        return False
+
+    def __getitem__(self, cache_key: str) -> typing.Dict:
+        value = self._read(cache_key)
+        if value is None:
+            raise KeyError(cache_key)
+        return value
+
+    def __setitem__(self, cache_key: str, value: typing.Dict):
+        try:
+            content = json.dumps(value, default=_serialize).encode("utf-8")
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+            try:
+                # mkstemp creates files readable by the owner only.
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_path, str(self._path(cache_key)))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        finally:
+            self._unlock(cache_key)
+
+    def _path(self, cache_key: str) -> Path:
+        return self.directory / f"{cache_key}.json"
+
+    def _read(self, cache_key: str) -> typing.Optional[typing.Dict]:
+        try:
+            with open(str(self._path(cache_key))) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _is_fresh(self, value: typing.Optional[typing.Dict]) -> bool:
+        try:
+            expiration = parse_timestamp(value["Credentials"]["Expiration"])
+        except (TypeError, KeyError, ValueError):
+            return False
+        remaining = (expiration - datetime.datetime.now(tzutc())).total_seconds()
+        return remaining > self.refresh_margin
+
+    def _lock(self, cache_key: str):
+        with self._thread_lock:
+            if cache_key in self._locks and self._locks[cache_key][1] == threading.get_ident():
+                # Held since an earlier attempt of this thread which failed to store credentials.
+                return
+            entry_lock = self._entry_locks.setdefault(cache_key, threading.Lock())
+
+        # Give up waiting for a process or thread that may be stuck and call STS anyway.
+        deadline = time.monotonic() + self.lock_timeout
+        if not entry_lock.acquire(timeout=self.lock_timeout):
+            return
+
+        lock_file = None
+        if fcntl is not None:
+            lock_file = open(str(self.directory / f"{cache_key}.lock"), "a")
+            while True:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        lock_file.close()
+                        entry_lock.release()
+                        return
+                    time.sleep(0.05)
+        with self._thread_lock:
+            self._locks[cache_key] = (lock_file, threading.get_ident())
+
+    def _unlock(self, cache_key: str):
+        with self._thread_lock:
+            lock = self._locks.pop(cache_key, None)
+            entry_lock = self._entry_locks.get(cache_key)
+        if lock is None:
+            return
+        lock_file, _ = lock
+        if lock_file is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            lock_file.close()
+        entry_lock.release()
+
+    def _unlock_all_of_thread(self):
+        thread_ident = threading.get_ident()
+        with self._thread_lock:
+            cache_keys = [key for key, (_, ident) in self._locks.items() if ident == thread_ident]
+        for cache_key in cache_keys:
+            self._unlock(cache_key)
@@ -0,0 +1,58 @@
+import marshal
+import pkgutil
+import threading
+import typing
+import zlib
+
+from .model_snapshot import MARSHAL_VERSION
+
+DOCS_RESOURCE = "docs.marshal.zlib"
+
+_docs: typing.Dict[str, typing.Dict[str, str]] = {}
+_docs_lock = threading.Lock()
+
+
+def dump_docs(docs: typing.Dict[str, str]) -> bytes:
+    return zlib.compress(marshal.dumps(dict(docs), MARSHAL_VERSION), 9)
+
+
+def load_docs(package: str) -> typing.Dict[str, str]:
+    """
+    Documentation of a service package generated with external docs, keyed by names like
+    ``shapes.Bucket``, ``shapes.Bucket.name`` or ``client.Client.list_buckets``.
+    Empty if the documentation of the package is in its code.
+    """
+    with _docs_lock:
+        if package not in _docs:
+            try:
+                _docs[package] = marshal.loads(zlib.decompress(pkgutil.get_data(package, DOCS_RESOURCE)))
+            except (OSError, zlib.error, EOFError, ValueError, TypeError):
+                _docs[package] = {}
+        return _docs[package]
+
+
+class LazyDoc:
+    """
+    ``__doc__`` of a generated class whose documentation is kept in the docs index
+    of its service package. The documentation of the class and of its methods
+    is set when ``__doc__`` of the class is first accessed, for example by ``help()``.
+
+        class Bucket(ShapeBase):
+            __doc__ = LazyDoc(__module__, "shapes.Bucket")
+
+    """
+
+    def __init__(self, module_name: str, name: str):
+        self.package = module_name.rsplit(".", 1)[0]
+        self.name = name
+
+    def __get__(self, instance, owner):
+        docs = load_docs(self.package)
+        for attr_name, value in list(vars(owner).items()):
+            if isinstance(value, (classmethod, staticmethod)):
+                value = value.__func__
+            doc = docs.get(f"{self.name}.{attr_name}")
+            if doc is not None and callable(value):
+                value.__doc__ = doc
+        owner.__doc__ = docs.get(self.name)
+        return owner.__doc__
@@ -0,0 +1,157 @@
+import collections
+import concurrent.futures
+import threading
+import time
+import typing
+
+
+class LatencyHistogram:
+    """
+    Keeps latencies (in seconds) of the most recent calls of one operation.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        self._samples = collections.deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self._sorted = None
+
+    def __len__(self):
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self._sorted = None
+
+    def percentile(self, percentile: float) -> typing.Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            if self._sorted is None:
+                self._sorted = sorted(self._samples)
+            index = min(len(self._sorted) - 1, int(len(self._sorted) * percentile / 100.0))
+            return self._sorted[index]
+
+
+class HedgingPolicy:
+    """
+    Opt-in policy for read-only operations of a generated client:
+    if a call hasn't completed within the ``percentile`` of recently observed
+    latency of the operation, a duplicate request is sent and whichever
+    response arrives first wins. The other one is abandoned.
+
+    ``budget`` is the number of extra requests allowed per regular request
+    (0.05 means at most 5% extra requests), with up to ``max_burst`` unused
+    extra requests saved up for bursts.
+
+    Hedging only starts for an operation once ``min_samples`` latencies have been recorded.
+
+    Usage:
+
+        s3_client = s3.Client(hedging_policy=HedgingPolicy(percentile=95))
+
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        max_burst: float = 10.0,
+        min_samples: int = 20,
+        max_samples: int = 1000,
+        max_workers: int = 32,
+    ):
+        assert 0 < percentile < 100
+        self.percentile = percentile
+        self.budget = budget
+        self.max_burst = max_burst
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+
+        self.num_requests = 0
+        self.num_hedged_requests = 0
+        self.num_hedge_wins = 0
+
+        self._tokens = max_burst
+        self._lock = threading.Lock()
+        self._histograms: typing.Dict[typing.Hashable, LatencyHistogram] = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    def get_histogram(self, key: typing.Hashable) -> LatencyHistogram:
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = LatencyHistogram(max_samples=self.max_samples)
+            return self._histograms[key]
+
+    def call(self, key: typing.Hashable, func: typing.Callable[[], typing.Any]) -> typing.Any:
+        """
+        Calls ``func`` hedging it if it takes longer than usual for operation ``key``.
+
+        Calls which can't be hedged, because the operation has too few latencies recorded
+        or the budget is used up, run on the caller's thread. Otherwise the primary attempt
+        runs on a thread of its own, so that the caller can return as soon as the duplicate wins,
+        and only the duplicate goes to the pool of ``max_workers`` threads.
+        """
+        histogram = self.get_histogram(key)
+        with self._lock:
+            self.num_requests += 1
+            self._tokens = min(self.max_burst, self._tokens + self.budget)
+            can_hedge = len(histogram) >= self.min_samples and self._tokens >= 1
+
+        if not can_hedge:
+            return self._timed(histogram, func)
+
+        primary = concurrent.futures.Future()
+        threading.Thread(target=self._run, args=(primary, histogram, func), daemon=True).start()
+        done, _ = concurrent.futures.wait([primary], timeout=histogram.percentile(self.percentile))
+        if done or not self._take_token():
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, histogram, func)
+        futures = [primary, hedge]
+        error = None
+        for future in concurrent.futures.as_completed(futures):
+            if future.exception() is not None:
+                error = error or future.exception()
+                continue
+            if future is hedge:
+                with self._lock:
+                    self.num_hedge_wins += 1
+            for other in futures:
+                if other is not future:
+                    other.add_done_callback(self._discard)
+            return future.result()
+        raise error
+
+    @staticmethod
+    def _timed(histogram: LatencyHistogram, func: typing.Callable[[], typing.Any]) -> typing.Any:
+        # Only the time of the call itself is recorded, not the time spent waiting for a thread.
+        started_at = time.monotonic()
+        try:
+            return func()
+        finally:
+            histogram.record(time.monotonic() - started_at)
+
+    def _run(
+        self, future: concurrent.futures.Future, histogram: LatencyHistogram, func: typing.Callable[[], typing.Any],
+    ):
+        try:
+            future.set_result(self._timed(histogram, func))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.num_hedged_requests += 1
+            return True
+
+    @staticmethod
+    def _discard(future: concurrent.futures.Future):
+        # Release the connection held by a streaming body of an abandoned response.
+        if future.exception() is None and isinstance(future.result(), dict):
+            body = future.result().get("Body")
+            if body is not None and hasattr(body, "close"):
+                body.close()
@@ -0,0 +1,271 @@
+import collections
+import logging
+import threading
+import time
+import typing
+
+import dataclasses
+
+from .shapes import ShapeBase
+
+log = logging.getLogger(__name__)
+
+InventoryKey = typing.Tuple[typing.Optional[str], str, str]  # (account, region, resource type)
+
+
+@dataclasses.dataclass
+class ResourceType:
+    """
+    Describes how to list resources of one type with a generated client
+    and what to index them by.
+    """
+
+    name: str
+
+    # Returns all resources (shapes) of the type
+    list_resources: typing.Callable[[typing.Any], typing.Iterable]
+
+    # Returns the id of a resource
+    get_id: typing.Callable[[typing.Any], str]
+
+    # Returns tags of a resource as a dictionary
+    get_tags: typing.Callable[[typing.Any], typing.Dict[str, str]] = lambda resource: {}
+
+    # Names of (dotted paths to) attributes of resources to index, for example "state.name"
+    indexed_attributes: typing.Sequence[str] = ()
+
+
+@dataclasses.dataclass
+class InventoryDiff:
+    added: typing.List = dataclasses.field(default_factory=list)
+
+    # (old, new) pairs of resources that have changed
+    changed: typing.List[typing.Tuple[typing.Any, typing.Any]] = dataclasses.field(default_factory=list)
+
+    removed: typing.List = dataclasses.field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+
+def get_attribute(resource, path: str):
+    value = resource
+    for name in path.split("."):
+        value = getattr(value, name, None)
+        if value is None or value is ShapeBase.NOT_SET:
+            return None
+    return value
+
+
+def _tags_to_dict(tags) -> typing.Dict[str, str]:
+    return {tag.key: tag.value for tag in tags or ()}
+
+
+class ResourceInventory:
+    """
+    In-memory snapshot of all resources of one type in one account and region,
+    indexed by id, tags and the ``indexed_attributes`` of the resource type.
+
+        instances = ResourceInventory(ec2_client, ec2_instances(), refresh_interval=300)
+        instances.start()
+        ...
+        instances.find_by_tag("team", "data")
+        instances.find_by("state.name", "running")
+
+    Every refresh lists the resources again and diffs them against the current snapshot.
+    Only the resources that were added, changed or removed are re-indexed, and the diff
+    is passed to the ``on_change`` callbacks. If a refresh fails, the previous snapshot
+    keeps being served and the error is kept in ``last_error``.
+    """
+
+    def __init__(
+        self,
+        client,
+        resource_type: ResourceType,
+        account: str = None,
+        refresh_interval: float = 300.0,
+    ):
+        self.client = client
+        self.resource_type = resource_type
+        self.account = account
+        self.refresh_interval = refresh_interval
+        self.refreshed_at: typing.Optional[float] = None
+        self.last_error: typing.Optional[Exception] = None
+        self._resources: typing.Dict[str, typing.Any] = {}
+        self._tag_index = collections.defaultdict(lambda: collections.defaultdict(set))
+        self._attribute_index = collections.defaultdict(lambda: collections.defaultdict(set))
+        self._listeners: typing.List[typing.Callable[[InventoryDiff], typing.Any]] = []
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+
+    @property
+    def key(self) -> InventoryKey:
+        return self.account, self.client._boto_client.meta.region_name, self.resource_type.name
+
+    def on_change(self, callback: typing.Callable[[InventoryDiff], typing.Any]):
+        self._listeners.append(callback)
+
+    def refresh(self) -> InventoryDiff:
+        """
+        Lists the resources, updates the snapshot and indexes, and returns what has changed.
+        """
+        resources = {}
+        for resource in self.resource_type.list_resources(self.client):
+            resources[self.resource_type.get_id(resource)] = resource
+
+        diff = InventoryDiff()
+        with self._lock:
+            for resource_id, resource in resources.items():
+                old = self._resources.get(resource_id)
+                if old is None:
+                    diff.added.append(resource)
+                elif old != resource:
+                    diff.changed.append((old, resource))
+                    self._unindex(resource_id, old)
+                else:
+                    continue
+                self._resources[resource_id] = resource
+                self._index(resource_id, resource)
+            for resource_id in set(self._resources) - set(resources):
+                old = self._resources.pop(resource_id)
+                self._unindex(resource_id, old)
+                diff.removed.append(old)
+            self.refreshed_at = time.time()
+            self.last_error = None
+
+        if diff:
+            for callback in self._listeners:
+                callback(diff)
+        return diff
+
+    def start(self):
+        """
+        Refreshes now and then every ``refresh_interval`` seconds in a background thread.
+        """
+        assert self._thread is None, "already started"
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"autoboto-inventory-{self.resource_type.name}")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get(self, resource_id: str):
+        with self._lock:
+            return self._resources.get(resource_id)
+
+    def all(self) -> typing.List:
+        with self._lock:
+            return list(self._resources.values())
+
+    def find_by_tag(self, key: str, value: str = None) -> typing.List:
+        """
+        Resources that have the tag, with the value if specified.
+        """
+        with self._lock:
+            values = self._tag_index.get(key, {})
+            if value is None:
+                ids = set().union(*values.values())
+            else:
+                ids = values.get(value, ())
+            return [self._resources[resource_id] for resource_id in ids]
+
+    def find_by(self, attribute: str, value) -> typing.List:
+        """
+        Resources whose indexed ``attribute`` equals ``value``.
+        """
+        assert attribute in self.resource_type.indexed_attributes, f"{attribute} is not indexed"
+        with self._lock:
+            ids = self._attribute_index[attribute].get(value, ())
+            return [self._resources[resource_id] for resource_id in ids]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._resources)
+
+    def _index(self, resource_id, resource):
+        for key, value in self.resource_type.get_tags(resource).items():
+            self._tag_index[key][value].add(resource_id)
+        for attribute in self.resource_type.indexed_attributes:
+            value = get_attribute(resource, attribute)
+            if value is not None:
+                self._attribute_index[attribute][value].add(resource_id)
+
+    def _unindex(self, resource_id, resource):
+        for key, value in self.resource_type.get_tags(resource).items():
+            self._discard(self._tag_index, key, value, resource_id)
+        for attribute in self.resource_type.indexed_attributes:
+            value = get_attribute(resource, attribute)
+            if value is not None:
+                self._discard(self._attribute_index, attribute, value, resource_id)
+
+    def _discard(self, index, name, value, resource_id):
+        ids = index[name][value]
+        ids.discard(resource_id)
+        if not ids:
+            del index[name][value]
+            if not index[name]:
+                del index[name]
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                log.exception(f"Failed to refresh inventory of {self.resource_type.name}")
+                self.last_error = e
+            self._stopped.wait(self.refresh_interval)
+
+
+def ec2_instances() -> ResourceType:
+    """
+    EC2 ``Instance`` shapes, by instance id.
+    """
+
+    def list_resources(client):
+        for page in client.describe_instances().paginate():
+            for reservation in page.reservations or ():
+                yield from reservation.instances or ()
+
+    return ResourceType(
+        name="ec2:instance",
+        list_resources=list_resources,
+        get_id=lambda instance: instance.instance_id,
+        get_tags=lambda instance: _tags_to_dict(instance.tags),
+        indexed_attributes=("instance_type", "state.name", "vpc_id", "subnet_id", "image_id"),
+    )
+
+
+def s3_buckets() -> ResourceType:
+    """
+    S3 ``Bucket`` shapes, by bucket name. Buckets are not indexed by tags
+    because listing them would take a request per bucket.
+    """
+
+    def list_resources(client):
+        return client.list_buckets().buckets or ()
+
+    return ResourceType(name="s3:bucket", list_resources=list_resources, get_id=lambda bucket: bucket.name)
+
+
+def cloudformation_stacks() -> ResourceType:
+    """
+    CloudFormation ``Stack`` shapes, by stack id.
+    """
+
+    def list_resources(client):
+        for page in client.describe_stacks().paginate():
+            yield from page.stacks or ()
+
+    return ResourceType(
+        name="cloudformation:stack",
+        list_resources=list_resources,
+        get_id=lambda stack: stack.stack_id,
+        get_tags=lambda stack: _tags_to_dict(stack.tags),
+        indexed_attributes=("stack_name", "stack_status"),
+    )
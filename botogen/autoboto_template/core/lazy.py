@@ -0,0 +1,73 @@
+import importlib
+import sys
+import types
+import typing
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a module that is imported on first attribute access.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def __getattr__(self, name):
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+            # Later accesses of attributes which the module already has don't come here.
+            self.__dict__.update(
+                (k, v) for k, v in self._module.__dict__.items() if k not in ("__name__", "__spec__")
+            )
+            if name in self.__dict__:
+                return self.__dict__[name]
+        # The module may resolve some of its attributes lazily too.
+        value = getattr(self._module, name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return dir(importlib.import_module(self.__name__))
+
+
+class _LazyPackage(types.ModuleType):
+    _lazy_attributes: typing.Dict[str, typing.Tuple[str, typing.Optional[str]]] = {}
+
+    def __getattr__(self, name):
+        if name not in self._lazy_attributes:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        module_name, attr_name = self._lazy_attributes[name]
+        value = importlib.import_module(module_name, self.__package__)
+        if attr_name is not None:
+            value = getattr(value, attr_name)
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # Importing a submodule sets it as an attribute of the package, which would hide
+        # a lazy attribute of the same name taken from it, like ``warmup`` of ``.warmup``.
+        if isinstance(value, types.ModuleType) and name in self._lazy_attributes:
+            module_name, attr_name = self._lazy_attributes[name]
+            if attr_name is not None and module_name == f".{name}" and value.__name__ == f"{self.__name__}.{name}":
+                value = getattr(value, attr_name)
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._lazy_attributes))
+
+
+def lazy_package(package_name: str, attributes: typing.Dict[str, typing.Tuple[str, typing.Optional[str]]]):
+    """
+    Makes attributes of an already imported package (or module) resolve on first access
+    by importing a (relative) module and, if an attribute name is given, taking the attribute of it.
+
+        lazy_package(__name__, {"Client": (".client", "Client"), "shapes": (".shapes", None)})
+
+    Relative module names are resolved against the package the module is in.
+
+    Works on Python 3.6 which doesn't support module-level ``__getattr__``.
+    """
+    package = sys.modules[package_name]
+    package.__class__ = _LazyPackage
+    package._lazy_attributes = attributes
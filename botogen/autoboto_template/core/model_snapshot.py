@@ -0,0 +1,118 @@
+import marshal
+import pkgutil
+import threading
+import typing
+
+import botocore
+import botocore.loaders
+
+# Model types that botogen puts in the snapshot of a service.
+SERVICE_MODEL_TYPES = ("service-2", "paginators-1", "waiters-2")
+
+# Data which is not specific to a service; botogen puts it in one snapshot for all services.
+GLOBAL_DATA_NAMES = ("endpoints", "_retry")
+
+SERVICE_SNAPSHOT_RESOURCE = "botocore_model.marshal"
+GLOBAL_SNAPSHOT_RESOURCE = "botocore_data.marshal"
+
+# Version 4 of the marshal format is understood by all supported Python versions.
+MARSHAL_VERSION = 4
+
+
+def to_marshallable(value):
+    # botocore loads models into OrderedDicts which marshal doesn't support; dicts keep the order too.
+    if isinstance(value, dict):
+        return {k: to_marshallable(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [to_marshallable(v) for v in value]
+    return value
+
+
+def dump_snapshot(data: typing.Dict) -> bytes:
+    return marshal.dumps(to_marshallable(dict(data, botocore_version=botocore.__version__)), MARSHAL_VERSION)
+
+
+def load_snapshot(package: str, resource: str) -> typing.Optional[typing.Dict]:
+    """
+    Loads a snapshot written by botogen, or returns None if it doesn't exist,
+    can't be read, or was generated from a different version of botocore
+    than the one installed.
+    """
+    try:
+        data = pkgutil.get_data(package, resource)
+    except (OSError, ImportError):
+        return None
+    if data is None:
+        return None
+    try:
+        snapshot = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("botocore_version") != botocore.__version__:
+        return None
+    return snapshot
+
+
+class SnapshotLoader:
+    """
+    botocore data loader which serves models from snapshots embedded in the generated
+    package, and delegates everything it doesn't have to the regular loader.
+    """
+
+    def __init__(self, loader: botocore.loaders.Loader):
+        self._loader = loader
+        self._services: typing.Dict[str, typing.Dict] = {}
+        self._data: typing.Dict[str, typing.Any] = {}
+
+    def add_service_snapshot(self, service_name: str, snapshot: typing.Dict):
+        self._services[service_name] = snapshot
+
+    def add_global_snapshot(self, snapshot: typing.Dict):
+        self._data.update((k, v) for k, v in snapshot.items() if k in GLOBAL_DATA_NAMES)
+
+    def has_service_snapshot(self, service_name: str) -> bool:
+        return service_name in self._services
+
+    def load_service_model(self, service_name, type_name, api_version=None):
+        snapshot = self._services.get(service_name)
+        if (
+            snapshot is not None and
+            type_name in snapshot and
+            api_version in (None, snapshot["api_version"])
+        ):
+            return snapshot[type_name]
+        return self._loader.load_service_model(service_name, type_name, api_version=api_version)
+
+    def load_data(self, name):
+        if name in self._data:
+            return self._data[name]
+        return self._loader.load_data(name)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+_install_lock = threading.Lock()
+
+
+def install_service_snapshot(botocore_session, service_name: str, service_package: str):
+    """
+    Makes the botocore session load the models of the service from the snapshot in ``service_package``.
+
+    Nothing is installed if the session is configured to look for models in additional
+    directories (``AWS_DATA_PATH``), because those models would take precedence over botocore's own.
+    """
+    if botocore_session.get_config_variable("data_path"):
+        return
+    with _install_lock:
+        loader = botocore_session.get_component("data_loader")
+        if not isinstance(loader, SnapshotLoader):
+            loader = SnapshotLoader(loader)
+            global_snapshot = load_snapshot(service_package.rsplit(".", 1)[0], GLOBAL_SNAPSHOT_RESOURCE)
+            if global_snapshot is not None:
+                loader.add_global_snapshot(global_snapshot)
+            botocore_session.register_component("data_loader", loader)
+        if not loader.has_service_snapshot(service_name):
+            snapshot = load_snapshot(service_package, SERVICE_SNAPSHOT_RESOURCE)
+            if snapshot is not None:
+                loader.add_service_snapshot(service_name, snapshot)
@@ -0,0 +1,291 @@
+import queue
+import threading
+import time
+import typing
+
+import dataclasses
+
+
+class PipelineCancelled(Exception):
+    pass
+
+
+_END = object()
+
+
+@dataclasses.dataclass
+class StageStats:
+    name: str
+
+    # Number of items the stage has taken from its input and put to its output.
+    num_in: int = 0
+    num_out: int = 0
+
+    # Current number of items waiting in the input queue of the stage.
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+
+    elapsed_time: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """
+        Output items per second.
+        """
+        return self.num_out / self.elapsed_time if self.elapsed_time else 0.0
+
+
+class _Stage:
+    def __init__(self, pipeline: "Pipeline", name: str, concurrency: int = 1):
+        self.pipeline = pipeline
+        self.name = name
+        self.concurrency = concurrency
+        self.input: queue.Queue = None
+        self.output: queue.Queue = None
+        self.stats = StageStats(name=name)
+        self._lock = threading.Lock()
+        self._num_running = concurrency
+
+    def process(self, item) -> typing.Iterable:
+        raise NotImplementedError()
+
+    def finish(self) -> typing.Iterable:
+        """
+        Called once all input has been processed. Yield any remaining output.
+        """
+        return ()
+
+    def items(self) -> typing.Iterator:
+        while True:
+            item = self.pipeline._get(self.input)
+            if item is _END:
+                # Put it back for other workers of this stage.
+                self.input.put(_END)
+                return
+            with self._lock:
+                self.stats.num_in += 1
+                self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.input.qsize() + 1)
+            yield item
+
+    def emit(self, item):
+        self.pipeline._put(self.output, item)
+        with self._lock:
+            self.stats.num_out += 1
+
+    def run(self):
+        for item in self.items():
+            for result in self.process(item):
+                self.emit(result)
+        with self._lock:
+            self._num_running -= 1
+            is_last = self._num_running == 0
+        if is_last:
+            for result in self.finish():
+                self.emit(result)
+            self.pipeline._put(self.output, _END)
+
+
+class _SourceStage(_Stage):
+    def __init__(self, pipeline, name, iterable):
+        super().__init__(pipeline, name)
+        self.iterable = iterable
+
+    def items(self):
+        for item in self.iterable:
+            if self.pipeline.is_cancelled:
+                raise PipelineCancelled()
+            with self._lock:
+                self.stats.num_in += 1
+            yield item
+
+    def process(self, item):
+        yield item
+
+
+class _FunctionStage(_Stage):
+    def __init__(self, pipeline, name, process, concurrency=1):
+        super().__init__(pipeline, name, concurrency=concurrency)
+        self.process = process
+
+
+class _BatchStage(_Stage):
+    def __init__(self, pipeline, name, size):
+        super().__init__(pipeline, name)
+        self.size = size
+        self._batch = []
+
+    def process(self, item):
+        self._batch.append(item)
+        if len(self._batch) >= self.size:
+            batch, self._batch = self._batch, []
+            yield batch
+
+    def finish(self):
+        if self._batch:
+            yield self._batch
+
+
+class Pipeline:
+    """
+    Runs items through a chain of stages, each in its own thread(s),
+    connected by bounded queues so that at most ``max_queue_size`` items
+    wait between any two stages.
+
+    Usage:
+
+        pipeline = (
+            Pipeline()
+            .source(s3_client.list_objects_v2(bucket=bucket).paginate())
+            .flat_map(lambda page: page.contents or ())
+            .filter(lambda obj: obj.key.endswith(".json"))
+            .map(lambda obj: s3_client.get_object(bucket=bucket, key=obj.key), concurrency=8)
+            .batch(100)
+            .sink(store)
+        )
+        pipeline.run()
+
+    ``run()`` returns the output of the last stage as a list, ``iter_results()`` yields it
+    without keeping it in memory.
+
+    ``cancel()`` may be called from another thread (or from a stage) to stop the
+    pipeline. Stages stop at the next item and ``run()`` raises ``PipelineCancelled``.
+
+    Stages with ``concurrency`` greater than 1 do not preserve the order of items.
+    """
+
+    def __init__(self, max_queue_size: int = 100, poll_interval: float = 0.1):
+        self.max_queue_size = max_queue_size
+        self.poll_interval = poll_interval
+        self._stages: typing.List[_Stage] = []
+        self._cancelled = threading.Event()
+        self._errors = []
+        self._started_at = None
+
+    def source(self, iterable: typing.Iterable, name="source") -> "Pipeline":
+        assert not self._stages, "source must be the first stage"
+        return self._add(_SourceStage(self, name, iterable))
+
+    def filter(self, predicate: typing.Callable[[typing.Any], bool], name="filter", concurrency=1) -> "Pipeline":
+        return self._add(_FunctionStage(
+            self, name, lambda item: (item,) if predicate(item) else (), concurrency=concurrency,
+        ))
+
+    def map(self, func: typing.Callable, name="map", concurrency=1) -> "Pipeline":
+        return self._add(_FunctionStage(self, name, lambda item: (func(item),), concurrency=concurrency))
+
+    def flat_map(self, func: typing.Callable[[typing.Any], typing.Iterable], name="flat_map", concurrency=1):
+        return self._add(_FunctionStage(self, name, func, concurrency=concurrency))
+
+    def batch(self, size: int, name="batch") -> "Pipeline":
+        return self._add(_BatchStage(self, name, size))
+
+    def sink(self, func: typing.Callable[[typing.Any], typing.Any], name="sink", concurrency=1) -> "Pipeline":
+        def process(item):
+            func(item)
+            return ()
+        return self._add(_FunctionStage(self, name, process, concurrency=concurrency))
+
+    def _add(self, stage: _Stage) -> "Pipeline":
+        assert self._started_at is None, "cannot add stages to a running pipeline"
+        if self._stages:
+            stage.input = self._stages[-1].output
+        stage.output = queue.Queue(maxsize=self.max_queue_size)
+        self._stages.append(stage)
+        return self
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def stats(self) -> typing.List[StageStats]:
+        elapsed_time = time.monotonic() - self._started_at if self._started_at else 0.0
+        stats = []
+        for stage in self._stages:
+            depth = stage.input.qsize() if stage.input is not None else 0
+            stage.stats.queue_depth = depth
+            stage.stats.max_queue_depth = max(stage.stats.max_queue_depth, depth)
+            stats.append(dataclasses.replace(stage.stats, elapsed_time=elapsed_time))
+        return stats
+
+    def run(self) -> typing.List[typing.Any]:
+        """
+        Runs the pipeline until all items have passed through it.
+        Returns the items that come out of the last stage (none if it is a sink).
+
+        All of these items are kept in memory, so pipelines with a lot of output
+        should end in a sink, or be consumed with ``iter_results()`` instead.
+        """
+        return list(self.iter_results())
+
+    def iter_results(self) -> typing.Iterator[typing.Any]:
+        """
+        Runs the pipeline and yields the items that come out of the last stage as they do,
+        so that memory stays bounded by the queues between the stages.
+
+        The pipeline is cancelled if the iteration stops before the last item.
+        """
+        assert self._stages, "pipeline has no stages"
+        assert self._started_at is None, "pipeline can only be run once"
+        self._started_at = time.monotonic()
+
+        threads = []
+        for stage in self._stages:
+            for i in range(stage.concurrency):
+                thread = threading.Thread(target=self._run_stage, args=(stage,), name=f"{stage.name}-{i}")
+                thread.daemon = True
+                thread.start()
+                threads.append(thread)
+
+        last = self._stages[-1]
+        finished = False
+        try:
+            while True:
+                item = self._get(last.output, raise_on_cancel=False)
+                if item is _END or item is None and self.is_cancelled:
+                    break
+                yield item
+            finished = True
+        finally:
+            if not finished:
+                self.cancel()
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+        if self.is_cancelled:
+            raise PipelineCancelled()
+
+    def _run_stage(self, stage: _Stage):
+        try:
+            stage.run()
+        except PipelineCancelled:
+            pass
+        except Exception as e:
+            self._errors.append(e)
+            self.cancel()
+
+    def _get(self, q: queue.Queue, raise_on_cancel=True):
+        while True:
+            if self.is_cancelled:
+                if raise_on_cancel:
+                    raise PipelineCancelled()
+                return None
+            try:
+                return q.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+
+    def _put(self, q: queue.Queue, item):
+        while True:
+            if self.is_cancelled:
+                raise PipelineCancelled()
+            try:
+                q.put(item, timeout=self.poll_interval)
+                return
+            except queue.Full:
+                continue
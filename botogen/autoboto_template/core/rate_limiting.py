@@ -0,0 +1,205 @@
+import threading
+import time
+import typing
+
+import dataclasses
+
+# Error codes with which AWS services signal that the caller is sending too many requests.
+THROTTLING_ERROR_CODES = frozenset([
+    "BandwidthLimitExceeded",
+    "EC2ThrottledException",
+    "LimitExceededException",
+    "PriorRequestNotComplete",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "SlowDown",
+    "ThrottledException",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "TransactionInProgressException",
+])
+
+RateKey = typing.Tuple[str, str, str]  # (service, region, operation)
+
+
+@dataclasses.dataclass
+class RateMetrics:
+    # Current allowed rate in requests per second, or None if not limited (no throttling seen yet).
+    rate: typing.Optional[float]
+
+    # Recently measured rate of requests in requests per second.
+    measured_rate: float
+
+    num_requests: int
+    num_throttles: int
+
+    # Number of requests that had to wait and the total time they waited, in seconds.
+    num_waits: int
+    total_wait_time: float
+
+
+class TokenBucket:
+    """
+    Token bucket of one (service, region, operation).
+    It does not limit anything until the first throttling error is seen.
+    """
+
+    def __init__(self, min_rate: float, max_rate: float, additive_increase: float, multiplicative_decrease: float):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+
+        self.rate: typing.Optional[float] = None
+        self.measured_rate = 0.0
+        self.num_requests = 0
+        self.num_throttles = 0
+        self.num_waits = 0
+        self.total_wait_time = 0.0
+
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self._last_request = None
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token, waiting for it if necessary. Returns the time waited, in seconds.
+        """
+        waited = 0.0
+        with self._lock:
+            self.num_requests += 1
+            self._measure()
+            if self.rate is not None:
+                self._refill()
+                self._tokens -= 1
+                if self._tokens < 0:
+                    # Reserve the token now and sleep outside of the lock.
+                    waited = -self._tokens / self.rate
+                    self.num_waits += 1
+                    self.total_wait_time += waited
+        if waited:
+            time.sleep(waited)
+        return waited
+
+    def on_success(self):
+        with self._lock:
+            if self.rate is not None:
+                self.rate = min(self.max_rate, self.rate + self.additive_increase)
+
+    def on_throttle(self):
+        with self._lock:
+            self.num_throttles += 1
+            if self.rate is None:
+                self._last_refill = time.monotonic()
+                current_rate = max(self.measured_rate, self.min_rate)
+            else:
+                self._refill()
+                current_rate = self.rate
+            self.rate = max(self.min_rate, current_rate * self.multiplicative_decrease)
+            self._tokens = min(self._tokens, 0.0)
+
+    def get_metrics(self) -> RateMetrics:
+        with self._lock:
+            return RateMetrics(
+                rate=self.rate,
+                measured_rate=self.measured_rate,
+                num_requests=self.num_requests,
+                num_throttles=self.num_throttles,
+                num_waits=self.num_waits,
+                total_wait_time=self.total_wait_time,
+            )
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(max(self.rate, 1.0), self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _measure(self):
+        # Exponentially weighted moving average of the request rate.
+        now = time.monotonic()
+        if self._last_request is not None:
+            interval = max(now - self._last_request, 1e-3)
+            self.measured_rate = 0.8 * self.measured_rate + 0.2 * (1.0 / interval)
+        self._last_request = now
+
+
+class AdaptiveRateController:
+    """
+    Thread-safe client-side rate limiter with a token bucket per (service, region, operation).
+
+    Buckets don't limit anything until a throttling error is seen. Then the allowed rate
+    is cut by ``multiplicative_decrease`` on every throttling error and grows by
+    ``additive_increase`` requests per second on every successful request (AIMD).
+
+    Every attempt, including the retries done by botocore, waits on the bucket before being sent.
+
+    The same controller can be shared by all clients in the process:
+
+        s3_client = s3.Client(rate_controller=shared_rate_controller)
+
+    """
+
+    def __init__(
+        self,
+        min_rate: float = 0.5,
+        max_rate: float = 1000.0,
+        additive_increase: float = 0.5,
+        multiplicative_decrease: float = 0.5,
+        throttling_error_codes: typing.Iterable[str] = THROTTLING_ERROR_CODES,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.throttling_error_codes = frozenset(throttling_error_codes)
+        self._buckets: typing.Dict[RateKey, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, key: RateKey) -> TokenBucket:
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(
+                    min_rate=self.min_rate,
+                    max_rate=self.max_rate,
+                    additive_increase=self.additive_increase,
+                    multiplicative_decrease=self.multiplicative_decrease,
+                )
+            return self._buckets[key]
+
+    def get_metrics(self) -> typing.Dict[RateKey, RateMetrics]:
+        with self._lock:
+            buckets = list(self._buckets.items())
+        return {key: bucket.get_metrics() for key, bucket in buckets}
+
+    def register(self, boto_client, service_name: str):
+        """
+        Registers handlers on botocore events of the boto client so that
+        all its requests are rate-limited by this controller.
+        """
+        region_name = boto_client.meta.region_name
+
+        def before_send(event_name, **kwargs):
+            operation_name = event_name.rsplit(".", 1)[-1]
+            self.get_bucket((service_name, region_name, operation_name)).acquire()
+
+        def needs_retry(response, operation, **kwargs):
+            if response is None:
+                return
+            bucket = self.get_bucket((service_name, region_name, operation.name))
+            error_code = response[1].get("Error", {}).get("Code")
+            if error_code in self.throttling_error_codes:
+                bucket.on_throttle()
+            elif error_code is None:
+                bucket.on_success()
+
+        events = boto_client.meta.events
+        events.register("before-send", before_send, unique_id=f"autoboto-rate-{id(self)}-before-send")
+        events.register("needs-retry", needs_retry, unique_id=f"autoboto-rate-{id(self)}-needs-retry")
+
+
+# A controller that clients in the same process can share.
+shared_rate_controller = AdaptiveRateController()
@@ -0,0 +1,354 @@
+import contextlib
+import hashlib
+import io
+import json
+import mmap
+import os
+import tempfile
+import threading
+import typing
+import uuid
+from pathlib import Path
+
+import dataclasses
+from botocore.exceptions import ClientError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclasses.dataclass
+class S3ObjectCacheStats:
+    # Objects downloaded because they were not in the cache
+    misses: int = 0
+
+    # Objects found in the cache and confirmed unchanged by S3 (304 Not Modified)
+    revalidations: int = 0
+
+    # Objects found in the cache but changed in S3 and downloaded again
+    refreshes: int = 0
+
+    evictions: int = 0
+
+
+class _BodyReader(io.RawIOBase):
+    """
+    Reads a file through a descriptor shared with other readers, each keeping its own position.
+    """
+
+    def __init__(self, fd: int):
+        super().__init__()
+        self._fd = fd
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += os.fstat(self._fd).st_size
+        self._position = offset
+        return offset
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, buffer):
+        data = os.pread(self._fd, len(buffer), self._position)
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+@dataclasses.dataclass
+class CachedObject:
+    """
+    Local copy of an S3 object. Read it with ``read()``, ``open()`` or ``mmap()``.
+
+    The body is opened by ``S3ObjectCache.get_object()``, so it stays readable, and the same,
+    even if the cache evicts or replaces it afterwards. Close the object, or use it
+    as a context manager, to release the file.
+    """
+
+    bucket: str
+    key: str
+    version_id: typing.Optional[str]
+
+    # Where the body was when it was opened. It may have been evicted since.
+    path: Path
+
+    e_tag: str
+    size: int
+    last_modified: typing.Optional[str] = None
+    content_type: typing.Optional[str] = None
+
+    # True if the body was served from the cache after S3 confirmed it had not changed.
+    not_modified: bool = False
+
+    # The open body
+    file: typing.BinaryIO = dataclasses.field(default=None, repr=False)
+
+    def open(self) -> typing.BinaryIO:
+        """
+        Returns a new reader of the body with its own position, to be closed by the caller.
+        """
+        if not hasattr(os, "pread"):  # pragma: no cover
+            return open(str(self.path), "rb")
+        return io.BufferedReader(_BodyReader(self.file.fileno()))
+
+    def mmap(self) -> typing.Union[mmap.mmap, bytes]:
+        """
+        Read-only memory map of the body. Empty objects can't be mapped so ``b""`` is returned for them.
+        """
+        if self.size == 0:
+            return b""
+        return mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self) -> bytes:
+        with self.open() as f:
+            return f.read()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "CachedObject":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class S3ObjectCache:
+    """
+    On-disk cache of S3 object bodies which revalidates every hit with a conditional
+    ``get_object`` (``If-None-Match: <ETag>``). When S3 responds with 304 Not Modified
+    nothing but headers travels over the network and the local copy is returned.
+
+        cache = S3ObjectCache("~/.cache/autoboto/s3-objects", max_bytes=10 * 1024 ** 3)
+        obj = cache.get_object(s3_client, bucket="my-bucket", key="model.bin")
+        with obj.open() as f:
+            ...
+
+    Bodies are written to temporary files and renamed into place under a name of their own,
+    which the meta file of the object refers to, so readers in other processes never see
+    partial files, nor the body of one version with the meta of another. Total size of the
+    cached bodies is kept under ``max_bytes`` by evicting least recently used objects.
+    Bodies are opened, replaced and evicted while holding a lock file, so the object returned
+    has its body open even if it is evicted or replaced right after.
+    """
+
+    def __init__(self, directory: typing.Union[str, Path], max_bytes: int = 1024 * 1024 * 1024):
+        self.directory = Path(directory).expanduser()
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stats = S3ObjectCacheStats()
+        self._lock = threading.RLock()
+
+    @property
+    def stats(self) -> S3ObjectCacheStats:
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def get_object(self, client, bucket: str, key: str, version_id: str = None) -> CachedObject:
+        """
+        Returns the local copy of the object, downloading it with the generated s3 ``client``
+        if it is not cached or has changed.
+        """
+        name = hashlib.sha1(json.dumps([bucket, key, version_id]).encode("utf-8")).hexdigest()
+        meta_path = self.directory / f"{name}.json"
+
+        params = {"bucket": bucket, "key": key}
+        if version_id is not None:
+            params["version_id"] = version_id
+
+        cached = self._open_cached(meta_path)
+        if cached is not None:
+            meta, body_path, f = cached
+            try:
+                response = client.get_object(if_none_match=meta["e_tag"], **params)
+            except ClientError as e:
+                if not _is_not_modified(e):
+                    f.close()
+                    raise
+                self._count("revalidations")
+                self._touch(meta_path)
+                return self._to_cached_object(bucket, key, version_id, body_path, f, meta, not_modified=True)
+            f.close()
+            self._count("refreshes")
+        else:
+            response = client.get_object(**params)
+            self._count("misses")
+
+        meta = {
+            "e_tag": response.e_tag,
+            "last_modified": str(response.last_modified) if response.last_modified else None,
+            "content_type": response.content_type or None,
+            "body": f"{name}.{uuid.uuid4().hex}.body",
+        }
+        tmp_path, meta["size"] = self._write_body(response.body)
+        body_path = self.directory / meta["body"]
+        try:
+            with self._exclusive():
+                os.replace(tmp_path, str(body_path))
+                old_meta = self._read_meta(meta_path)
+                self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+                if old_meta is not None:
+                    _unlink(self.directory / old_meta["body"])
+                f = open(str(body_path), "rb")
+        except BaseException:
+            _unlink(Path(tmp_path))
+            raise
+        self._evict()
+        return self._to_cached_object(bucket, key, version_id, body_path, f, meta)
+
+    def clear(self):
+        with self._exclusive():
+            for path in self.directory.glob("*.json"):
+                _unlink(path)
+            for path in self.directory.glob("*.body"):
+                _unlink(path)
+
+    def _open_cached(self, meta_path: Path) -> typing.Optional[typing.Tuple[typing.Dict, Path, typing.BinaryIO]]:
+        """
+        Returns the meta, the path and the open body of the cached object, if it is cached.
+        """
+        with self._exclusive():
+            meta = self._read_meta(meta_path)
+            if meta is None:
+                return None
+            body_path = self.directory / meta["body"]
+            try:
+                return meta, body_path, open(str(body_path), "rb")
+            except FileNotFoundError:
+                return None
+
+    def _to_cached_object(self, bucket, key, version_id, body_path, f, meta, not_modified=False) -> CachedObject:
+        return CachedObject(
+            bucket=bucket,
+            key=key,
+            version_id=version_id,
+            path=body_path,
+            file=f,
+            e_tag=meta["e_tag"],
+            size=meta["size"],
+            last_modified=meta["last_modified"],
+            content_type=meta["content_type"],
+            not_modified=not_modified,
+        )
+
+    def _read_meta(self, meta_path: Path) -> typing.Optional[typing.Dict]:
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+        # Meta files written before bodies had names of their own don't refer to them.
+        return meta if "body" in meta else None
+
+    def _write_body(self, body) -> typing.Tuple[str, int]:
+        """
+        Writes the body to a temporary file and returns its path and the size of the body.
+        """
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = body.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            _unlink(Path(tmp_path))
+            raise
+        finally:
+            body.close()
+        return tmp_path, size
+
+    def _write_atomic(self, path: Path, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, str(path))
+        except BaseException:
+            _unlink(Path(tmp_path))
+            raise
+
+    def _touch(self, meta_path: Path):
+        # Access time of an object is the modification time of its meta file.
+        try:
+            os.utime(str(meta_path))
+        except OSError:
+            pass
+
+    def _evict(self):
+        with self._exclusive():
+            entries = []
+            total_size = 0
+            bodies = set()
+            for meta_path in self.directory.glob("*.json"):
+                meta = self._read_meta(meta_path)
+                try:
+                    accessed_at = meta_path.stat().st_mtime
+                except OSError:
+                    continue
+                if meta is None:
+                    _unlink(meta_path)
+                    continue
+                bodies.add(meta["body"])
+                entries.append((accessed_at, meta["size"], meta_path, meta["body"]))
+                total_size += meta["size"]
+
+            # Bodies which no meta refers to, like those of older versions of objects
+            for body_path in self.directory.glob("*.body"):
+                if body_path.name not in bodies:
+                    _unlink(body_path)
+
+            if total_size <= self.max_bytes:
+                return
+            for _, size, meta_path, body_name in sorted(entries):
+                if total_size <= self.max_bytes:
+                    break
+                _unlink(meta_path)
+                _unlink(self.directory / body_name)
+                total_size -= size
+                self._count("evictions")
+
+    @contextlib.contextmanager
+    def _exclusive(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(str(self.directory / ".lock"), "a") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self._stats, counter, getattr(self._stats, counter) + 1)
+
+
+def _is_not_modified(error: ClientError) -> bool:
+    metadata = error.response.get("ResponseMetadata", {})
+    return metadata.get("HTTPStatusCode") == 304 or error.response.get("Error", {}).get("Code") == "304"
+
+
+def _unlink(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,102 @@
+import typing
+
+import dataclasses
+
+from .._convert import NOT_SET, _Falsey, from_boto, to_boto
+from .type_info import TypeInfo
+
+__all__ = ["OutputShapeBase", "ShapeBase", "from_boto", "to_boto"]
+
+
+class _BotoFields:
+    def __get__(self, instance: "ShapeBase", owner: typing.Type["ShapeBase"]):
+        return [name for _, name, _ in owner._get_cached_boto_mapping()]
+
+
+class _AutobotoFields:
+    def __get__(self, instance: "ShapeBase", owner: typing.Type["ShapeBase"]):
+        return [name for name, _, _ in owner._get_cached_boto_mapping()]
+
+
+class _DataclassFields:
+    """
+    ``__dataclass_fields__`` of generated shape classes, built on first access from
+    the annotations of the class. The classes are not decorated with ``dataclasses.dataclass``
+    because their ``__init__``, ``__repr__`` and ``__eq__`` are generated by botogen,
+    but ``dataclasses.fields()``, ``is_dataclass()`` and ``replace()`` still work with them.
+    """
+
+    def __get__(self, instance: "ShapeBase", owner: typing.Type["ShapeBase"]):
+        fields = dict(getattr(owner.__mro__[1], "__dataclass_fields__", {}))
+        for name, type_ in owner.__dict__.get("__annotations__", {}).items():
+            field = dataclasses.field(default=owner.__dict__.get(name, dataclasses.MISSING))
+            field.name = name
+            field.type = type_
+            field._field_type = dataclasses._FIELD
+            fields[name] = field
+        owner.__dataclass_fields__ = fields
+        return fields
+
+
+class ShapeBase:
+    """
+    Base class for all shapes.
+    A shape in boto is effectively a type with rich metadata.
+    """
+
+    def __post_init__(self):
+        self._page_iterator = None
+
+    _Falsey = _Falsey
+
+    NOT_SET = NOT_SET
+
+    @classmethod
+    def _get_boto_mapping(cls) -> typing.List[typing.Tuple[str, str, TypeInfo]]:
+        raise NotImplementedError()
+
+    @classmethod
+    def _get_cached_boto_mapping(cls) -> typing.List[typing.Tuple[str, str, TypeInfo]]:
+        """
+        ``_get_boto_mapping()`` of the class, built on first use.
+        """
+        mapping = cls.__dict__.get("_boto_mapping")
+        if mapping is None:
+            mapping = cls._get_boto_mapping()
+            cls._boto_mapping = mapping
+        return mapping
+
+    def to_boto(self) -> typing.Dict:
+        """
+        Returns a dictionary representing this shape with keys as expected by boto.
+        """
+        return to_boto(type(self), self)
+
+    @classmethod
+    def from_boto(cls, d) -> "ShapeBase":
+        """
+        Given a dictionary with keys originating in boto, creates a shape of this class.
+        """
+        return from_boto(cls, d)
+
+    boto_fields: typing.ClassVar[typing.List[str]] = _BotoFields()
+    autoboto_fields: typing.ClassVar[typing.List[str]] = _AutobotoFields()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Replaced by the fields if the subclass is decorated with dataclasses.dataclass.
+        cls.__dataclass_fields__ = _DataclassFields()
+
+
+@dataclasses.dataclass
+class OutputShapeBase(ShapeBase):
+    """
+    Base class for all response shapes.
+    """
+
+    response_metadata: typing.Dict = dataclasses.field(default_factory=dict)
+
+    def _paginate(self) -> typing.Generator["OutputShapeBase", None, None]:
+        yield self
+        for page in self._page_iterator:
+            yield self.from_boto(page)
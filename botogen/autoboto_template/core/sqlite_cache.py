@@ -0,0 +1,172 @@
+import importlib
+import os
+import pickle
+import sqlite3
+import stat
+import threading
+import time
+import typing
+import zlib
+from pathlib import Path
+
+from .caching import CacheEntry, CacheKey, CachePolicy, ResponseCache
+
+# Protocol readable by all supported Python versions
+PICKLE_PROTOCOL = 4
+
+
+def _get_botocore_version() -> str:
+    # The generated package is not fully imported yet when core is imported.
+    package = importlib.import_module(__name__.rsplit(".", 2)[0])
+    return ".".join(str(v) for v in package.botocore_version or ())
+
+
+class SqliteResponseCache(ResponseCache):
+    """
+    Response cache stored in a SQLite database (in WAL mode) which multiple processes can share.
+
+    Entries are keyed by service, region, operation, request fingerprint and the
+    ``botocore_version`` of the generated package so that a package generated from
+    a different botocore never reads responses stored by another.
+
+    Boto payloads are stored pickled and zlib-compressed. As unpickling can run arbitrary code,
+    the database is created readable and writable by the owner only (in a directory only
+    accessible to the owner if the directory is created too), and an existing database
+    which other users can write to is refused with ``PermissionError``.
+
+    Besides the per-operation ``max_size`` of the policies, the total size of
+    stored payloads is kept under ``max_bytes``, evicting least recently used responses first.
+
+        ec2_client = ec2.Client(response_cache=SqliteResponseCache(
+            "~/.cache/autoboto/responses.sqlite",
+            policies={"describe_instances": CachePolicy(ttl=300)},
+        ))
+
+    """
+
+    can_store_shapes = False
+
+    def __init__(
+        self,
+        path: typing.Union[str, Path],
+        policies: typing.Dict[str, CachePolicy],
+        invalidations: typing.Dict[str, typing.Iterable[str]] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        timeout: float = 30.0,
+    ):
+        super().__init__(policies=policies, invalidations=invalidations)
+        self.path = Path(path).expanduser()
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._create_private_file()
+        with self._connection() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    service TEXT NOT NULL,
+                    region TEXT NOT NULL,
+                    operation TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    botocore_version TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    payload BLOB NOT NULL,
+                    PRIMARY KEY (service, region, operation, fingerprint, botocore_version)
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def _create_private_file(self):
+        # SQLite creates the -wal and -shm files with the permissions of the database file.
+        try:
+            os.close(os.open(str(self.path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+        except FileExistsError:
+            if os.stat(str(self.path)).st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                raise PermissionError(f"{self.path} is writable by other users, refusing to load pickles from it")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared by threads, nor by processes after fork.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(str(self.path), timeout=self.timeout)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def make_key(self, client, method_name: str, params: typing.Dict) -> CacheKey:
+        return super().make_key(client, method_name, params) + (_get_botocore_version(),)
+
+    def invalidate(self, method_names: typing.Iterable[str] = None, client=None):
+        conditions = []
+        params = []
+        if client is not None:
+            # The database may be shared by clients of other services and regions.
+            conditions.append("service = ? AND region = ?")
+            params.extend(self.client_scope(client))
+        if method_names is not None:
+            method_names = list(method_names)
+            conditions.append(f"operation IN ({', '.join('?' for _ in method_names)})")
+            params.extend(method_names)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connection() as db:
+            rows = db.execute(f"SELECT operation, COUNT(*) FROM responses{where} GROUP BY operation", params).fetchall()
+            db.execute(f"DELETE FROM responses{where}", params)
+        with self._lock:
+            for method_name, count in rows:
+                self._stats[method_name].invalidations += count
+
+    def _load(self, key: CacheKey) -> typing.Optional[CacheEntry]:
+        with self._connection() as db:
+            row = db.execute(
+                "SELECT stored_at, payload FROM responses "
+                "WHERE service = ? AND region = ? AND operation = ? AND fingerprint = ? AND botocore_version = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE responses SET accessed_at = ? "
+                "WHERE service = ? AND region = ? AND operation = ? AND fingerprint = ? AND botocore_version = ?",
+                (time.time(),) + key,
+            )
+        stored_at, payload = row
+        return CacheEntry(value=pickle.loads(zlib.decompress(payload)), stored_at=stored_at)
+
+    def _store(self, key: CacheKey, entry: CacheEntry, policy: CachePolicy):
+        payload = zlib.compress(pickle.dumps(entry.value, protocol=PICKLE_PROTOCOL))
+        method_name = key[2]
+        with self._connection() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                key + (entry.stored_at, time.time(), len(payload), payload),
+            )
+            evicted = db.execute(
+                "DELETE FROM responses WHERE service = ? AND region = ? AND operation = ? AND stored_at < ?",
+                key[:3] + (time.time() - policy.ttl - policy.stale_while_revalidate,),
+            ).rowcount
+            evicted += db.execute(
+                "DELETE FROM responses WHERE rowid IN ("
+                "SELECT rowid FROM responses WHERE service = ? AND region = ? AND operation = ? "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                key[:3] + (policy.max_size,),
+            ).rowcount
+            evicted += self._evict_to_max_bytes(db)
+        if evicted:
+            with self._lock:
+                self._stats[method_name].evictions += evicted
+
+    def _evict_to_max_bytes(self, db: sqlite3.Connection) -> int:
+        total_size, = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total_size <= self.max_bytes:
+            return 0
+        evicted = 0
+        for rowid, size in db.execute("SELECT rowid, size FROM responses ORDER BY accessed_at").fetchall():
+            if total_size <= self.max_bytes:
+                break
+            db.execute("DELETE FROM responses WHERE rowid = ?", (rowid,))
+            total_size -= size
+            evicted += 1
+        return evicted
@@ -0,0 +1,301 @@
+import datetime
+import inspect
+import marshal
+import pkgutil
+import sys
+import threading
+import types
+import typing
+
+import botocore.response
+
+from .client import ClientBase
+from .docs import LazyDoc
+from .model_snapshot import MARSHAL_VERSION, to_marshallable
+from .shapes import OutputShapeBase, ShapeBase
+from .type_info import TypeInfo
+
+TABLE_RESOURCE = "table.marshal"
+
+# Type references in the table are either one of these names
+# or lists ["structure", name], ["enum", name], ["list", item] or ["map", key, value].
+_PRIMITIVE_TYPES = {
+    "str": str,
+    "int": int,
+    "bool": bool,
+    "float": float,
+    "datetime": datetime.datetime,
+    "any": typing.Any,
+}
+
+_PRIMITIVE_ANNOTATIONS = {
+    "str": "str",
+    "int": "int",
+    "bool": "bool",
+    "float": "float",
+    "datetime": "datetime.datetime",
+    "any": "typing.Any",
+}
+
+_tables: typing.Dict[str, typing.Dict] = {}
+_tables_lock = threading.Lock()
+_shapes_lock = threading.RLock()
+
+
+def dump_table(table: typing.Dict) -> bytes:
+    return marshal.dumps(to_marshallable(table), MARSHAL_VERSION)
+
+
+def load_table(package: str) -> typing.Dict:
+    """
+    Table of a service package generated in the "table" flavor. Instead of a class per shape
+    and a method per operation, such services describe their shapes and operations in the table
+    and the classes are built from it on first access.
+    """
+    with _tables_lock:
+        if package not in _tables:
+            _tables[package] = marshal.loads(pkgutil.get_data(package, TABLE_RESOURCE))
+        return _tables[package]
+
+
+def resolve_type(shapes, ref):
+    if isinstance(ref, str):
+        return _PRIMITIVE_TYPES[ref]
+    kind = ref[0]
+    if kind == "structure":
+        return getattr(shapes, ref[1])
+    elif kind == "enum":
+        return typing.Union[str, getattr(shapes, ref[1])]
+    elif kind == "list":
+        return typing.List[resolve_type(shapes, ref[1])]
+    elif kind == "map":
+        return typing.Dict[resolve_type(shapes, ref[1]), resolve_type(shapes, ref[2])]
+    raise ValueError(ref)
+
+
+def type_annotation(ref, ns="_shapes.") -> str:
+    """
+    Annotation which resolves in a module in which ``ns`` refers to the shapes module.
+    In the shapes module, ``_shapes`` is the module itself.
+    """
+    if isinstance(ref, str):
+        return _PRIMITIVE_ANNOTATIONS[ref]
+    kind = ref[0]
+    if kind == "structure":
+        return f"{ns}{ref[1]}"
+    elif kind == "enum":
+        return f"typing.Union[str, {ns}{ref[1]}]"
+    elif kind == "list":
+        return f"typing.List[{type_annotation(ref[1], ns=ns)}]"
+    elif kind == "map":
+        return f"typing.Dict[{type_annotation(ref[1], ns=ns)}, {type_annotation(ref[2], ns=ns)}]"
+    raise ValueError(ref)
+
+
+def _shape_init(self, *args, **kwargs):
+    field_names = self._field_names
+    if len(args) > len(field_names):
+        raise TypeError(f"{type(self).__name__}() takes at most {len(field_names)} positional arguments")
+    values = dict(zip(field_names, args))
+    for name, value in kwargs.items():
+        if name not in self._field_name_set:
+            raise TypeError(f"{type(self).__name__}() got an unexpected keyword argument {name!r}")
+        if name in values:
+            raise TypeError(f"{type(self).__name__}() got multiple values for argument {name!r}")
+        values[name] = value
+    for name in field_names:
+        setattr(self, name, values.get(name, ShapeBase.NOT_SET))
+    self.__post_init__()
+
+
+def _shape_repr(self):
+    attrs = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._field_names)
+    return f"{type(self).__qualname__}({attrs})"
+
+
+def _shape_eq(self, other):
+    if other.__class__ is self.__class__:
+        return (
+            tuple(getattr(self, name) for name in self._field_names) ==
+            tuple(getattr(other, name) for name in other._field_names)
+        )
+    return NotImplemented
+
+
+def _shape_paginate(self):
+    yield from self._paginate()
+
+
+def make_shape_class(shapes: types.ModuleType, name: str, spec: typing.Tuple):
+    """
+    Builds the class of a shape from its entry in the table.
+    """
+    namespace = {
+        "__module__": shapes.__name__,
+        "__qualname__": name,
+        "__doc__": LazyDoc(shapes.__name__, f"shapes.{name}"),
+    }
+    kind = spec[0]
+
+    if kind == "enum":
+        namespace.update(spec[1])
+        return type(name, (str,), namespace)
+
+    elif kind == "blob":
+        return type(name, (botocore.response.StreamingBody,), namespace)
+
+    elif kind == "structure":
+        _, base_name, members, paginated = spec
+        field_names = tuple(attr_name for attr_name, _, _ in members)
+
+        def _get_boto_mapping(cls):
+            return [
+                (attr_name, boto_name, TypeInfo(resolve_type(shapes, ref)))
+                for attr_name, boto_name, ref in members
+            ]
+
+        namespace.update((attr_name, ShapeBase.NOT_SET) for attr_name in field_names)
+        namespace.update({
+            "__annotations__": {attr_name: type_annotation(ref) for attr_name, _, ref in members},
+            "_field_names": field_names,
+            "_field_name_set": frozenset(field_names),
+            "_get_boto_mapping": classmethod(_get_boto_mapping),
+            "__init__": _shape_init,
+            "__repr__": _shape_repr,
+            "__eq__": _shape_eq,
+        })
+        if paginated:
+            namespace["paginate"] = _shape_paginate
+        base = OutputShapeBase if base_name == "OutputShapeBase" else ShapeBase
+        return type(name, (base,), namespace)
+
+    raise ValueError(spec)
+
+
+class _TableShapesModule(types.ModuleType):
+    _shape_specs: typing.Dict[str, typing.Tuple] = {}
+
+    def __getattr__(self, name):
+        spec = self._shape_specs.get(name)
+        if spec is None:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        with _shapes_lock:
+            # Another thread may have built it while this one was waiting.
+            shape_class = self.__dict__.get(name)
+            if shape_class is None:
+                shape_class = make_shape_class(self, name, spec)
+                setattr(self, name, shape_class)
+        return shape_class
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._shape_specs))
+
+
+def table_shapes_module(module_name: str):
+    """
+    Makes the shapes of an already imported shapes module of a service build on first access
+    from the table of the service. Works on Python 3.6 which doesn't support module-level ``__getattr__``.
+    """
+    module = sys.modules[module_name]
+    module.__class__ = _TableShapesModule
+    module._shape_specs = load_table(module.__package__)["shapes"]
+    module._shapes = module
+    module.__all__ = list(module._shape_specs)
+
+
+class _Operation:
+    def __init__(self, name: str, module_name: str, shapes: types.ModuleType, spec: typing.Tuple):
+        self.__name__ = name
+        self.__qualname__ = f"Client.{name}"
+        self.__module__ = module_name
+        self.__doc__ = None
+        self.shapes = shapes
+        self.input_shape_name, self.output_shape_name, self.paginated, self.required = spec
+
+    @property
+    def __globals__(self):
+        # Annotations refer to the shapes module as "shapes" which the client module has.
+        return sys.modules[self.__module__].__dict__
+
+    @property
+    def __annotations__(self):
+        annotations = {}
+        if self.input_shape_name is not None:
+            annotations["_request"] = f"shapes.{self.input_shape_name}"
+            members = load_table(self.shapes.__name__.rsplit(".", 1)[0])["shapes"][self.input_shape_name][2]
+            for attr_name, _, ref in members:
+                annotations[attr_name] = type_annotation(ref, ns="shapes.")
+        annotations["return"] = f"shapes.{self.output_shape_name}" if self.output_shape_name else "None"
+        return annotations
+
+    @property
+    def __signature__(self):
+        annotations = self.__annotations__
+        parameters = [inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+        for name, annotation in annotations.items():
+            if name == "_request":
+                parameters.append(inspect.Parameter(
+                    name, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None, annotation=annotation,
+                ))
+            elif name != "return":
+                parameters.append(inspect.Parameter(
+                    name,
+                    inspect.Parameter.KEYWORD_ONLY,
+                    default=inspect.Parameter.empty if name in self.required else ShapeBase.NOT_SET,
+                    annotation=annotation,
+                ))
+        return inspect.Signature(parameters, return_annotation=annotations["return"])
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
+
+    def __call__(self, client: ClientBase, _request: ShapeBase = None, **params):
+        if self.input_shape_name is None:
+            if _request is not None or params:
+                raise TypeError(f"{self.__name__}() takes no arguments")
+        elif _request is None:
+            missing = [name for name in self.required if name not in params]
+            if missing:
+                raise TypeError(f"{self.__name__}() missing required keyword-only arguments: {', '.join(missing)}")
+            _request = getattr(self.shapes, self.input_shape_name)(**params)
+
+        output_type = getattr(self.shapes, self.output_shape_name) if self.output_shape_name else None
+
+        if self.paginated:
+            paginator = client.get_paginator(self.__name__).paginate(**_request.to_boto())
+            page_generator = (page for page in paginator)
+            first_page = next(page_generator)
+            result = output_type.from_boto(first_page)
+            result._page_iterator = page_generator
+            return result
+
+        return client._call_operation(self.__name__, _request, output_type)
+
+    def __repr__(self):
+        return f"<operation {self.__name__}>"
+
+
+def make_client_class(module_name: str, shapes: types.ModuleType) -> typing.Type[ClientBase]:
+    """
+    Builds the ``Client`` class of a service from the operations in the table of the service.
+    """
+    package = module_name.rsplit(".", 1)[0]
+    table = load_table(package)
+    service_name = table["service_name"]
+
+    def __init__(self, *args, **kwargs):
+        ClientBase.__init__(self, service_name, *args, **kwargs)
+
+    namespace = {
+        "__module__": module_name,
+        "__qualname__": "Client",
+        "__doc__": LazyDoc(module_name, "client.Client"),
+        "__init__": __init__,
+        "_read_only_operations": frozenset(table["read_only_operations"]),
+        "_batchable_operations": table["batchable_operations"],
+    }
+    for name, spec in table["operations"].items():
+        namespace[name] = _Operation(name, module_name, shapes, spec)
+    return type("Client", (ClientBase,), namespace)
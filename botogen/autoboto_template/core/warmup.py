@@ -0,0 +1,113 @@
+import gc
+import importlib
+import inspect
+import os
+import pkgutil
+import time
+import typing
+
+import boto3
+import dataclasses
+
+from .model_snapshot import install_service_snapshot
+from .shapes import ShapeBase
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+@dataclasses.dataclass
+class WarmupReport:
+    services: typing.List[str]
+
+    # Number of shape classes whose conversion mappings were built
+    num_shapes: int
+
+    # Time it took, in seconds, and the growth of the resident set size, in bytes,
+    # which every worker forked afterwards no longer pays for.
+    elapsed_time: float
+    memory: int
+
+    # True if the objects created so far were moved to the permanent generation with gc.freeze().
+    gc_frozen: bool
+
+
+def _get_rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        # Peak, not current, size; in kilobytes on Linux, bytes on macOS.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return 0
+
+
+def _get_package_name() -> str:
+    return __name__.rsplit(".", 2)[0]
+
+
+def warmup(services: typing.Iterable[str] = None, freeze_gc: bool = True) -> WarmupReport:
+    """
+    Does in the current process the work that otherwise every process does on first use of a service,
+    so that workers forked afterwards by a pre-fork server share it through copy-on-write:
+
+    - imports the client and shapes modules of ``services`` (all generated services if not specified),
+    - builds the conversion mappings of all their shapes,
+    - loads the botocore model snapshots into the default boto3 session,
+    - with ``freeze_gc``, calls ``gc.freeze()`` (Python 3.7+) so that the garbage collector
+      of the workers does not touch, and so copy, the pages holding these objects.
+
+    Call it in the master process, for example in gunicorn's config when ``preload_app`` is on:
+
+        autoboto.warmup(services=["s3", "sqs"])
+
+    """
+    started_at = time.monotonic()
+    rss_before = _get_rss()
+
+    package_name = _get_package_name()
+    if services is None:
+        services_package = importlib.import_module(f"{package_name}.services")
+        services = [m.name for m in pkgutil.iter_modules(services_package.__path__) if m.ispkg]
+    services = list(services)
+
+    botocore_session = boto3._get_default_session()._session
+    num_shapes = 0
+    # Shapes which services share with other shapes are warmed up once.
+    warmed_up_shapes = set()
+    for service_name in services:
+        service_package_name = f"{package_name}.services.{service_name}"
+        service_package = importlib.import_module(service_package_name)
+        importlib.import_module(f"{service_package_name}.client")
+        shapes_module = importlib.import_module(f"{service_package_name}.shapes")
+        # Getting the members imports all chunks of the shapes module if it is split in chunks.
+        for _, shape_type in inspect.getmembers(shapes_module, inspect.isclass):
+            if (
+                issubclass(shape_type, ShapeBase) and
+                shape_type.__module__.startswith((f"{service_package_name}.", f"{package_name}.services._shared_")) and
+                shape_type not in warmed_up_shapes
+            ):
+                warmed_up_shapes.add(shape_type)
+                shape_type._get_cached_boto_mapping()
+                num_shapes += 1
+        install_service_snapshot(botocore_session, service_name, service_package.__name__)
+        botocore_session.get_service_model(service_name)
+    botocore_session.get_component("data_loader").load_data("endpoints")
+
+    gc_frozen = False
+    if freeze_gc and hasattr(gc, "freeze"):
+        gc.collect()
+        gc.freeze()
+        gc_frozen = True
+
+    return WarmupReport(
+        services=services,
+        num_shapes=num_shapes,
+        elapsed_time=time.monotonic() - started_at,
+        memory=max(0, _get_rss() - rss_before),
+        gc_frozen=gc_frozen,
+    )
@@ -1,15 +1,24 @@
 import importlib
 import shutil
 import sys
+import typing
 from pathlib import Path
 
 import botocore
+import botocore.loaders
+from botocore.exceptions import DataNotFoundError
+from cached_property import cached_property
 
 from .ab import AbServiceModel
+from .autoboto_template.core.model_snapshot import GLOBAL_DATA_NAMES, GLOBAL_SNAPSHOT_RESOURCE, dump_snapshot
+from .bundle import bundle_path, write_bundle
+from .compile import compile_modules
 from .config import BotogenConfig, botogen_config
-from .indentist import CodeGenerator
+from .indentist import CodeGenerator, DocCache
 from .log import log
+from .model_cache import CachingLoader
 from .service_generator import ServiceGenerator
+from .shared_shapes import SharedShapes
 
 
 class Botogen:
@@ -25,15 +34,23 @@ class Botogen:
 
     def run(self):
         if "*" in self.config.services:
-            services = AbServiceModel.loader.list_available_services("service-2")
+            services = (self.loader or AbServiceModel.loader).list_available_services("service-2")
         else:
             services = self.config.services
+        if self.config.operations:
+            unknown = [name for name in self.config.operation_services() if name not in services]
+            if unknown:
+                raise ValueError(f"Operations of services not available or not selected: {', '.join(unknown)}")
+            services = self.config.operation_services()
         log.debug(f"services = {services}")
         log.debug(f"yapf_style = {self.config.yapf_style}")
         log.debug(f"build_dir = {self.config.build_dir}")
         log.debug(f"target_dir = {self.config.target_dir}")
         log.debug(f"target_package = {self.config.target_package}")
 
+        if self.config.doc_cache_path and CodeGenerator.doc_cache.path != self.config.doc_cache_path:
+            CodeGenerator.doc_cache = DocCache(self.config.doc_cache_path)
+
         if self.build_autoboto_package_dir.exists():
             shutil.rmtree(self.build_autoboto_package_dir)
 
@@ -52,20 +69,33 @@ class Botogen:
         services_dir = self.build_autoboto_package_dir / "services"
         services_dir.mkdir()
         (services_dir / "__init__.py").touch()
+        (services_dir / GLOBAL_SNAPSHOT_RESOURCE).write_bytes(self.generate_global_model_snapshot())
 
         # Make sure the build directory is the first one in path
         sys.path.insert(0, str(self.config.build_dir))
 
-        for service_name in services:
-            ServiceGenerator(
-                service_name=service_name,
-                botogen=self,
-            ).run()
-            self._try_generated_service_import(service_name)
+        if self.config.dedup_shapes:
+            # All services have to be loaded to find the shapes they share.
+            generators = [ServiceGenerator(service_name=service_name, botogen=self) for service_name in services]
+            SharedShapes(generators).write_modules(services_dir)
+        else:
+            generators = (ServiceGenerator(service_name=service_name, botogen=self) for service_name in services)
+
+        for generator in generators:
+            generator.run()
+            CodeGenerator.doc_cache.save()
+            self._try_generated_service_import(generator.service_name)
+
+        self.generate_services_package_init(services).write_to(services_dir / "__init__.py")
+
+        log.debug(f"docs converted = {CodeGenerator.doc_cache.misses}, reused = {CodeGenerator.doc_cache.hits}")
 
         # Remove the previously added build directory from the path
         sys.path.remove(str(self.config.build_dir))
 
+        if self.config.compile:
+            compile_modules(self.build_autoboto_package_dir)
+
         # Move the generated package to the target_dir
         assert self.config.target_dir.exists()
 
@@ -75,6 +105,70 @@ class Botogen:
         shutil.copytree(self.build_autoboto_package_dir, self.target_autoboto_package_dir)
         log.info(f"Generated package {self.config.target_package} at {self.target_autoboto_package_dir}")
 
+        if self.config.bundle:
+            self.write_bundle(services)
+
+    def write_bundle(self, services: typing.List[str]):
+        """
+        Writes the byte-compiled package, or the services of it in ``bundle_services``,
+        to a zip archive next to the package, see ``bundle.write_bundle``.
+        """
+        if self.config.bundle_services:
+            missing = set(self.config.bundle_services).difference(services)
+            assert not missing, f"Services {', '.join(sorted(missing))} to bundle are not generated"
+            write_bundle(
+                self.target_autoboto_package_dir,
+                self.bundle_path,
+                services=self.config.bundle_services,
+                services_init=self.generate_services_package_init(self.config.bundle_services).to_code(),
+            )
+        else:
+            write_bundle(self.target_autoboto_package_dir, self.bundle_path)
+
+    @property
+    def bundle_path(self) -> Path:
+        return bundle_path(self.config.target_dir, self.config.target_package)
+
+    def generate_services_package_init(self, services: typing.List[str]):
+        module = CodeGenerator().module(
+            "__init__",
+            imports=[f"from {self.target_autoboto_package_name}.core.lazy import lazy_package"],
+        )
+        module.add("\n".join([
+            "# Services are imported on first access so that discovering them doesn't import any.",
+            "lazy_package(__name__, {",
+            *(f"    \"{service_name}\": (\".{service_name}\", None)," for service_name in services),
+            "})",
+            "",
+            "__all__ = [",
+            *(f"    \"{service_name}\"," for service_name in services),
+            "]",
+        ]))
+        return module
+
+    @cached_property
+    def loader(self) -> typing.Optional[CachingLoader]:
+        """
+        Loader of botocore models which caches parsed models in ``model_cache_dir``,
+        or None if caching is disabled.
+        """
+        if self.config.model_cache_dir:
+            return CachingLoader(self.config.model_cache_dir)
+        return None
+
+    def generate_global_model_snapshot(self) -> bytes:
+        """
+        Snapshot of the botocore data, like endpoints, which is shared by all services.
+        """
+        loader = botocore.loaders.Loader()
+        snapshot = {}
+        for name in GLOBAL_DATA_NAMES:
+            try:
+                snapshot[name] = loader.load_data(name)
+            except DataNotFoundError:
+                pass
+        return dump_snapshot(snapshot)
+
     def import_generated_autoboto(self):
         """
         Imports the autoboto package generated in the build directory (not target_dir).
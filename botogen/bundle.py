@@ -0,0 +1,87 @@
+import compileall
+import importlib.machinery
+import os
+import shutil
+import sys
+import tempfile
+import typing
+import zipfile
+from pathlib import Path
+
+from .log import log
+
+# Files which are only needed by IDEs and type checkers, or are replaced by their bytecode.
+# Extension modules, compiled with ``compile`` on, are left out because zipimport can't load them,
+# and so are hidden files, like .gitignore.
+_EXCLUDED_SUFFIXES = (".py", ".pyi", *importlib.machinery.EXTENSION_SUFFIXES)
+
+
+def bundle_path(target_dir: Path, package_name: str) -> Path:
+    """
+    Path of the bundle of the package. Bytecode is specific to the version of Python,
+    so the name of the bundle includes the tag of the interpreter that built it, like ``cpython-37``.
+    """
+    return target_dir / f"{package_name}-{sys.implementation.cache_tag}.zip"
+
+
+def write_bundle(
+    package_dir: Path,
+    path: Path,
+    services: typing.List[str] = None,
+    services_init: str = None,
+    workers: int = 0,
+) -> typing.Dict[str, int]:
+    """
+    Byte-compiles the package in ``package_dir`` and writes its bytecode and data files
+    to the zip archive at ``path`` which can be imported with ``zipimport``:
+
+        sys.path.insert(0, "autoboto-cpython-37.zip")
+        import autoboto
+
+    If ``services`` are specified, only these services are put in the bundle,
+    and ``services_init`` replaces the code of the services package.
+    Modules are compiled in ``workers`` processes, 0 meaning one per CPU.
+
+    The archive has no sources: tracebacks from it don't show the lines of code.
+    """
+    package_name = package_dir.name
+    with tempfile.TemporaryDirectory() as staging_dir:
+        staging_package_dir = Path(staging_dir) / package_name
+
+        def ignore(dir_path, names):
+            if services is not None and Path(dir_path) == package_dir / "services":
+                return [
+                    name for name in names
+                    if (package_dir / "services" / name).is_dir() and name not in services
+                ]
+            return [name for name in names if name == "__pycache__"]
+
+        shutil.copytree(str(package_dir), str(staging_package_dir), ignore=ignore)
+        if services_init is not None:
+            (staging_package_dir / "services" / "__init__.py").write_text(services_init)
+
+        # Legacy locations, next to the sources, are the only ones zipimport looks in.
+        compiled = compileall.compile_dir(
+            str(staging_package_dir), quiet=1, legacy=True, workers=workers or os.cpu_count() or 1,
+        )
+        if not compiled:
+            raise RuntimeError(f"Failed to compile {package_name} for the bundle")
+
+        num_modules = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(str(path), "w", compression=zipfile.ZIP_STORED) as archive:
+            # Directory entries let the import system and pkgutil find packages of the archive.
+            for dir_path, dir_names, file_names in os.walk(str(staging_package_dir)):
+                dir_names.sort()
+                relative_dir = Path(dir_path).relative_to(staging_dir)
+                archive.write(dir_path, f"{relative_dir.as_posix()}/")
+                for file_name in sorted(file_names):
+                    if file_name.endswith(_EXCLUDED_SUFFIXES) or file_name.startswith("."):
+                        continue
+                    if file_name.endswith(".pyc"):
+                        num_modules += 1
+                    archive.write(os.path.join(dir_path, file_name), (relative_dir / file_name).as_posix())
+
+    stats = {"num_modules": num_modules, "size": path.stat().st_size}
+    log.info(f"Bundled {num_modules} modules of {package_name} in {path} ({stats['size'] / 1024 / 1024:.1f} MiB)")
+    return stats
@@ -0,0 +1,65 @@
+import importlib.util
+import subprocess
+import sys
+import tempfile
+import typing
+from pathlib import Path
+
+from .log import log
+
+# Modules of the generated package which are written to be compiled with mypyc.
+COMPILED_MODULES = ["_convert"]
+
+_SETUP_SCRIPT = """
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name={package_name!r},
+    ext_modules=mypycify({paths!r} + ["--ignore-missing-imports", "--follow-imports=silent"], target_dir={c_dir!r}),
+    script_args=["build_ext", "--inplace", "--build-temp", {build_temp!r}, "--build-lib", {build_lib!r}],
+)
+"""
+
+
+def compile_modules(package_dir: Path, modules: typing.List[str] = None) -> bool:
+    """
+    Compiles ``modules`` of the package in ``package_dir`` with mypyc to extension modules which
+    are put next to their sources. The interpreter prefers an extension module to the source
+    when it was built for it and ignores it otherwise, so the package still works everywhere.
+
+    Returns ``False``, and leaves the package pure Python, if mypyc is not installed
+    or the modules fail to compile.
+    """
+    if modules is None:
+        modules = COMPILED_MODULES
+    package_name = package_dir.name
+
+    if importlib.util.find_spec("mypyc") is None:
+        log.warning(f"mypyc is not installed, {package_name} is not compiled")
+        return False
+
+    paths = [f"{package_name}/{module.replace('.', '/')}.py" for module in modules]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Generated C and intermediate files are kept out of the package.
+        code = _SETUP_SCRIPT.format(
+            package_name=package_name,
+            paths=paths,
+            c_dir=str(Path(temp_dir) / "c"),
+            build_temp=str(Path(temp_dir) / "temp"),
+            build_lib=str(Path(temp_dir) / "lib"),
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=str(package_dir.parent),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+
+    if result.returncode != 0:
+        log.warning(f"Failed to compile {', '.join(modules)} of {package_name}, it stays pure Python:\n{result.stdout}")
+        return False
+
+    log.info(f"Compiled {', '.join(modules)} of {package_name} with mypyc")
+    return True
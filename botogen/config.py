@@ -1,3 +1,4 @@
+import collections
 import shutil
 import tempfile
 import typing
@@ -18,6 +19,11 @@ class BotogenConfig:
     # If one of the entries is "*", all services will be generated.
     services: typing.List[str] = None
 
+    # Operations to generate, as "service:Operation" or "service:*" for all operations of a service,
+    # for example "s3:GetObject,s3:ListObjectsV2,sqs:*". Only the services named here are generated,
+    # each with the shapes its operations need. Empty to generate all operations of the services.
+    operations: typing.List[str] = None
+
     # Name of the yapf style to format code with.
     # Specify empty string to speed up the build by not formatting the generated code at all.
     yapf_style: typing.Any = None
@@ -36,6 +42,50 @@ class BotogenConfig:
 
     build_dir_is_temporary: bool = None
 
+    # The directory in which to cache parsed botocore models between builds.
+    # Specify empty string to not cache them.
+    model_cache_dir: Path = None
+
+    # The SQLite database in which to cache documentation converted from HTML between builds.
+    # Specify empty string to only cache it in memory.
+    doc_cache_path: Path = None
+
+    # Split the shapes module of each service into chunks of this many shapes
+    # which are imported on first access of any of their shapes.
+    # Specify 0 to generate a single shapes module.
+    shapes_chunk_size: int = 0
+
+    # Put the documentation of each service in a compressed docs index which is loaded
+    # when the documentation is first accessed, and the documented code in .pyi stubs.
+    external_docs: bool = False
+
+    # Only generate shapes which the inputs and outputs of operations refer to, and error shapes.
+    prune_shapes: bool = True
+
+    # Generate the classes of structurally identical shapes, in one service or across services, once
+    # in a module shared by all services, and re-export them from the shapes modules of the services.
+    # Not supported in the "table" flavor.
+    dedup_shapes: bool = False
+
+    # "classes" generates a class per shape and a method per operation.
+    # "table" generates a table of shapes and operations from which the classes
+    # are built on first access, and the classes in .pyi stubs. The documentation
+    # is always external in the "table" flavor and shapes modules are not chunked.
+    flavor: str = "classes"
+
+    # Also write the byte-compiled package to a zip archive next to it, named like autoboto-cpython-37.zip,
+    # which is imported with zipimport when put on sys.path. It has no sources and has to be used
+    # with the version of Python that generated it.
+    bundle: bool = False
+
+    # Services to put in the bundle. Empty to put all generated services in it.
+    bundle_services: typing.List[str] = None
+
+    # Compile the conversion of values between boto and shapes with mypyc, if it is installed,
+    # to extension modules next to the sources. They are only loaded by the version of Python
+    # that built them, any other uses the sources. Extension modules are not loaded from the bundle.
+    compile: bool = False
+
     # Not configurable via environment variables.
     autoboto_template_dir: Path = dataclasses.field(
         default_factory=lambda: pkg_resources.resource_filename("botogen", "autoboto_template"),
@@ -45,9 +95,43 @@ class BotogenConfig:
         if not isinstance(self.services, list):
             self.services = [s for s in self.services.strip().split(",")] if self.services else []
 
+        if not isinstance(self.operations, list):
+            self.operations = [o.strip() for o in self.operations.strip().split(",")] if self.operations else []
+        for operation in self.operations:
+            assert ":" in operation, f"{operation!r} is not in the form service:Operation"
+
         if self.target_dir and not isinstance(self.target_dir, Path):
             self.target_dir = Path(self.target_dir).resolve()
 
+        if self.model_cache_dir and not isinstance(self.model_cache_dir, Path):
+            self.model_cache_dir = Path(self.model_cache_dir).expanduser()
+
+        if self.doc_cache_path and not isinstance(self.doc_cache_path, Path):
+            self.doc_cache_path = Path(self.doc_cache_path).expanduser()
+
+        self.shapes_chunk_size = int(self.shapes_chunk_size or 0)
+
+        if isinstance(self.external_docs, str):
+            self.external_docs = self.external_docs.lower() in ("1", "true", "yes")
+
+        if isinstance(self.prune_shapes, str):
+            self.prune_shapes = self.prune_shapes.lower() in ("1", "true", "yes")
+
+        if isinstance(self.bundle, str):
+            self.bundle = self.bundle.lower() in ("1", "true", "yes")
+
+        if not isinstance(self.bundle_services, list):
+            self.bundle_services = [s.strip() for s in self.bundle_services.split(",")] if self.bundle_services else []
+
+        if isinstance(self.compile, str):
+            self.compile = self.compile.lower() in ("1", "true", "yes")
+
+        if isinstance(self.dedup_shapes, str):
+            self.dedup_shapes = self.dedup_shapes.lower() in ("1", "true", "yes")
+
+        assert self.flavor in ("classes", "table"), self.flavor
+        assert not (self.dedup_shapes and self.flavor == "table"), "dedup_shapes is not supported by the table flavor"
+
         # Make sure noone attempts to generate "botogen".
         assert self.target_package != "botogen"
 
@@ -59,6 +143,23 @@ class BotogenConfig:
             assert self.build_dir.exists()
             self.build_dir_is_temporary = True
 
+    def operation_services(self) -> typing.List[str]:
+        """
+        Services of the selected operations, in the order in which they are first selected.
+        """
+        return list(collections.OrderedDict.fromkeys(o.split(":", 1)[0] for o in self.operations))
+
+    def operations_of(self, service_name: str) -> typing.Optional[typing.Set[str]]:
+        """
+        Names of the operations of the service to generate, or None to generate all of them.
+        """
+        if not self.operations:
+            return None
+        selected = {o.split(":", 1)[1] for o in self.operations if o.split(":", 1)[0] == service_name}
+        if "*" in selected:
+            return None
+        return selected
+
     def __del__(self):
         if self.build_dir_is_temporary and self.build_dir.exists():
             log.info(f"Deleting {self.build_dir}")
@@ -68,9 +169,20 @@ class BotogenConfig:
 botogen_env = envvar_profile(
     profile_root="botogen",
     services="*",  # comma-separated list of services to generate
+    operations="",  # comma-separated list of service:Operation or service:* to generate only these operations
     yapf_style="facebook",  # pass empty string "" to disable formatting and speed up the build
     target_dir=".",
     target_package="autoboto",
+    model_cache_dir="~/.cache/botogen/models",  # pass empty string "" to disable caching of parsed models
+    doc_cache_path="~/.cache/botogen/docs.sqlite",  # pass empty string "" to not keep converted docs between builds
+    shapes_chunk_size="0",  # pass for example "200" to split shapes modules in chunks imported on demand
+    external_docs="",  # pass "1" to load documentation from a docs index on demand and generate .pyi stubs
+    prune_shapes="1",  # pass empty string "" to generate all shapes including those no operation refers to
+    dedup_shapes="",  # pass "1" to generate identical shapes once in a module shared by all services
+    bundle="",  # pass "1" to also write the byte-compiled package to a zip archive
+    bundle_services="",  # comma-separated list of services to put in the bundle, all if empty
+    compile="",  # pass "1" to compile the conversion of values with mypyc
+    flavor="classes",  # pass "table" to build shape classes from a table at run time
 )
 
 botogen_config = BotogenConfig(**botogen_env)
@@ -2,6 +2,7 @@ from .blocks import BlockBase
 from .code_generator import CodeGenerator
 from .constants import Constants, Literal, LiteralString
 from .context import Context
+from .doc_cache import DocCache
 from .parameters import Parameter
 
 __all__ = [
@@ -11,5 +12,6 @@ __all__ = [
     "LiteralString",
     "Context",
     "CodeGenerator",
+    "DocCache",
     "Parameter",
 ]
@@ -4,8 +4,6 @@ import typing
 from pathlib import Path
 from typing import Any, List
 
-from html2text import html2text
-
 from .constants import Constants
 from .context import Context
 from .parameters import Parameter, type_to_sig_part
@@ -555,7 +553,7 @@ class DocString(CodeBlock):
         for indentation, block in self._blocks:
             assert isinstance(block, str)
             if self.code.documention_input_is_html:
-                block = html2text(block, bodywidth=80).strip()
+                block = self.code.doc_cache.html_to_text(block, width=80)
             yield indentation, block
         yield 0, '"""'
 
@@ -580,7 +578,7 @@ class DocBlockComment(CodeBlock):
         for indentation, block in self._blocks:
             assert isinstance(block, str)
             if self.code.documention_input_is_html:
-                block = html2text(block, bodywidth=75).strip()
+                block = self.code.doc_cache.html_to_text(block, width=75)
             else:
                 block = "\n".join(textwrap.wrap(block, width=75))
             yield indentation, textwrap.indent(block, prefix="# ")
@@ -1,11 +1,12 @@
 import logging
-from typing import List
+from typing import ClassVar, List
 
 from .blocks import (
     ClassCodeBlock, CodeBlock, DataclassCodeBlock, DataclassFieldCodeBlock, DictCodeBlock, DocBlockComment, DocString,
     FunctionCodeBlock, ListCodeBlock, ModuleCodeBlock, NewTypeCodeBlock
 )
 from .constants import Constants
+from .doc_cache import DocCache
 from .parameters import Parameter
 
 log = logging.getLogger(__name__)
@@ -16,6 +17,9 @@ class CodeGenerator:
     # Do not add any line-spacing in here. It's the responsibility of the blocks
     # and perhaps some automated code formatter afterwards.
 
+    # Shared by all code generators so that identical documentation is converted once.
+    doc_cache: ClassVar[DocCache] = DocCache()
+
     def __init__(self):
         self.documention_input_is_html = False
 
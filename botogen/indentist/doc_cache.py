@@ -0,0 +1,62 @@
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional
+
+import html2text
+
+
+class DocCache:
+    """
+    Content-addressed cache of documentation converted from HTML to text,
+    keyed by the hash of the HTML and the width of the text.
+
+    Conversions are kept in memory and, if ``path`` is set, in a SQLite database
+    so that the next build doesn't have to convert the same documentation again.
+    New conversions are written to the database on ``save()``.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = path
+        self._version = getattr(html2text, "__version__", ())
+        self._texts: Dict[str, str] = {}
+        self._unsaved: Dict[str, str] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def html_to_text(self, html: str, width: int) -> str:
+        key = hashlib.sha1(f"{self._version}:{width}:{html}".encode("utf-8")).hexdigest()
+        text = self._texts.get(key)
+        if text is None:
+            text = self._load(key)
+            if text is None:
+                self.misses += 1
+                text = html2text.html2text(html, bodywidth=width).strip()
+                self._unsaved[key] = text
+            else:
+                self.hits += 1
+            self._texts[key] = text
+        else:
+            self.hits += 1
+        return text
+
+    def save(self):
+        if self.path is None or not self._unsaved:
+            return
+        with self._connection() as db:
+            db.executemany("INSERT OR REPLACE INTO docs VALUES (?, ?)", self._unsaved.items())
+        self._unsaved.clear()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path))
+            self._db.execute("CREATE TABLE IF NOT EXISTS docs (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+        return self._db
+
+    def _load(self, key: str) -> Optional[str]:
+        if self.path is None:
+            return None
+        row = self._connection().execute("SELECT text FROM docs WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
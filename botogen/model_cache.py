@@ -0,0 +1,88 @@
+import hashlib
+import marshal
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+import botocore
+import botocore.loaders
+from botocore.exceptions import DataNotFoundError
+
+from .autoboto_template.core.model_snapshot import MARSHAL_VERSION, to_marshallable
+from .log import log
+
+
+class CachingLoader(botocore.loaders.Loader):
+    """
+    botocore loader which keeps parsed service models in ``cache_dir``,
+    keyed by the version of botocore and the hash of the model files
+    (including the files with extras) the model is built from.
+
+    Unlike botocore's loader, it does not list all available services
+    before loading a model.
+
+    Every call returns a new copy of the model because botogen modifies the models it loads.
+    """
+
+    def __init__(self, cache_dir: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_dir = Path(cache_dir).expanduser() / botocore.__version__
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def load_service_model(self, service_name, type_name, api_version=None):
+        if api_version is None:
+            api_version = self.determine_latest_version(service_name, type_name)
+
+        model_path = self._find_file(os.path.join(service_name, api_version, type_name))
+        if model_path is None:
+            raise DataNotFoundError(data_path=os.path.join(service_name, api_version, type_name))
+
+        source_paths = [model_path] + self._find_extras_files(service_name, type_name, api_version)
+        digest = hashlib.sha1()
+        for path in source_paths:
+            # Whichever of the files, like service-2.json or service-2.json.gz, the file loader reads
+            for file_path in sorted(path.parent.glob(f"{path.name}.json*")):
+                digest.update(file_path.read_bytes())
+        cache_path = self.cache_dir / f"{service_name}-{api_version}-{type_name}-{digest.hexdigest()}.marshal"
+
+        try:
+            return marshal.loads(cache_path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        log.debug(f"parsing {type_name} of {service_name}")
+        # Not through load_data() which would keep the parsed files in memory.
+        model, *extras = [self.file_loader.load_file(str(path)) for path in source_paths]
+        self._extras_processor.process(model, extras)
+        self._write(cache_path, marshal.dumps(to_marshallable(model), MARSHAL_VERSION))
+        return model
+
+    def _find_file(self, name) -> Optional[Path]:
+        """
+        Path, without the extension, of the first file of ``name`` in the search paths.
+        The file loader decides which files it can load, like ``.json`` and ``.json.gz`` files.
+        """
+        for search_path in self.search_paths:
+            path = Path(search_path) / name
+            if self.file_loader.exists(str(path)):
+                return path
+        return None
+
+    def _find_extras_files(self, service_name, type_name, api_version) -> List[Path]:
+        paths = []
+        for extras_type in self.extras_types:
+            path = self._find_file(os.path.join(service_name, api_version, f"{type_name}.{extras_type}-extras"))
+            if path is not None:
+                paths.append(path)
+        return paths
+
+    def _write(self, path: Path, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_dir), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, str(path))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
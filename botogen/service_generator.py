@@ -4,15 +4,23 @@ import keyword
 import os
 import re
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
+import botocore.loaders
 from botocore import xform_name
+from botocore.exceptions import DataNotFoundError, UnknownServiceError
 
+from botogen.autoboto_template.core.docs import DOCS_RESOURCE, dump_docs
+from botogen.autoboto_template.core.model_snapshot import (
+    SERVICE_MODEL_TYPES, SERVICE_SNAPSHOT_RESOURCE, dump_snapshot
+)
+from botogen.autoboto_template.core.table import TABLE_RESOURCE, dump_table
 from botogen.indentist import CodeGenerator, Literal, Parameter
 
 from .ab import AbOperationModel, AbServiceModel, AbShape
 from .config import BotogenConfig
 from .log import log
+from .shared_shapes import SHARED_SHAPES_MODULE
 
 
 def identity_func(s):
@@ -35,11 +43,25 @@ class ServiceGenerator(CodeGenerator):
         self.botogen: Botogen = botogen
 
         self.service_name: str = service_name
-        self.service_model = AbServiceModel(service_name)
+        self.service_model = AbServiceModel(service_name, loader=self.botogen.loader)
         self.shapes: Dict[str, AbShape] = collections.OrderedDict()
         self.operations: Dict[str, AbOperationModel] = collections.OrderedDict()
         self.paginated_output_shapes = set()
 
+        # Names of shapes removed because no operation refers to them, see prune_shapes().
+        self.pruned_shape_names: List[str] = []
+
+        # Names of the classes in the shared shapes module of shapes which are shared, by shape name.
+        # See SharedShapes.
+        self.shared_shape_names: Dict[str, str] = collections.OrderedDict()
+
+        # Structural keys of shapes, see shape_key().
+        self._shape_keys: Dict[str, Optional[Tuple]] = {}
+
+        # Documentation to write to the docs index of the service instead of the code, by name.
+        # None when documentation is generated in the code.
+        self.docs: Optional[Dict[str, str]] = None
+
         self.load_service_definition()
 
     @property
@@ -52,11 +74,21 @@ class ServiceGenerator(CodeGenerator):
         service_package_init = self.module(
             name="__init__",
             imports=[
-                "from .client import Client",
-                "from . import shapes",
+                "import typing",
+                f"from {self.botogen.target_autoboto_package_name}.core.lazy import lazy_package",
             ],
         )
         service_package_init.add(f"""\
+            if typing.TYPE_CHECKING:
+                from .client import Client
+                from . import shapes
+
+            # Imported on first access so that importing the client doesn't import all shapes.
+            lazy_package(__name__, {{
+                \"Client\": (\".client\", \"Client\"),
+                \"shapes\": (\".shapes\", None),
+            }})
+
             __all__ = [
                 \"Client\",
                 \"shapes\",
@@ -64,120 +96,542 @@ class ServiceGenerator(CodeGenerator):
         """)
         service_package_init.write_to(self.service_build_dir / "__init__.py")
 
-        shapes_module = self.generate_shapes_module()
-        shapes_path = self.service_build_dir / "shapes.py"
-        shapes_module.write_to(shapes_path, format=self.config.yapf_style)
+        if self.config.flavor == "table":
+            # Stubs keep the classes and the documentation for IDEs and type checkers.
+            self.write_modules(suffix=".pyi")
+            self.docs = {}
+            self.write_table_modules()
+            (self.service_build_dir / DOCS_RESOURCE).write_bytes(dump_docs(self.docs))
+        elif self.config.external_docs:
+            # Stubs keep the documentation for IDEs.
+            self.write_modules(suffix=".pyi")
+            self.docs = {}
+            self.write_modules(suffix=".py")
+            (self.service_build_dir / DOCS_RESOURCE).write_bytes(dump_docs(self.docs))
+        else:
+            self.write_modules(suffix=".py")
+
+        (self.service_build_dir / SERVICE_SNAPSHOT_RESOURCE).write_bytes(self.generate_model_snapshot())
+
+    def write_modules(self, suffix: str):
+        """
+        Writes the shapes and client modules of the service with the given file name suffix.
+        """
+        if self.config.shapes_chunk_size:
+            chunks = self.chunk_shapes(self.config.shapes_chunk_size)
+            for i, shape_names in enumerate(chunks):
+                chunk_module = self.generate_shapes_module(shape_names, name=f"_shapes_{i}")
+                chunk_module.write_to(self.service_build_dir / f"_shapes_{i}{suffix}", format=self.config.yapf_style)
+            shapes_module = self.generate_shapes_facade_module(chunks)
+        else:
+            shapes_module = self.generate_shapes_module()
+        shapes_module.write_to(self.service_build_dir / f"shapes{suffix}", format=self.config.yapf_style)
 
         client_module = self.generate_client_module()
-        client_path = self.service_build_dir / "client.py"
-        client_module.write_to(client_path, format=self.botogen.config.yapf_style)
+        client_module.write_to(self.service_build_dir / f"client{suffix}", format=self.config.yapf_style)
 
-    def generate_shapes_module(self):
-        module = self.module(
+    def write_table_modules(self):
+        """
+        Writes the shapes and client modules of the "table" flavor which build
+        their classes from the table of the service on first access.
+        """
+        (self.service_build_dir / TABLE_RESOURCE).write_bytes(dump_table(self.generate_table()))
+
+        shapes_module = self.module(
             name="shapes",
             imports=[
                 "import datetime",
                 "import typing",
                 f"from {self.botogen.target_autoboto_package_name} import ShapeBase, OutputShapeBase, TypeInfo",
-            ]
+                f"from {self.botogen.target_autoboto_package_name}.core.table import table_shapes_module",
+            ],
         )
+        shapes_module.add("table_shapes_module(__name__)")
+        shapes_module.write_to(self.service_build_dir / "shapes.py", format=self.config.yapf_style)
 
-        for shape in self.shapes.values():
+        client_module = self.module(
+            name="client",
+            imports=[
+                f"from {self.botogen.target_autoboto_package_name}.core.lazy import LazyModule",
+                f"from {self.botogen.target_autoboto_package_name}.core.table import make_client_class",
+            ],
+        )
+        client_module.add("""\
+            shapes = LazyModule(__name__.rsplit(".", 1)[0] + ".shapes")
 
+            Client = make_client_class(__name__, shapes)
+        """)
+        client_module.write_to(self.service_build_dir / "client.py", format=self.config.yapf_style)
+
+    def generate_table(self) -> Dict:
+        """
+        Table of the shapes and operations of the service from which
+        the "table" flavor builds the classes at run time.
+        """
+        shapes = {}
+        for shape in self.shapes.values():
             if shape.is_enum:
-                enum_cls = module.class_(
-                    name=shape.name,
-                    bases=["str"],
-                    doc=shape.documentation,
+                shapes[shape.name] = ("enum", self.enum_attributes(shape))
+            elif shape.type_name == "structure":
+                shapes[shape.name] = (
+                    "structure",
+                    "OutputShapeBase" if shape.is_output_shape else "ShapeBase",
+                    [
+                        (
+                            self.make_shape_attribute_name(member.name),
+                            member.name,
+                            self.type_ref_for_shape(member.shape.name),
+                        )
+                        for member in shape.sorted_members
+                    ],
+                    shape.name in self.paginated_output_shapes,
                 )
-
-                if any(keyword.iskeyword(value) for value in shape.enum):
-                    transform = str.upper
-                elif any(re.match(r"^\d.+", value) for value in shape.enum):
-                    transform = prepare_numeric_enum_value_name
-                else:
-                    transform = identity_func
-
-                for value in shape.enum:
-                    # Some enum values have dashes.
-                    # s3.Event enum has values like "s3:ObjectCreated:*"
-                    safe_value = transform(value).replace("*", "Wildcard")
-                    safe_value = re.sub(r"[^a-zA-Z0-9_]", "_", safe_value)
-                    enum_cls.add(
-                        f"{safe_value} = \"{value}\"",
-                        indentation=1,
+                for member in shape.sorted_members:
+                    self.documentation(
+                        f"shapes.{shape.name}.{self.make_shape_attribute_name(member.name)}", member.documentation,
                     )
-
-            elif shape.is_primitive:
+            elif shape.type_name == "blob":
+                shapes[shape.name] = ("blob",)
+            else:
                 continue
+            self.documentation(f"shapes.{shape.name}", shape.documentation)
 
-            elif shape.type_name == "list":
-                continue
+        operations = {}
+        for operation in self.operations.values():
+            method_name = xform_name(operation.name)
+            operations[method_name] = (
+                operation.input_shape.name if operation.input_shape else None,
+                operation.output_shape.name if operation.output_shape else None,
+                bool(operation.input_shape and operation.output_shape and operation.get_paginator()),
+                [
+                    self.make_shape_attribute_name(member.name)
+                    for member in operation.input_shape.sorted_members
+                    if member.is_required
+                ] if operation.input_shape else [],
+            )
+            self.documentation(f"client.Client.{method_name}", operation.documentation)
+
+        return {
+            "service_name": self.service_name,
+            "shapes": shapes,
+            "operations": operations,
+            "read_only_operations": [
+                xform_name(operation.name) for operation in self.operations.values() if operation.is_read_only
+            ],
+            "batchable_operations": self.find_batchable_operations(),
+        }
 
-            elif shape.type_name == "map":
-                continue
+    def type_ref_for_shape(self, shape_name):
+        """
+        Reference to the type of a shape in the table, see ``core.table``.
+        """
+        shape = self.shapes[shape_name]
+        if shape.is_enum:
+            return ("enum", shape.name)
+        elif shape.type_name in AbShape.PRIMITIVE_TYPES:
+            type_ = AbShape.PRIMITIVE_TYPES[shape.type_name]
+            return "datetime" if type_ is datetime.datetime else type_.__name__
+        elif shape.type_name == "list":
+            return ("list", self.type_ref_for_shape(shape.member.name))
+        elif shape.type_name == "structure":
+            return ("structure", shape.name)
+        elif shape.type_name == "map":
+            return ("map", self.type_ref_for_shape(shape.key.name), self.type_ref_for_shape(shape.value.name))
+        else:
+            return "any"
+
+    def documentation(self, name: str, html: Optional[str]) -> Optional[str]:
+        """
+        Returns the documentation to generate in the code or, if the documentation
+        is external, puts it in the docs index under ``name`` and returns None.
+        """
+        if self.docs is None or not html:
+            return html
+        self.docs[name] = self.doc_cache.html_to_text(html, width=80)
+        return None
+
+    def add_lazy_doc(self, module, cls, name: str):
+        module.add_to_imports(f"from {self.botogen.target_autoboto_package_name}.core.docs import LazyDoc")
+        cls.add(f"__doc__ = LazyDoc(__module__, \"{name}\")", indentation=1)
+
+    def generate_model_snapshot(self) -> bytes:
+        """
+        Snapshot of the botocore models of the service from which the generated client
+        creates its boto client without loading botocore's JSON files.
+        """
+        # The caching loader returns a new copy of the model on every call, but the regular one
+        # doesn't, and AbServiceModel adds autoboto shapes to the model it gets.
+        loader = self.botogen.loader or botocore.loaders.Loader()
+        api_version = loader.determine_latest_version(self.service_name, "service-2")
+        snapshot = {"api_version": api_version}
+        for type_name in SERVICE_MODEL_TYPES:
+            try:
+                snapshot[type_name] = loader.load_service_model(self.service_name, type_name, api_version=api_version)
+            except (DataNotFoundError, UnknownServiceError):
+                pass
+        return dump_snapshot(snapshot)
+
+    def generate_shapes_module(self, shape_names: List[str] = None, name="shapes"):
+        """
+        Generates the module with classes of all shapes or, if ``shape_names`` are specified,
+        a chunk of the shapes module with classes of these shapes only. Chunks refer to shapes
+        of other chunks through the ``shapes`` module which imports chunks on first access.
+        """
+        module = self.module(
+            name=name,
+            imports=[
+                "import datetime",
+                "import typing",
+                f"from {self.botogen.target_autoboto_package_name} import ShapeBase, OutputShapeBase, TypeInfo",
+            ]
+        )
 
-            elif shape.type_name == "structure":
-                if shape.is_output_shape:
-                    shape_bases = ["OutputShapeBase"]
-                else:
-                    shape_bases = ["ShapeBase"]
+        names = self.shared_shape_names
+        if shape_names is None:
+            shape_names = list(self.shapes)
+            local_shape_names = None
+        else:
+            module.add_to_imports("from . import shapes as _shapes")
+            local_shape_names = set(shape_names)
+
+        def ns(shape_name):
+            if shape_name in names:
+                return "_shared."
+            return "" if local_shape_names is None or shape_name in local_shape_names else "_shapes."
+
+        if names:
+            # Chunks only refer to shared shapes, the shapes module also re-exports them.
+            self.add_shared_shapes_imports(module, aliases=local_shape_names is None)
+
+        for shape in (self.shapes[shape_name] for shape_name in shape_names):
+            if shape.name not in names:
+                self.generate_shape_class(module, shape, ns=ns, names=names)
+
+        if names and local_shape_names is None:
+            module.add_to_imports(f"from {self.botogen.target_autoboto_package_name}.core.lazy import lazy_package")
+            module.add("\n".join([
+                "lazy_package(__name__, {",
+                *self.shared_shape_aliases(),
+                "})",
+            ]))
 
-                cls = module.dataclass(
-                    name=shape.name,
-                    doc=shape.documentation,
-                    bases=shape_bases,
-                )
+        return module
 
-                cls.func("_get_boto_mapping", decorators=["@classmethod"], params=["cls"]).of(
-                    self.block("return [", closed_by="]").of(*(
-                        (
-                            f"("
-                            f"\"{self.make_shape_attribute_name(member.name)}\", "
-                            f"\"{member.name}\", "
-                            f"TypeInfo({self.type_annotation_for_shape(member.shape.name, quoted=False)}),"
-                            f"),"
-                        )
-                        for member in shape.sorted_members
-                    )),
+    def add_shared_shapes_imports(self, module, aliases: bool):
+        """
+        Makes ``_shared`` refer to the module of shapes which are shared with other shapes, see ``SharedShapes``,
+        which is imported on first access of any of its shapes.
+        """
+        module.add_to_imports(f"from {self.botogen.target_autoboto_package_name}.core.lazy import LazyModule")
+        module.add("\n".join([
+            "if typing.TYPE_CHECKING:",
+            f"    from .. import {SHARED_SHAPES_MODULE} as _shared",
+            *(
+                f"    from ..{SHARED_SHAPES_MODULE} import {shared_name} as {name}  # noqa"
+                for name, shared_name in (self.shared_shape_names.items() if aliases else ())
+            ),
+            "else:",
+            f"    _shared = LazyModule(__name__.rsplit(\".\", 2)[0] + \".{SHARED_SHAPES_MODULE}\")",
+        ]))
+
+    def shared_shape_aliases(self) -> List[str]:
+        """
+        Entries of the ``lazy_package`` attributes of a shapes module which re-export shared shapes
+        under the names of the shapes of this service.
+        """
+        return [
+            f"    \"{name}\": (\"..{SHARED_SHAPES_MODULE}\", \"{shared_name}\"),"
+            for name, shared_name in self.shared_shape_names.items()
+        ]
+
+    def generate_shape_class(
+        self,
+        module,
+        shape: AbShape,
+        ns: Union[str, Callable[[str], str]],
+        names: Dict[str, str],
+        class_name: str = None,
+        documentation: Callable[[str, Optional[str]], Optional[str]] = None,
+        docs: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Generates the class of a shape, if it has one, in ``module``.
+        ``names`` are the names of the classes of other shapes where they differ from the shape names,
+        see ``type_annotation_for_shape``.
+
+        ``documentation`` is called like ``self.documentation`` and puts external documentation
+        in ``docs``, to which the class then refers. Documentation is named after the class.
+        """
+        class_name = class_name or shape.name
+        if documentation is None:
+            documentation, docs = self.documentation, self.docs
+
+        if shape.is_enum:
+            enum_cls = module.class_(
+                name=class_name,
+                bases=["str"],
+                doc=documentation(f"shapes.{class_name}", shape.documentation),
+            )
+            if docs and f"shapes.{class_name}" in docs:
+                self.add_lazy_doc(module, enum_cls, f"shapes.{class_name}")
+
+            for safe_value, value in self.enum_attributes(shape):
+                enum_cls.add(
+                    f"{safe_value} = \"{value}\"",
+                    indentation=1,
                 )
 
-                for member in shape.sorted_members:
-                    field_defaults = {
-                        "default": "ShapeBase.NOT_SET",
-                    }
-                    cls.field(
-                        name=self.make_shape_attribute_name(member.name),
-                        type_=self.type_annotation_for_shape(member.shape.name),
-                        doc=member.documentation,
-                        **field_defaults,
-                    )
+        elif shape.is_primitive or shape.type_name in ("list", "map"):
+            # These have no classes.
+            pass
 
-                if shape.name in self.paginated_output_shapes:
-                    cls.func(
-                        name="paginate",
-                        params=["self"],
-                        return_type=f"typing.Generator[\"{shape.name}\", None, None]",
-                    ).of(
-                        "yield from super()._paginate()"
+        elif shape.type_name == "structure":
+            if shape.is_output_shape:
+                shape_bases = ["OutputShapeBase"]
+            else:
+                shape_bases = ["ShapeBase"]
+
+            cls = module.class_(
+                name=class_name,
+                doc=documentation(f"shapes.{class_name}", shape.documentation),
+                bases=shape_bases,
+            )
+            if docs and f"shapes.{class_name}" in docs:
+                self.add_lazy_doc(module, cls, f"shapes.{class_name}")
+
+            annotations = [
+                self.type_annotation_for_shape(member.shape.name, quoted=False, ns=ns, names=names)
+                for member in shape.sorted_members
+            ]
+
+            cls.func("_get_boto_mapping", decorators=["@classmethod"], params=["cls"]).of(
+                self.block("return [", closed_by="]").of(*(
+                    (
+                        f"("
+                        f"\"{self.make_shape_attribute_name(member.name)}\", "
+                        f"\"{member.name}\", "
+                        f"TypeInfo({annotation}),"
+                        f"),"
                     )
+                    for member, annotation in zip(shape.sorted_members, annotations)
+                )),
+            )
 
-            elif shape.type_name == "blob":
-                module.add_to_imports("import botocore.response")
-                module.class_(
-                    name=shape.name,
-                    bases=["botocore.response.StreamingBody"],
-                    doc=shape.documentation,
+            # Annotations are strings so that they are not evaluated when the module is imported.
+            fields = [
+                (self.make_shape_attribute_name(member.name), f"\"{annotation}\"")
+                for member, annotation in zip(shape.sorted_members, annotations)
+            ]
+            for member, (name, annotation) in zip(shape.sorted_members, fields):
+                doc = documentation(f"shapes.{class_name}.{name}", member.documentation)
+                if doc:
+                    cls.add("", self.doc_block_comment(doc), indentation=1)
+                cls.add(f"{name}: {annotation} = ShapeBase.NOT_SET", indentation=1)
+
+            self.generate_dataclass_methods(cls, fields)
+
+            if shape.name in self.paginated_output_shapes:
+                cls.func(
+                    name="paginate",
+                    params=["self"],
+                    return_type=f"typing.Generator[\"{class_name}\", None, None]",
+                ).of(
+                    "yield from super()._paginate()"
                 )
 
-            else:
-                raise ValueError({
-                    "shape.name": shape.name,
-                    "shape.type_name": shape.type_name,
-                })
+        elif shape.type_name == "blob":
+            module.add_to_imports("import botocore.response")
+            blob_cls = module.class_(
+                name=class_name,
+                bases=["botocore.response.StreamingBody"],
+                doc=documentation(f"shapes.{class_name}", shape.documentation),
+            )
+            if docs and f"shapes.{class_name}" in docs:
+                self.add_lazy_doc(module, blob_cls, f"shapes.{class_name}")
+
+        else:
+            raise ValueError({
+                "shape.name": shape.name,
+                "shape.type_name": shape.type_name,
+            })
+
+    def enum_attributes(self, shape) -> List[Tuple[str, str]]:
+        """
+        Returns (attribute name, value) pairs of the values of an enum shape.
+        """
+        if any(keyword.iskeyword(value) for value in shape.enum):
+            transform = str.upper
+        elif any(re.match(r"^\d.+", value) for value in shape.enum):
+            transform = prepare_numeric_enum_value_name
+        else:
+            transform = identity_func
+
+        attributes = []
+        for value in shape.enum:
+            # Some enum values have dashes.
+            # s3.Event enum has values like "s3:ObjectCreated:*"
+            safe_value = transform(value).replace("*", "Wildcard")
+            safe_value = re.sub(r"[^a-zA-Z0-9_]", "_", safe_value)
+            attributes.append((safe_value, value))
+        return attributes
+
+    def generate_dataclass_methods(self, cls, fields: List[Tuple[str, str]]):
+        """
+        Generates the ``__init__``, ``__repr__`` and ``__eq__`` methods which ``dataclasses.dataclass``
+        would otherwise generate when the shapes module is imported.
+        ``dataclasses.fields()`` learns about the fields from ``ShapeBase.__dataclass_fields__``.
+        """
+        cls.func(
+            "__init__",
+            params=["self"] + [
+                Parameter(name=name, type_=annotation, default=Literal("ShapeBase.NOT_SET"))
+                for name, annotation in fields
+            ],
+        ).of(
+            *(f"self.{name} = {name}" for name, _ in fields),
+            "self.__post_init__()",
+        )
 
+        cls.func("__repr__", params=["self"]).of("\n".join([
+            "return (",
+            "    f\"{type(self).__qualname__}(\"",
+            *(
+                f"    f\"{name}={{self.{name}!r}}{', ' if i < len(fields) - 1 else ''}\""
+                for i, (name, _) in enumerate(fields)
+            ),
+            "    \")\"",
+            ")",
+        ]))
+
+        cls.func("__eq__", params=["self", "other"]).of("\n".join([
+            "if other.__class__ is self.__class__:",
+            "    return (",
+            *(f"        self.{name}," for name, _ in fields),
+            "    ) == (",
+            *(f"        other.{name}," for name, _ in fields),
+            "    )",
+            "return NotImplemented",
+        ]))
+
+    def generate_shapes_facade_module(self, chunks: List[List[str]], name="shapes", chunk_prefix="_shapes_"):
+        """
+        Generates the shapes module of a service whose shapes are split in chunks.
+        A chunk is imported when any of its shapes is first accessed.
+        Shapes shared with other shapes are re-exported from the shared shapes module.
+        """
+        aliases = self.shared_shape_names if name == "shapes" else {}
+        module = self.module(
+            name=name,
+            imports=[
+                "import typing",
+                f"from {self.botogen.target_autoboto_package_name} import ShapeBase, OutputShapeBase, TypeInfo",
+                f"from {self.botogen.target_autoboto_package_name}.core.lazy import lazy_package",
+            ],
+        )
+        module.add("\n".join([
+            "if typing.TYPE_CHECKING:",
+            *(f"    from .{chunk_prefix}{i} import *  # noqa" for i in range(len(chunks))),
+            *(
+                f"    from ..{SHARED_SHAPES_MODULE} import {shared_name} as {shape_name}  # noqa"
+                for shape_name, shared_name in aliases.items()
+            ),
+            "",
+            "lazy_package(__name__, {",
+            *(
+                f"    \"{shape_name}\": (\".{chunk_prefix}{i}\", \"{shape_name}\"),"
+                for i, shape_names in enumerate(chunks)
+                for shape_name in shape_names
+            ),
+            *(self.shared_shape_aliases() if aliases else ()),
+            "})",
+            "",
+            "__all__ = [",
+            *(f"    \"{shape_name}\"," for shape_names in chunks for shape_name in shape_names),
+            *(f"    \"{shape_name}\"," for shape_name in aliases),
+            "]",
+        ]))
         return module
 
+    def chunk_shapes(self, chunk_size: int) -> List[List[str]]:
+        """
+        Splits the shapes which have classes into chunks of at most ``chunk_size`` shapes.
+
+        Shapes are ordered depth-first from the inputs and outputs of operations,
+        so a shape usually ends up in the same chunk as the shapes it refers to
+        and as the other shapes of the same operation.
+        """
+        roots = []
+        for operation in self.operations.values():
+            roots.extend(shape for shape in (operation.input_shape, operation.output_shape) if shape)
+        roots.extend(self.shapes.values())
+
+        ordered = []
+        visited = set()
+        for root in roots:
+            if root.name in visited:
+                continue
+            visited.add(root.name)
+            stack = [(root, iter(self._shape_dependencies(root)))]
+            while stack:
+                shape, dependencies = stack[-1]
+                for dependency in dependencies:
+                    if dependency.name not in visited:
+                        visited.add(dependency.name)
+                        stack.append((dependency, iter(self._shape_dependencies(dependency))))
+                        break
+                else:
+                    stack.pop()
+                    if shape.is_enum or shape.type_name in ("structure", "blob"):
+                        if shape.name not in self.shared_shape_names:
+                            ordered.append(shape.name)
+
+        return [ordered[i:i + chunk_size] for i in range(0, len(ordered), chunk_size)]
+
+    def shape_key(self, shape_name: str, _visiting=()) -> Optional[Tuple]:
+        """
+        Key of the structure of a shape: shapes with the same key generate the same code
+        apart from names and documentation, in this and in other services.
+        None for recursive shapes, which are never shared.
+        """
+        if shape_name in self._shape_keys:
+            return self._shape_keys[shape_name]
+        if shape_name in _visiting:
+            return None
+
+        shape = self.shapes[shape_name]
+        visiting = _visiting + (shape_name,)
+        if shape.is_enum:
+            key = ("enum", tuple(shape.enum))
+        elif shape.type_name == "structure":
+            member_keys = tuple(
+                (member.name, self.shape_key(member.shape.name, visiting)) for member in shape.sorted_members
+            )
+            if any(member_key is None for _, member_key in member_keys):
+                key = None
+            else:
+                key = ("structure", shape.is_output_shape, shape_name in self.paginated_output_shapes, member_keys)
+        elif shape.type_name == "list":
+            member_key = self.shape_key(shape.member.name, visiting)
+            key = None if member_key is None else ("list", member_key)
+        elif shape.type_name == "map":
+            key_key = self.shape_key(shape.key.name, visiting)
+            value_key = self.shape_key(shape.value.name, visiting)
+            key = None if key_key is None or value_key is None else ("map", key_key, value_key)
+        else:
+            key = shape.type_name
+
+        self._shape_keys[shape_name] = key
+        return key
+
+    def _shape_dependencies(self, shape) -> List[AbShape]:
+        if shape.type_name == "structure":
+            return [self.shapes[member.shape.name] for member in shape.sorted_members]
+        elif shape.type_name == "list":
+            return [self.shapes[shape.member.name]]
+        elif shape.type_name == "map":
+            return [self.shapes[shape.key.name], self.shapes[shape.value.name]]
+        return []
+
     def generate_client_module(self):
         module = self.module(
             name="client",
@@ -186,19 +640,45 @@ class ServiceGenerator(CodeGenerator):
                 "import typing",
                 "import boto3",
                 f"from {self.botogen.target_autoboto_package_name} import ClientBase, ShapeBase, OutputShapeBase",
-                "from . import shapes",
+                f"from {self.botogen.target_autoboto_package_name}.core.lazy import LazyModule",
             ],
         )
 
+        # Annotations refer to shapes in strings so that the shapes module
+        # is not imported until an operation is called.
+        module.add("""\
+            if typing.TYPE_CHECKING:
+                from . import shapes
+            else:
+                shapes = LazyModule(__name__.rsplit(".", 1)[0] + ".shapes")
+        """)
+
         client_cls = module.class_(
             name="Client",
             bases=["ClientBase"],
         )
 
+        if self.docs is not None:
+            # Sets the documentation of the methods when it is first needed.
+            self.add_lazy_doc(module, client_cls, "client.Client")
+
         client_cls.func("__init__", params=["self", "*args", "**kwargs"]).of(
             f"super().__init__(\"{self.service_name}\", *args, **kwargs)"
         )
 
+        client_cls.add(
+            self.block("_read_only_operations = frozenset([", closed_by="])").of(*(
+                f"\"{xform_name(operation.name)}\","
+                for operation in self.operations.values()
+                if operation.is_read_only
+            )),
+            indentation=1,
+        )
+
+        batchable_operations = self.find_batchable_operations()
+        if batchable_operations:
+            client_cls.add(self.dict("_batchable_operations", items=batchable_operations), indentation=1)
+
         for operation in self.operations.values():
             params = []
 
@@ -209,14 +689,14 @@ class ServiceGenerator(CodeGenerator):
             if operation.input_shape:
                 operation_method_params.append(Parameter(
                     name="_request",
-                    type_=f"shapes.{operation.input_shape.name}",
+                    type_=f"\"shapes.{operation.input_shape.name}\"",
                     default=None,
                 ))
 
                 for member in operation.input_shape.sorted_members:
                     params.append(Parameter(
                         name=self.make_shape_attribute_name(member.name),
-                        type_=self.type_annotation_for_shape(member.shape.name, quoted=False, ns="shapes."),
+                        type_=self.type_annotation_for_shape(member.shape.name, ns="shapes."),
                         required=member.is_required,
                         default=Literal("ShapeBase.NOT_SET"),
                         documentation=member.documentation,
@@ -229,9 +709,9 @@ class ServiceGenerator(CodeGenerator):
             operation_func = client_cls.func(
                 name=operation_method_name,
                 params=operation_method_params,
-                doc=operation.documentation,
+                doc=self.documentation(f"client.Client.{operation_method_name}", operation.documentation),
                 return_type=(
-                    f"shapes.{operation.output_shape.name}"
+                    f"\"shapes.{operation.output_shape.name}\""
                     if operation.output_shape else
                     None
                 )
@@ -255,19 +735,19 @@ class ServiceGenerator(CodeGenerator):
                         result._page_iterator = page_generator
                         return result
                     """, indentation=1)
-                else:
-                    operation_func.add(f"""\
-                        response = self._boto_client.{operation_method_name}(**_request.to_boto())
-                    """, indentation=1)
-            else:
-                operation_func.add(f"""\
-                    response = self._boto_client.{operation_method_name}()
-                """, indentation=1)
-
+                    continue
+
+            call_operation = (
+                f"self._call_operation("
+                f"\"{operation_method_name}\", "
+                f"{'_request' if operation.input_shape else 'None'}, "
+                f"{'shapes.' + operation.output_shape.name if operation.output_shape else 'None'}"
+                f")"
+            )
             if operation.output_shape:
-                operation_func.add(f"""\
-                    return shapes.{operation.output_shape.name}.from_boto(response)
-                """, indentation=1)
+                operation_func.add(f"return {call_operation}", indentation=1)
+            else:
+                operation_func.add(call_operation, indentation=1)
 
         return module
 
@@ -275,17 +755,137 @@ class ServiceGenerator(CodeGenerator):
         for name in self.service_model.shape_names:
             shape = self.service_model.shape_for(name)
             self.shapes[name] = shape
+        selected = self.config.operations_of(self.service_name)
+        if selected is not None:
+            unknown = selected.difference(self.service_model.operation_names)
+            if unknown:
+                raise ValueError(f"Service {self.service_name} has no operations {', '.join(sorted(unknown))}")
         for name in self.service_model.operation_names:
+            if selected is not None and name not in selected:
+                continue
             self.operations[name] = self.service_model.operation_model(name)
             if self.operations[name].get_paginator():
                 # Mark paginated shapes for which we need to generate the paginate() method.
                 self.paginated_output_shapes.add(self.operations[name].output_shape.name)
+        if self.config.prune_shapes or selected is not None:
+            # Shapes of operations which are not selected are always pruned.
+            self.prune_shapes(all_operations=selected is None)
+
+    def reachable_shape_names(self, roots: List[AbShape]) -> Set[str]:
+        """
+        Names of ``roots`` and of all shapes they refer to, directly or through other shapes.
+        """
+        reachable = set()
+        stack = list(roots)
+        while stack:
+            shape = stack.pop()
+            if shape.name in reachable:
+                continue
+            reachable.add(shape.name)
+            stack.extend(self._shape_dependencies(shape))
+        return reachable
+
+    def prune_shapes(self, all_operations=True):
+        """
+        Removes shapes which neither the inputs and outputs of operations nor ``ResponseMetadata`` refer to.
+        Error shapes are kept, with the shapes they refer to, but they are reported separately.
+        When generating ``all_operations``, that includes error shapes which no operation declares
+        because they describe errors of the service, otherwise only errors of the generated operations.
+        """
+        roots = [self.shapes["ResponseMetadata"]]
+        for operation in self.operations.values():
+            roots.extend(shape for shape in (operation.input_shape, operation.output_shape) if shape)
+        reachable = self.reachable_shape_names(roots)
+
+        error_shapes = []
+        if all_operations:
+            error_shapes.extend(shape for shape in self.shapes.values() if shape.metadata.get("exception"))
+        for operation in self.operations.values():
+            error_shapes.extend(operation.error_shapes)
+        error_only = self.reachable_shape_names(error_shapes) - reachable
+
+        pruned_names = [name for name in self.shapes if name not in reachable and name not in error_only]
+        if not pruned_names:
+            log.info(f"{self.service_name}: no shapes to prune, {len(error_only)} shapes only used by errors")
+            return
+
+        # Measured on the unformatted code with the documentation in it.
+        pruned_size = len(self.generate_shapes_module(pruned_names, name="_pruned").to_code())
+        for name in pruned_names:
+            del self.shapes[name]
+        self.pruned_shape_names = pruned_names
+        log.info(
+            f"{self.service_name}: pruned {len(pruned_names)} unreachable shapes "
+            f"({pruned_size / 1024:.0f} KiB of code), "
+            f"kept {len(self.shapes)} shapes of which {len(error_only)} are only used by errors"
+        )
 
-    def type_annotation_for_shape(self, shape_name, quoted=True, ns="") -> str:
+    def find_batchable_operations(self) -> Dict[str, Dict]:
+        """
+        Find read-only operations that accept a list of ids (like ``InstanceIds``)
+        and return a list of structures each of which carries one of the ids
+        (like ``InstanceId``). Calls to these can be merged by an auto-batching client.
+        """
+        batchable = collections.OrderedDict()
+        for operation in self.operations.values():
+            if not (operation.is_read_only and operation.input_shape and operation.output_shape):
+                continue
+            for member in operation.input_shape.sorted_members:
+                if not member.name.endswith("Ids"):
+                    continue
+                if member.shape.type_name != "list" or member.shape.member.type_name != "string":
+                    continue
+                id_member_name = member.name[:-1]
+                result_path = self._find_result_path(operation.output_shape, id_member_name)
+                if result_path:
+                    batchable[xform_name(operation.name)] = {
+                        "id_param": self.make_shape_attribute_name(member.name),
+                        "result_path": result_path,
+                        "result_id_attr": self.make_shape_attribute_name(id_member_name),
+                        "max_ids": member.shape.metadata.get("max"),
+                    }
+                    break
+        return batchable
+
+    def _find_result_path(self, shape, id_member_name, depth=2):
+        """
+        Returns attribute names of the lists leading from shape to the structures
+        that have id_member_name, or None if there isn't exactly one such path.
+        Nested lists are followed to handle responses like ec2 DescribeInstances
+        where instances are grouped in reservations.
+        """
+        paths = []
+        for name, member_shape in shape.members.items():
+            if member_shape.type_name != "list" or member_shape.member.type_name != "structure":
+                continue
+            item_shape = member_shape.member
+            if id_member_name in item_shape.members:
+                paths.append([self.make_shape_attribute_name(name)])
+            elif depth > 1:
+                sub_path = self._find_result_path(item_shape, id_member_name, depth=depth - 1)
+                if sub_path:
+                    paths.append([self.make_shape_attribute_name(name)] + sub_path)
+        if len(paths) == 1:
+            return paths[0]
+        return None
+
+    def type_annotation_for_shape(
+        self,
+        shape_name,
+        quoted=True,
+        ns: Union[str, Callable[[str], str]] = "",
+        names: Dict[str, str] = None,
+    ) -> str:
+        """
+        ``ns`` is the prefix of the shape classes, or a function returning the prefix for a shape name.
+        ``names`` are the names of shape classes which differ from the names of their shapes.
+        """
         shape = self.shapes[shape_name]
         q = "\"" if quoted else ""
+        prefix = ns(shape_name) if callable(ns) else ns
+        class_name = names.get(shape_name, shape_name) if names else shape_name
         if shape.is_enum:
-            return f"typing.Union[str, {q}{ns}{shape.name}{q}]"
+            return f"typing.Union[str, {q}{prefix}{class_name}{q}]"
         elif shape.type_name in AbShape.PRIMITIVE_TYPES:
             type_ = AbShape.PRIMITIVE_TYPES[shape.type_name]
             if type_ is datetime.datetime:
@@ -293,13 +893,13 @@ class ServiceGenerator(CodeGenerator):
             else:
                 return type_.__name__
         elif shape.type_name == "list":
-            return f"typing.List[{self.type_annotation_for_shape(shape.member.name, quoted=quoted, ns=ns)}]"
+            return f"typing.List[{self.type_annotation_for_shape(shape.member.name, quoted, ns, names)}]"
         elif shape.type_name == "structure":
-            return f"{q}{ns}{shape.name}{q}"
+            return f"{q}{prefix}{class_name}{q}"
         elif shape.type_name == "map":
             return (
-                f"typing.Dict[{self.type_annotation_for_shape(shape.key.name, quoted=quoted, ns=ns)}, "
-                f"{self.type_annotation_for_shape(shape.value.name, quoted=quoted, ns=ns)}]"
+                f"typing.Dict[{self.type_annotation_for_shape(shape.key.name, quoted, ns, names)}, "
+                f"{self.type_annotation_for_shape(shape.value.name, quoted, ns, names)}]"
             )
         else:
             return "typing.Any"
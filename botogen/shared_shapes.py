@@ -0,0 +1,181 @@
+import collections
+import typing
+from pathlib import Path
+
+from .autoboto_template.core.docs import DOCS_RESOURCE, dump_docs
+from .log import log
+
+if typing.TYPE_CHECKING:
+    from .service_generator import ServiceGenerator
+
+# Module in the services package which has the classes of shapes that are shared.
+SHARED_SHAPES_MODULE = "_shared_shapes"
+
+
+class SharedShapes:
+    """
+    Finds structures and enums which are structurally identical, in one service or across
+    services, and generates their classes once in the shared shapes module. The shapes modules
+    of services re-export them under the names of their shapes, so for example
+    ``services.ec2.shapes.Tag`` and ``services.autoscaling.shapes.TagDescription`` may be
+    the same class, named after the most common name of its shapes.
+
+    The documentation of a shared class and of its attributes is only kept if it is the same
+    for all the shapes that share it. With external docs, it is put in the docs index
+    of the services package, like the documentation of a service in the index of its package.
+    """
+
+    def __init__(self, generators: typing.List["ServiceGenerator"]):
+        self.generators = generators
+
+        # (generator, shape name) of the shapes of each structural key, in the order in which they are found.
+        self.shapes_by_key: typing.Dict[typing.Tuple, typing.List[typing.Tuple["ServiceGenerator", str]]] = (
+            collections.OrderedDict()
+        )
+        for generator in generators:
+            for shape_name, shape in generator.shapes.items():
+                if shape.is_enum or shape.type_name == "structure":
+                    key = generator.shape_key(shape_name)
+                    if key is not None:
+                        self.shapes_by_key.setdefault(key, []).append((generator, shape_name))
+
+        # Class names of the shared keys
+        self.names: typing.Dict[typing.Tuple, str] = collections.OrderedDict()
+        self._taken_names = set()
+        shared_keys = [key for key, shapes in self.shapes_by_key.items() if len(shapes) > 1]
+        for key in self._with_referenced_keys(shared_keys):
+            self.names[key] = self._make_name(key)
+
+        for key, name in self.names.items():
+            for generator, shape_name in self.shapes_by_key[key]:
+                generator.shared_shape_names[shape_name] = name
+
+        # Documentation to write to the docs index of the services package instead of the code, by name.
+        # None when documentation is generated in the code.
+        self.docs: typing.Optional[typing.Dict[str, str]] = None
+
+    def _with_referenced_keys(self, keys: typing.List[typing.Tuple]) -> typing.List[typing.Tuple]:
+        """
+        Classes of shared shapes refer to other shared classes only, so the keys
+        of structures and enums referred to by shared keys are shared too.
+        """
+        result = collections.OrderedDict()
+        stack = list(reversed(keys))
+        while stack:
+            key = stack.pop()
+            if key in result:
+                continue
+            result[key] = None
+            if key[0] == "structure":
+                for _, member_key in key[3]:
+                    stack.extend(self._class_keys(member_key))
+        return list(result)
+
+    def _class_keys(self, key) -> typing.List[typing.Tuple]:
+        if isinstance(key, str):
+            return []
+        elif key[0] in ("structure", "enum"):
+            return [key]
+        return [class_key for item_key in key[1:] for class_key in self._class_keys(item_key)]
+
+    def _make_name(self, key) -> str:
+        counts = collections.Counter(shape_name for _, shape_name in self.shapes_by_key[key])
+        name = counts.most_common(1)[0][0]
+        unique_name, i = name, 1
+        while unique_name in self._taken_names:
+            i += 1
+            unique_name = f"{name}_{i}"
+        self._taken_names.add(unique_name)
+        return unique_name
+
+    def _common_documentation(self, key) -> typing.Callable[[str, typing.Optional[str]], typing.Optional[str]]:
+        """
+        Returns the function that gives the documentation of the shared class and its attributes.
+        """
+        docs = collections.defaultdict(set)
+        for generator, shape_name in self.shapes_by_key[key]:
+            shape = generator.shapes[shape_name]
+            docs["class"].add(shape.documentation)
+            if shape.type_name == "structure":
+                for member in shape.sorted_members:
+                    docs[generator.make_shape_attribute_name(member.name)].add(member.documentation)
+
+        def documentation(name, html):
+            # Names are like "shapes.Tag" or "shapes.Tag.key"
+            docs_key = "class" if name.count(".") == 1 else name.rsplit(".", 1)[1]
+            if len(docs[docs_key]) != 1:
+                return None
+            if self.docs is None or not html:
+                return html
+            self.docs[name] = self.generators[0].doc_cache.html_to_text(html, width=80)
+            return None
+
+        return documentation
+
+    def write_modules(self, services_dir: Path):
+        if not self.names:
+            return
+        config = self.generators[0].config
+
+        if config.external_docs:
+            # Stubs keep the documentation for IDEs.
+            self._write_modules(services_dir, suffix=".pyi")
+            self.docs = {}
+            self._write_modules(services_dir, suffix=".py")
+            (services_dir / DOCS_RESOURCE).write_bytes(dump_docs(self.docs))
+        else:
+            self._write_modules(services_dir, suffix=".py")
+
+        num_shapes = sum(len(self.shapes_by_key[key]) for key in self.names)
+        log.info(f"{num_shapes} shapes share {len(self.names)} classes in {SHARED_SHAPES_MODULE}")
+
+    def _write_modules(self, services_dir: Path, suffix: str):
+        generator = self.generators[0]
+        config = generator.config
+        keys = list(self.names)
+
+        if config.shapes_chunk_size:
+            chunks = [keys[i:i + config.shapes_chunk_size] for i in range(0, len(keys), config.shapes_chunk_size)]
+            for i, chunk_keys in enumerate(chunks):
+                chunk_module = self.generate_module(chunk_keys, name=f"{SHARED_SHAPES_MODULE}_{i}", chunked=True)
+                chunk_module.write_to(services_dir / f"{SHARED_SHAPES_MODULE}_{i}{suffix}", format=config.yapf_style)
+            module = generator.generate_shapes_facade_module(
+                [[self.names[key] for key in chunk_keys] for chunk_keys in chunks],
+                name=SHARED_SHAPES_MODULE,
+                chunk_prefix=f"{SHARED_SHAPES_MODULE}_",
+            )
+        else:
+            module = self.generate_module(keys, name=SHARED_SHAPES_MODULE, chunked=False)
+        module.write_to(services_dir / f"{SHARED_SHAPES_MODULE}{suffix}", format=config.yapf_style)
+
+    def generate_module(self, keys: typing.List[typing.Tuple], name: str, chunked: bool):
+        generator = self.generators[0]
+        module = generator.module(
+            name=name,
+            imports=[
+                "import datetime",
+                "import typing",
+                f"from {generator.botogen.target_autoboto_package_name} import ShapeBase, OutputShapeBase, TypeInfo",
+            ],
+        )
+        if chunked:
+            module.add_to_imports(f"from . import {SHARED_SHAPES_MODULE} as _shapes")
+        local_names = set(self.names[key] for key in keys)
+
+        for key in keys:
+            # The class is generated from the first of its shapes by the generator of its service.
+            generator, shape_name = self.shapes_by_key[key][0]
+
+            def ns(member_shape_name, generator=generator):
+                return "" if generator.shared_shape_names.get(member_shape_name) in local_names else "_shapes."
+
+            generator.generate_shape_class(
+                module,
+                generator.shapes[shape_name],
+                ns=ns,
+                names=generator.shared_shape_names,
+                class_name=self.names[key],
+                documentation=self._common_documentation(key),
+                docs=self.docs,
+            )
+        return module
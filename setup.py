@@ -24,10 +24,14 @@ setup(
     description="boto3 with auto-complete and dataclasses not dicts",
     long_description=read("docs/README.rst"),
     packages=find_packages("."),
+    package_data={
+        "autoboto": ["services/*.marshal", "services/*/*.marshal", "services/*/*.zlib", "services/*/*.pyi"],
+    },
     python_requires=">=3.6.0",
     install_requires=[
         "boto3",
         "dataclasses",
+        "typing_extensions",
         "typing_inspect",
     ],
     extras_require={
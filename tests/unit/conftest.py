@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from botogen import Botogen
+from botogen import Botogen, ServiceGenerator
 
 # These only make sense in local development environment.
 # When autoboto is installed as a package, you shouldn't be running the tests.
@@ -82,3 +82,11 @@ def s3_shapes(botogen):
         raise Exception(
             f"Failed to import {botogen.config.target_package}.services.s3.shapes with sys.path={sys.path}"
         )
+
+
+@pytest.fixture(scope="session")
+def s3_model(botogen) -> ServiceGenerator:
+    """
+    The S3 model of the installed botocore, to compare the generated documentation with.
+    """
+    return ServiceGenerator(service_name="s3", botogen=botogen)
@@ -0,0 +1,16 @@
+from botogen import ServiceGenerator
+
+
+def words(text: str) -> str:
+    return " ".join(text.split())
+
+
+def doc_text(generator: ServiceGenerator, html: str) -> str:
+    """
+    The documentation of the model converted from HTML like for the docs index,
+    with the whitespace normalised so that it can be looked for in indented code.
+    Fails if the model has no documentation there, as then there is nothing to look for.
+    """
+    text = words(generator.doc_cache.html_to_text(html or "", width=80))
+    assert text, f"no documentation in the model: {html!r}"
+    return text
@@ -0,0 +1,28 @@
+from botogen.indentist import CodeGenerator, DocCache
+
+
+def test_converts_html_once(tmp_path):
+    cache = DocCache(tmp_path / "docs.sqlite")
+    assert cache.html_to_text("<p>Hello <b>world</b></p>", width=80) == "Hello **world**"
+    assert cache.html_to_text("<p>Hello <b>world</b></p>", width=80) == "Hello **world**"
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.save()
+
+    cache = DocCache(tmp_path / "docs.sqlite")
+    assert cache.html_to_text("<p>Hello <b>world</b></p>", width=80) == "Hello **world**"
+    assert cache.html_to_text("<p>Hello <b>world</b></p>", width=75) == "Hello **world**"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_doc_string_uses_shared_cache():
+    code = CodeGenerator()
+    code.documention_input_is_html = True
+    misses = CodeGenerator.doc_cache.misses
+    html = "<p>Documentation used by test_doc_string_uses_shared_cache</p>"
+
+    assert code.doc_string(html).to_code() == '"""\nDocumentation used by test_doc_string_uses_shared_cache\n"""'
+    assert CodeGenerator().doc_string(html).to_code() == f'"""\n{html}\n"""'
+    other = CodeGenerator()
+    other.documention_input_is_html = True
+    other.doc_string(html).to_code()
+    assert CodeGenerator.doc_cache.misses == misses + 1
@@ -0,0 +1,87 @@
+import threading
+import typing
+
+import dataclasses
+
+from botogen.autoboto_template import OutputShapeBase, ShapeBase
+from botogen.autoboto_template.core import AutoBatchingClient
+
+
+@dataclasses.dataclass
+class Volume(ShapeBase):
+    volume_id: str = ShapeBase.NOT_SET
+
+
+@dataclasses.dataclass
+class DescribeVolumesResult(OutputShapeBase):
+    volumes: typing.List[Volume] = ShapeBase.NOT_SET
+
+
+class FakeClient:
+    _batchable_operations = {
+        "describe_volumes": {
+            "id_param": "volume_ids",
+            "result_path": ["volumes"],
+            "result_id_attr": "volume_id",
+            "max_ids": None,
+        },
+    }
+
+    def __init__(self):
+        self.calls = []
+
+    def describe_volumes(self, *, volume_ids=ShapeBase.NOT_SET):
+        self.calls.append(volume_ids)
+        if "vol-bad" in volume_ids:
+            raise ValueError("vol-bad")
+        return DescribeVolumesResult(volumes=[Volume(volume_id=v) for v in volume_ids])
+
+
+def call_concurrently(func, args_list):
+    results = [None] * len(args_list)
+
+    def target(i, args):
+        try:
+            results[i] = func(*args)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=target, args=(i, args)) for i, args in enumerate(args_list)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_single_id_calls_are_merged_and_split():
+    client = FakeClient()
+    batching = AutoBatchingClient(client, window=0.2)
+
+    results = call_concurrently(
+        lambda v: batching.describe_volumes(volume_ids=[v]),
+        [("vol-1",), ("vol-2",), ("vol-3",)],
+    )
+
+    assert len(client.calls) == 1
+    assert sorted(client.calls[0]) == ["vol-1", "vol-2", "vol-3"]
+    assert [[v.volume_id for v in r.volumes] for r in results] == [["vol-1"], ["vol-2"], ["vol-3"]]
+
+
+def test_batches_respect_max_batch_size():
+    client = FakeClient()
+    batching = AutoBatchingClient(client, window=0.2, max_batch_size=2)
+
+    call_concurrently(lambda v: batching.describe_volumes(volume_ids=[v]), [("vol-1",), ("vol-2",), ("vol-3",)])
+
+    assert sorted(len(ids) for ids in client.calls) == [1, 2]
+
+
+def test_failed_batch_is_retried_per_caller():
+    client = FakeClient()
+    batching = AutoBatchingClient(client, window=0.2)
+
+    results = call_concurrently(lambda v: batching.describe_volumes(volume_ids=[v]), [("vol-1",), ("vol-bad",)])
+
+    assert isinstance(results[1], ValueError)
+    assert [v.volume_id for v in results[0].volumes] == ["vol-1"]
@@ -0,0 +1,85 @@
+import threading
+
+from botocore.exceptions import EndpointConnectionError, ParamValidationError
+
+from botogen.autoboto_template.core import BatchExecutor, BatchSpec
+
+
+class FakeBatchApi:
+    def __init__(self, flaky=()):
+        self.requests = []
+        self.flaky = set(flaky)
+        self.lock = threading.Lock()
+
+    def send(self, client, entries):
+        with self.lock:
+            self.requests.append(list(entries))
+        return {"entries": list(entries)}
+
+    def get_failed(self, entries, response):
+        failed = []
+        with self.lock:
+            for entry in entries:
+                if entry in self.flaky:
+                    self.flaky.remove(entry)
+                    failed.append((entry, "Unprocessed"))
+                elif entry == "bad":
+                    failed.append((entry, "AccessDenied"))
+        return failed
+
+
+def test_entries_are_chunked_by_count():
+    api = FakeBatchApi()
+    spec = BatchSpec(max_count=10, send=api.send, get_failed=api.get_failed)
+
+    result = BatchExecutor(None, spec).run(str(i) for i in range(95))
+
+    assert sorted(len(r) for r in api.requests) == [5] + [10] * 9
+    assert result.stats.num_entries == 95
+    assert result.stats.num_succeeded == 95
+    assert result.stats.num_requests == 10
+    assert not result.failed
+
+
+def test_entries_are_chunked_by_bytes():
+    api = FakeBatchApi()
+    spec = BatchSpec(max_count=10, max_bytes=10, send=api.send, get_failed=api.get_failed)
+
+    result = BatchExecutor(None, spec).run(["aaaa", "bbbb", "cccc", "dd", "x" * 11])
+
+    assert sorted(api.requests) == [["aaaa", "bbbb"], ["cccc", "dd"]]
+    assert result.failed == [("x" * 11, "EntryTooLarge")]
+
+
+def test_unprocessed_entries_are_retried_and_failed_entries_reported():
+    api = FakeBatchApi(flaky=["1", "3"])
+    spec = BatchSpec(max_count=2, send=api.send, get_failed=api.get_failed)
+
+    result = BatchExecutor(None, spec, backoff_base=0.001).run(["1", "2", "3", "bad"])
+
+    sent = [entry for request in api.requests for entry in request]
+    assert sorted(sent) == ["1", "1", "2", "3", "3", "bad"]
+    assert result.failed == [("bad", "AccessDenied")]
+    assert result.stats.num_retried_entries == 2
+    assert result.stats.num_succeeded == 3
+    assert result.stats.num_failed == 1
+
+
+def test_chunks_failing_without_response_do_not_abort_the_run():
+    attempts = []
+
+    def send(client, entries):
+        attempts.append(list(entries))
+        if "invalid" in entries:
+            raise ParamValidationError(report="invalid entry")
+        if len(attempts) == 1:
+            raise EndpointConnectionError(endpoint_url="https://example.com")
+        return {"entries": list(entries)}
+
+    spec = BatchSpec(max_count=2, send=send, get_failed=lambda entries, response: [])
+    result = BatchExecutor(None, spec, max_workers=1, backoff_base=0.001).run(["1", "2", "invalid", "3"])
+
+    assert sum(attempts, []).count("1") == 2
+    assert result.failed == [("invalid", "ParamValidationError"), ("3", "ParamValidationError")]
+    assert result.stats.num_succeeded == 2
+    assert result.stats.num_failed == 2
@@ -0,0 +1,52 @@
+import zipfile
+
+import pytest
+
+from botogen import Botogen
+
+from .test_lazy_services import run_in_new_interpreter
+
+
+@pytest.fixture(scope="module")
+def bundled_botogen(tmp_path_factory, target_package) -> Botogen:
+    botogen = Botogen(
+        services=["s3", "sqs"],
+        yapf_style=None,
+        build_dir=tmp_path_factory.mktemp("bundle_build"),
+        target_dir=tmp_path_factory.mktemp("bundle_target"),
+        target_package=f"{target_package}_bundled",
+        bundle=True,
+        bundle_services=["s3"],
+    )
+    botogen.run()
+    return botogen
+
+
+def test_bundle_has_bytecode_and_data_only(bundled_botogen):
+    package = bundled_botogen.config.target_package
+    with zipfile.ZipFile(str(bundled_botogen.bundle_path)) as archive:
+        names = archive.namelist()
+
+    assert f"{package}/services/s3/shapes.pyc" in names
+    assert f"{package}/services/s3/botocore_model.marshal" in names
+    assert f"{package}/services/" in names
+    assert not any(name.endswith((".py", ".pyi")) or "__pycache__" in name for name in names)
+    assert not any(name.startswith(f"{package}/services/sqs/") for name in names)
+
+
+def test_bundle_is_importable(bundled_botogen):
+    run_in_new_interpreter(bundled_botogen, """
+        from botocore.stub import Stubber
+        from autoboto import services
+        from autoboto.core.model_snapshot import SERVICE_SNAPSHOT_RESOURCE, load_snapshot
+
+        assert services.__all__ == ["s3"]
+        assert ".zip" in services.s3.shapes.__file__
+        assert services.s3.shapes.Bucket(name="b").to_boto() == {"Name": "b"}
+        assert load_snapshot("autoboto.services.s3", SERVICE_SNAPSHOT_RESOURCE) is not None
+
+        client = services.s3.Client(region_name="us-east-1")
+        with Stubber(client._boto_client) as stubber:
+            stubber.add_response("get_bucket_location", {"LocationConstraint": "eu-west-1"}, {"Bucket": "b"})
+            assert client.get_bucket_location(bucket="b").location_constraint == "eu-west-1"
+    """, path=bundled_botogen.bundle_path)
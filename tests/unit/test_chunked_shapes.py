@@ -0,0 +1,78 @@
+import typing
+
+import pytest
+
+from botogen import Botogen, ServiceGenerator
+
+from .test_lazy_services import run_in_new_interpreter
+
+
+@pytest.fixture(scope="module")
+def chunked_botogen(tmp_path_factory, target_dir, target_package) -> Botogen:
+    botogen = Botogen(
+        services=["s3"],
+        yapf_style=None,
+        build_dir=tmp_path_factory.mktemp("chunked"),
+        target_dir=target_dir,
+        target_package=f"{target_package}_chunked",
+        shapes_chunk_size=20,
+    )
+    botogen.run()
+    return botogen
+
+
+def test_chunk_shapes(botogen):
+    s3 = ServiceGenerator(service_name="s3", botogen=botogen)
+    chunks = s3.chunk_shapes(20)
+
+    shape_names = [name for chunk in chunks for name in chunk]
+    assert sorted(shape_names) == sorted(
+        name for name, shape in s3.shapes.items() if shape.is_enum or shape.type_name in ("structure", "blob")
+    )
+    assert all(len(chunk) <= 20 for chunk in chunks)
+
+    # Shapes come after the shapes they refer to
+    assert shape_names.index("Owner") < shape_names.index("ListBucketsOutput")
+    assert shape_names.index("Bucket") < shape_names.index("ListBucketsOutput")
+
+
+def test_chunks_are_imported_on_first_access(chunked_botogen):
+    run_in_new_interpreter(chunked_botogen, """
+        import sys
+        from autoboto.services.s3 import shapes
+
+        def chunks():
+            return sorted(name for name in sys.modules if name.startswith("autoboto.services.s3._shapes_"))
+
+        assert chunks() == []
+        assert shapes.Bucket(name="b").to_boto() == {"Name": "b"}
+        assert len(chunks()) == 1
+        assert "Bucket" in shapes.__all__
+    """)
+
+
+def test_shapes_behave_as_unchunked(chunked_botogen, s3_shapes):
+    shapes = chunked_botogen.import_generated_autoboto_module("services.s3.shapes")
+    response = {
+        "Buckets": [{"Name": "a"}, {"Name": "b"}],
+        "Owner": {"DisplayName": "x", "ID": "1"},
+    }
+
+    output = shapes.ListBucketsOutput.from_boto(response)
+    assert output.owner == shapes.Owner(display_name="x", id="1")
+    assert [bucket.name for bucket in output.buckets] == ["a", "b"]
+    assert output.to_boto() == s3_shapes.ListBucketsOutput.from_boto(response).to_boto()
+
+    hints = typing.get_type_hints(shapes.ListBucketsOutput)
+    assert hints["owner"] is shapes.Owner
+    assert hints["buckets"] == typing.List[shapes.Bucket]
+
+
+def test_references_across_chunks_resolve(chunked_botogen):
+    shapes = chunked_botogen.import_generated_autoboto_module("services.s3.shapes")
+    for name in shapes.__all__:
+        shape_type = getattr(shapes, name)
+        if hasattr(shape_type, "_get_boto_mapping"):
+            typing.get_type_hints(shape_type)
+            for _, _, type_info in shape_type._get_cached_boto_mapping():
+                assert type_info.type is not None
@@ -0,0 +1,71 @@
+import pytest
+from botocore.config import Config
+from botocore.stub import Stubber
+
+from botogen.autoboto_template.core import ClientPool
+
+
+@pytest.fixture
+def s3(botogen):
+    return botogen.import_generated_autoboto_module("services.s3")
+
+
+def test_boto_client_is_created_on_first_use(s3):
+    client = s3.Client(region_name="us-east-1")
+    assert client._client is None
+
+    with Stubber(client._boto_client) as stubber:
+        stubber.add_response("get_bucket_location", {"LocationConstraint": "eu-west-1"}, {"Bucket": "b"})
+        assert client.get_bucket_location(bucket="b").location_constraint == "eu-west-1"
+
+    assert client._client is not None
+
+
+def test_boto_client_is_recreated_after_fork(s3):
+    client = s3.Client(region_name="us-east-1")
+    boto_client = client._boto_client
+    assert client._boto_client is boto_client
+
+    client._client_pid = -1  # as if the process had been forked
+    assert client._boto_client is not boto_client
+
+
+def test_pool_shares_clients(s3):
+    pool = ClientPool()
+    client = pool.get_client(s3.Client, region_name="us-east-1")
+    assert pool.get_client(s3.Client, region_name="us-east-1") is client
+    assert pool.get_client(s3.Client, region_name="eu-west-1") is not client
+
+    options = {"connect_timeout": 7, "retries": {"max_attempts": 2}}
+    options_client = pool.get_client(s3.Client, region_name="us-east-1", config=options)
+    assert options_client is not client
+    assert pool.get_client(s3.Client, region_name="us-east-1", config=dict(options)) is options_client
+    assert options_client._boto_client.meta.config.connect_timeout == 7
+
+    config = Config(**options)
+    config_client = pool.get_client(s3.Client, region_name="us-east-1", config=config)
+    assert config_client is not options_client
+    assert pool.get_client(s3.Client, region_name="us-east-1", config=config) is config_client
+
+    assert len(pool) == 4
+    assert client._boto_client.meta.region_name == "us-east-1"
+
+
+def test_pool_creates_sessions_on_first_use(s3):
+    pool = ClientPool()
+    client = pool.get_client(s3.Client, region_name="us-east-1")
+    other_client = pool.get_client(s3.Client, region_name="eu-west-1")
+    assert pool._sessions == {}
+
+    client._boto_client
+    other_client._boto_client
+    assert list(pool._sessions) == [None]
+
+
+def test_pool_is_emptied_after_fork(s3):
+    pool = ClientPool()
+    client = pool.get_client(s3.Client, region_name="us-east-1")
+
+    pool._pid = -1  # as if the process had been forked
+    assert len(pool) == 0
+    assert pool.get_client(s3.Client, region_name="us-east-1") is not client
@@ -0,0 +1,62 @@
+import importlib.machinery
+
+import pytest
+
+from botogen import Botogen
+from botogen.compile import compile_modules
+
+from .test_lazy_services import run_in_new_interpreter
+
+pytest.importorskip("mypyc")
+
+
+@pytest.fixture(scope="module")
+def compiled_botogen(tmp_path_factory, target_package) -> Botogen:
+    botogen = Botogen(
+        services=["s3"],
+        yapf_style=None,
+        build_dir=tmp_path_factory.mktemp("compile_build"),
+        target_dir=tmp_path_factory.mktemp("compile_target"),
+        target_package=f"{target_package}_compiled",
+        compile=True,
+    )
+    botogen.run()
+    return botogen
+
+
+def test_conversion_is_compiled(compiled_botogen):
+    package_dir = compiled_botogen.target_autoboto_package_dir
+    assert list(package_dir.glob(f"_convert{importlib.machinery.EXTENSION_SUFFIXES[0]}"))
+    assert not (package_dir / "build").exists()
+
+    run_in_new_interpreter(compiled_botogen, """
+        import importlib.machinery
+        from autoboto import _convert
+        from autoboto.services.s3 import shapes
+
+        assert _convert.__file__.endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES))
+
+        payload = {"Buckets": [{"Name": "a"}, {"Name": "b"}], "Owner": {"DisplayName": "x", "ID": "1"}}
+        output = shapes.ListBucketsOutput.from_boto(payload)
+        assert output.buckets == [shapes.Bucket(name="a"), shapes.Bucket(name="b")]
+        assert output.owner.display_name == "x"
+        assert output.to_boto() == payload
+        assert shapes.Bucket(name="a").to_boto() == {"Name": "a"}
+
+        try:
+            shapes.Bucket.from_boto({"Name": "a", "Nme": "a"})
+        except ValueError as e:
+            assert "Nme" in str(e)
+        else:
+            assert False
+    """, path=compiled_botogen.config.target_dir)
+
+
+def test_failed_compilation_leaves_package_pure_python(compiled_botogen, tmp_path):
+    package_dir = tmp_path / compiled_botogen.config.target_package
+    package_dir.mkdir()
+    (package_dir / "__init__.py").touch()
+    (package_dir / "_convert.py").write_text("x: int = 'not an int'\n")
+
+    assert compile_modules(package_dir) is False
+    assert sorted(path.name for path in package_dir.iterdir()) == ["__init__.py", "_convert.py"]
@@ -0,0 +1,114 @@
+import datetime
+import stat
+import threading
+import time
+import types
+
+import botocore.session
+import pytest
+from botocore.credentials import DeferredRefreshableCredentials
+from botocore.exceptions import ClientError
+from dateutil.tz import tzutc
+
+from botogen.autoboto_template.core import DiskCredentialCache
+
+
+def make_response(expires_in: float):
+    return {
+        "Credentials": {
+            "AccessKeyId": "AKID",
+            "SecretAccessKey": "SECRET",
+            "SessionToken": "TOKEN",
+            "Expiration": datetime.datetime.now(tzutc()) + datetime.timedelta(seconds=expires_in),
+        },
+    }
+
+
+def test_stores_credentials_readable_by_owner_only(tmp_path):
+    cache = DiskCredentialCache(tmp_path)
+    assert "key" not in cache
+    cache["key"] = make_response(3600)
+
+    assert "key" in cache
+    assert cache["key"]["Credentials"]["AccessKeyId"] == "AKID"
+    assert stat.S_IMODE((tmp_path / "key.json").stat().st_mode) == 0o600
+
+
+def test_credentials_about_to_expire_are_refreshed(tmp_path):
+    cache = DiskCredentialCache(tmp_path, refresh_margin=600)
+    cache["key"] = make_response(300)
+    assert "key" not in cache
+    cache["key"] = make_response(3600)
+    assert "key" in cache
+
+
+def test_only_one_process_refreshes(tmp_path):
+    first = DiskCredentialCache(tmp_path)
+    second = DiskCredentialCache(tmp_path)  # as if in another process
+    assert "key" not in first
+
+    found = []
+    waiter = threading.Thread(target=lambda: found.append("key" in second))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive()  # waiting for the first one to store credentials
+
+    first["key"] = make_response(3600)
+    waiter.join(5)
+    assert found == [True]
+
+
+def test_install(tmp_path):
+    session = botocore.session.Session()
+    cache = DiskCredentialCache(tmp_path)
+    cache.install(session)
+    assert session.get_component("credential_provider").get_provider("assume-role").cache is cache
+
+
+def test_threads_of_one_process_wait_for_each_other(tmp_path):
+    cache = DiskCredentialCache(tmp_path)
+    assert "key" not in cache
+
+    found = []
+    waiter = threading.Thread(target=lambda: found.append("key" in cache))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive()
+
+    cache["key"] = make_response(3600)
+    waiter.join(5)
+    assert found == [True]
+
+
+def test_lock_is_released_when_sts_call_fails(tmp_path):
+    cache = DiskCredentialCache(tmp_path, lock_timeout=5)
+
+    class Provider:
+        cache = None
+
+        def load(self):
+            return DeferredRefreshableCredentials(refresh_using=self.fetch, method="assume-role")
+
+        def fetch(self):
+            assert "key" not in self.cache
+            raise ClientError({"Error": {"Code": "AccessDenied"}}, "AssumeRole")
+
+    provider = Provider()
+    resolver = types.SimpleNamespace(get_provider=lambda method: provider if method == "assume-role" else None)
+    cache.install(types.SimpleNamespace(get_component=lambda name: resolver))
+
+    with pytest.raises(ClientError):
+        provider.load().get_frozen_credentials()
+
+    # Neither another process nor another thread waits for the failed call.
+    started_at = time.monotonic()
+    other = DiskCredentialCache(tmp_path, lock_timeout=5)
+    assert "key" not in other
+    other["key"] = make_response(3600)
+
+    found = []
+    thread = threading.Thread(target=lambda: found.append("key" in cache))
+    thread.start()
+    thread.join(5)
+    assert found == [True]
+    assert time.monotonic() - started_at < 1
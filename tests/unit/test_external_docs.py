@@ -0,0 +1,49 @@
+import pydoc
+
+import pytest
+
+from botogen import Botogen
+
+from .doc_helpers import doc_text, words
+
+
+@pytest.fixture(scope="module")
+def external_docs_botogen(tmp_path_factory, target_dir, target_package) -> Botogen:
+    botogen = Botogen(
+        services=["s3"],
+        yapf_style=None,
+        build_dir=tmp_path_factory.mktemp("external_docs"),
+        target_dir=target_dir,
+        target_package=f"{target_package}_external_docs",
+        external_docs=True,
+    )
+    botogen.run()
+    return botogen
+
+
+def test_docs_are_not_in_code(external_docs_botogen, s3_model):
+    service_dir = external_docs_botogen.get_autoboto_path("services/s3")
+    # Unlike Bucket, CORSRule is documented in older models too.
+    cors_rule_doc = doc_text(s3_model, s3_model.shapes["CORSRule"].documentation)
+
+    assert cors_rule_doc not in words((service_dir / "shapes.py").read_text())
+    assert cors_rule_doc in words((service_dir / "shapes.pyi").read_text())
+    assert (service_dir / "client.pyi").exists()
+    assert (service_dir / "docs.marshal.zlib").exists()
+
+
+def test_docs_are_loaded_on_access(external_docs_botogen, s3_model):
+    s3 = external_docs_botogen.import_generated_autoboto_module("services.s3")
+    docs = external_docs_botogen.import_generated_autoboto_module("core.docs")
+    cors_rule_doc = doc_text(s3_model, s3_model.shapes["CORSRule"].documentation)
+    bucket_name_doc = doc_text(s3_model, s3_model.shapes["Bucket"].members["Name"].documentation)
+    list_buckets_doc = doc_text(s3_model, s3_model.operations["ListBuckets"].documentation)
+
+    assert words(s3.shapes.CORSRule.__doc__) == cors_rule_doc
+    assert words(s3.shapes.CORSRule().__doc__) == cors_rule_doc
+    assert s3.shapes.AbortMultipartUploadOutput.__doc__ is None
+    assert words(docs.load_docs(s3.__name__)["shapes.Bucket.name"]) == bucket_name_doc
+
+    assert s3.Client.__doc__ is None
+    assert words(s3.Client.list_buckets.__doc__) == list_buckets_doc
+    assert list_buckets_doc in words(pydoc.render_doc(s3.Client, renderer=pydoc.plaintext))
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from botogen.autoboto_template.core import HedgingPolicy, LatencyHistogram
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram(max_samples=100)
+    assert histogram.percentile(50) is None
+
+    for i in range(200):
+        histogram.record(i)
+
+    assert len(histogram) == 100
+    assert histogram.percentile(50) == 150
+    assert histogram.percentile(99) == 199
+
+
+def test_slow_call_is_hedged_and_first_response_wins():
+    policy = HedgingPolicy(percentile=90, budget=1.0, min_samples=5)
+    for _ in range(5):
+        policy.call("op", lambda: "fast")
+
+    calls = []
+    lock = threading.Lock()
+
+    def func():
+        with lock:
+            calls.append(None)
+            is_first = len(calls) == 1
+        if is_first:
+            time.sleep(0.5)
+            return "slow"
+        return "hedged"
+
+    assert policy.call("op", func) == "hedged"
+    assert policy.num_hedged_requests == 1
+    assert policy.num_hedge_wins == 1
+
+
+def test_hedging_is_capped_by_budget():
+    policy = HedgingPolicy(percentile=50, budget=0.0, max_burst=0.0, min_samples=1)
+    policy.call("op", lambda: None)
+
+    def slow():
+        time.sleep(0.05)
+        return "slow"
+
+    assert policy.call("op", slow) == "slow"
+    assert policy.num_hedged_requests == 0
+
+
+def test_primary_attempts_do_not_queue_for_hedging_threads():
+    policy = HedgingPolicy(percentile=99, budget=0.0, max_burst=1.0, min_samples=1, max_workers=1)
+    policy.call("op", lambda: time.sleep(0.2))
+
+    # Without a token for a hedge, the call runs on the caller's thread.
+    policy._tokens = 0
+    assert policy.call("op", threading.get_ident) == threading.get_ident()
+
+    policy._tokens = 1
+    threads = [threading.Thread(target=policy.call, args=("op", lambda: time.sleep(0.1))) for _ in range(4)]
+    started_at = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started_at < 0.3
+    assert max(policy.get_histogram("op")._samples) < 0.3
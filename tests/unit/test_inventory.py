@@ -0,0 +1,64 @@
+import datetime
+import types
+
+from botocore.stub import Stubber
+from dateutil.tz import tzutc
+
+from botogen.autoboto_template.core import ResourceInventory, ResourceType, s3_buckets
+
+
+def make_resource(id, team, state):
+    return types.SimpleNamespace(id=id, tags={"team": team}, state=types.SimpleNamespace(name=state))
+
+
+def make_inventory(snapshots):
+    snapshots = iter(snapshots)
+    resource_type = ResourceType(
+        name="test:resource",
+        list_resources=lambda client: next(snapshots),
+        get_id=lambda resource: resource.id,
+        get_tags=lambda resource: resource.tags,
+        indexed_attributes=["state.name"],
+    )
+    return ResourceInventory(client=None, resource_type=resource_type)
+
+
+def test_refresh_diffs_and_reindexes():
+    inventory = make_inventory([
+        [make_resource("a", "x", "running"), make_resource("b", "y", "running")],
+        [make_resource("a", "x", "stopped"), make_resource("c", "y", "running")],
+    ])
+    diffs = []
+    inventory.on_change(diffs.append)
+
+    first = inventory.refresh()
+    assert [r.id for r in first.added] == ["a", "b"]
+    assert {r.id for r in inventory.find_by("state.name", "running")} == {"a", "b"}
+    assert {r.id for r in inventory.find_by_tag("team")} == {"a", "b"}
+
+    second = inventory.refresh()
+    assert [r.id for r in second.added] == ["c"]
+    assert [(old.state.name, new.state.name) for old, new in second.changed] == [("running", "stopped")]
+    assert [r.id for r in second.removed] == ["b"]
+    assert diffs == [first, second]
+
+    assert len(inventory) == 2
+    assert inventory.get("b") is None
+    assert {r.id for r in inventory.find_by("state.name", "running")} == {"c"}
+    assert [r.id for r in inventory.find_by("state.name", "stopped")] == ["a"]
+    assert [r.id for r in inventory.find_by_tag("team", "y")] == ["c"]
+
+
+def test_s3_buckets(botogen):
+    client = botogen.import_generated_autoboto_module("services.s3").Client(region_name="us-east-1")
+    created = datetime.datetime(2018, 1, 1, tzinfo=tzutc())
+    inventory = ResourceInventory(client, s3_buckets())
+
+    with Stubber(client._boto_client) as stubber:
+        for names in (["a", "b"], ["a", "b"]):
+            stubber.add_response("list_buckets", {"Buckets": [{"Name": n, "CreationDate": created} for n in names]})
+        assert len(inventory.refresh().added) == 2
+        assert not inventory.refresh()
+
+    assert inventory.get("a").creation_date == created
+    assert inventory.key == (None, "us-east-1", "s3:bucket")
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import textwrap
+import typing
+
+
+def run_in_new_interpreter(botogen, code, path=None):
+    env = dict(os.environ, PYTHONPATH=str(path or botogen.config.build_dir), AWS_DEFAULT_REGION="us-east-1")
+    subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code).replace("autoboto", botogen.config.target_package)],
+        env=env,
+        check=True,
+    )
+
+
+def test_services_are_imported_on_first_access(botogen):
+    run_in_new_interpreter(botogen, """
+        import sys
+        from autoboto import services
+
+        assert services.__all__ == ["s3"]
+        assert "autoboto.services.s3" not in sys.modules
+
+        client = services.s3.Client()
+        assert "autoboto.services.s3.client" in sys.modules
+        assert "autoboto.services.s3.shapes" not in sys.modules
+
+        assert services.s3.shapes.Bucket(name="b").to_boto() == {"Name": "b"}
+        assert "autoboto.services.s3.shapes" in sys.modules
+    """)
+
+
+def test_client_annotations_resolve(botogen):
+    s3 = botogen.import_generated_autoboto_module("services.s3")
+    hints = typing.get_type_hints(s3.Client.list_buckets)
+    assert hints["return"] is s3.shapes.ListBucketsOutput
+
+
+def test_core_modules_are_imported_on_first_access(botogen):
+    run_in_new_interpreter(botogen, """
+        import sys
+        import autoboto
+
+        assert not {"boto3", "autoboto.core.client", "autoboto.core.shapes"} & set(sys.modules)
+
+        assert autoboto.ClientBase is autoboto.core.client.ClientBase
+        assert "autoboto.core.pipeline" not in sys.modules
+
+        import autoboto.core.warmup
+        assert autoboto.core.warmup is autoboto.warmup
+        assert callable(autoboto.core.warmup)
+    """)
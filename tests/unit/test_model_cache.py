@@ -0,0 +1,67 @@
+import gzip
+import json
+import os
+
+import botocore.loaders
+
+from botogen.model_cache import CachingLoader
+
+
+def test_caches_parsed_models(tmp_path):
+    loader = CachingLoader(tmp_path)
+    model = loader.load_service_model("sqs", "service-2")
+    assert model == botocore.loaders.Loader().load_service_model("sqs", "service-2")
+
+    cached = list(loader.cache_dir.glob("sqs-*-service-2-*.marshal"))
+    assert len(cached) == 1
+
+    model["shapes"]["Added"] = {"type": "string"}
+    assert "Added" not in CachingLoader(tmp_path).load_service_model("sqs", "service-2")["shapes"]
+
+
+def test_cache_key_includes_file_hash(tmp_path):
+    data_dir = tmp_path / "data" / "example" / "2018-01-01"
+    data_dir.mkdir(parents=True)
+    loader = CachingLoader(tmp_path / "cache", extra_search_paths=[str(tmp_path / "data")])
+
+    (data_dir / "paginators-1.json").write_text('{"pagination": {}}')
+    assert loader.load_service_model("example", "paginators-1") == {"pagination": {}}
+
+    (data_dir / "paginators-1.json").write_text('{"pagination": {"ListThings": {}}}')
+    assert loader.load_service_model("example", "paginators-1") == {"pagination": {"ListThings": {}}}
+    assert len(list(loader.cache_dir.glob("example-*.marshal"))) == 2
+
+
+class GzipJSONFileLoader(botocore.loaders.JSONFileLoader):
+    """
+    Loads .json.gz files as botocore does since it ships its models compressed.
+    """
+
+    def exists(self, file_path):
+        return os.path.isfile(file_path + ".json.gz") or super().exists(file_path)
+
+    def load_file(self, file_path):
+        if os.path.isfile(file_path + ".json.gz"):
+            with gzip.open(file_path + ".json.gz") as f:
+                return json.loads(f.read().decode("utf-8"))
+        return super().load_file(file_path)
+
+
+def test_compressed_models_are_cached(tmp_path):
+    data_dir = tmp_path / "data" / "example" / "2018-01-01"
+    data_dir.mkdir(parents=True)
+    with gzip.open(str(data_dir / "service-2.json.gz"), "wb") as f:
+        f.write(b'{"shapes": {"Name": {"type": "string"}}}')
+    (data_dir / "service-2.sdk-extras.json").write_text(
+        '{"version": 1.0, "merge": {"shapes": {"Id": {"type": "string"}}}}',
+    )
+
+    def make_loader():
+        return CachingLoader(
+            tmp_path / "cache", extra_search_paths=[str(tmp_path / "data")], file_loader=GzipJSONFileLoader(),
+        )
+
+    expected = {"shapes": {"Name": {"type": "string"}, "Id": {"type": "string"}}}
+    assert make_loader().load_service_model("example", "service-2") == expected
+    assert len(list((tmp_path / "cache").rglob("example-*.marshal"))) == 1
+    assert make_loader().load_service_model("example", "service-2") == expected
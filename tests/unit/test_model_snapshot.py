@@ -0,0 +1,30 @@
+import boto3
+import botocore
+import botocore.loaders
+
+from botogen.autoboto_template.core.model_snapshot import SERVICE_SNAPSHOT_RESOURCE, load_snapshot
+
+
+def test_snapshot_contains_service_models(botogen):
+    snapshot = load_snapshot(f"{botogen.config.target_package}.services.s3", SERVICE_SNAPSHOT_RESOURCE)
+    assert snapshot["botocore_version"] == botocore.__version__
+    assert snapshot["service-2"] == botocore.loaders.Loader().load_service_model("s3", "service-2")
+    assert "paginators-1" in snapshot
+    assert "ResponseMetadata" not in snapshot["service-2"]["shapes"]
+
+
+def test_snapshot_of_other_botocore_version_is_ignored(botogen, monkeypatch):
+    monkeypatch.setattr(botocore, "__version__", "0.0.1")
+    assert load_snapshot(f"{botogen.config.target_package}.services.s3", SERVICE_SNAPSHOT_RESOURCE) is None
+
+
+def test_client_is_created_from_snapshot(botogen, autoboto):
+    s3 = botogen.import_generated_autoboto_module("services.s3")
+    session = boto3.session.Session()
+    client = s3.Client(session=session, region_name="us-east-1")
+    assert client._boto_client.meta.service_model.service_name == "s3"
+    assert client._boto_client.can_paginate("list_objects_v2")
+
+    loader = session._session.get_component("data_loader")
+    assert isinstance(loader, autoboto.core.model_snapshot.SnapshotLoader)
+    assert loader.has_service_snapshot("s3")
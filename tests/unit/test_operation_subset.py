@@ -0,0 +1,82 @@
+import pytest
+from botocore.stub import Stubber
+
+from botogen import Botogen, ServiceGenerator
+from botogen.config import BotogenConfig
+
+from .test_lazy_services import run_in_new_interpreter
+
+
+@pytest.fixture(scope="module")
+def subset_botogen(tmp_path_factory, target_dir, target_package) -> Botogen:
+    botogen = Botogen(
+        services=["*"],
+        operations="s3:ListBuckets,s3:GetBucketLocation,sqs:*",
+        yapf_style=None,
+        build_dir=tmp_path_factory.mktemp("subset"),
+        target_dir=target_dir,
+        target_package=f"{target_package}_subset",
+    )
+    botogen.run()
+    return botogen
+
+
+def test_config_selects_operations():
+    config = BotogenConfig(services=["*"], operations="s3:GetObject, s3:ListObjectsV2,sqs:*")
+    assert config.operation_services() == ["s3", "sqs"]
+    assert config.operations_of("s3") == {"GetObject", "ListObjectsV2"}
+    assert config.operations_of("sqs") is None
+    assert BotogenConfig(services=["s3"]).operations_of("s3") is None
+
+    with pytest.raises(AssertionError):
+        BotogenConfig(services=["s3"], operations="GetObject")
+
+
+def test_unknown_operations_are_rejected(botogen):
+    subset_botogen = Botogen(services=["s3"], operations=["s3:GetObject", "s3:GetObjects"], yapf_style=None)
+    with pytest.raises(ValueError, match="GetObjects"):
+        ServiceGenerator(service_name="s3", botogen=subset_botogen)
+
+
+def test_operations_of_unknown_services_are_rejected(tmp_path):
+    for services in (["*"], ["s3"]):
+        subset_botogen = Botogen(
+            services=services, operations="s3:GetObject,sqss:*", yapf_style=None, build_dir=tmp_path,
+        )
+        with pytest.raises(ValueError, match="sqss"):
+            subset_botogen.run()
+
+
+def test_only_services_of_selected_operations_are_generated(subset_botogen):
+    run_in_new_interpreter(subset_botogen, """
+        from autoboto import services
+
+        assert services.__all__ == ["s3", "sqs"]
+    """)
+
+
+def test_only_selected_operations_and_their_shapes_are_generated(subset_botogen):
+    s3 = subset_botogen.import_generated_autoboto_module("services.s3")
+    assert hasattr(s3.Client, "list_buckets")
+    assert hasattr(s3.Client, "get_bucket_location")
+    assert not hasattr(s3.Client, "get_object")
+
+    assert {"ListBucketsOutput", "Bucket", "Owner", "GetBucketLocationRequest", "BucketLocationConstraint"} <= set(
+        name for name in dir(s3.shapes) if not name.startswith("_")
+    )
+    assert not hasattr(s3.shapes, "GetObjectRequest")
+    assert not hasattr(s3.shapes, "NoSuchKey")
+
+    sqs = subset_botogen.import_generated_autoboto_module("services.sqs")
+    assert hasattr(sqs.Client, "send_message")
+    assert hasattr(sqs.shapes, "SendMessageRequest")
+
+
+def test_selected_operations_can_be_called(subset_botogen):
+    s3 = subset_botogen.import_generated_autoboto_module("services.s3")
+    client = s3.Client(region_name="us-east-1")
+    with Stubber(client._boto_client) as stubber:
+        stubber.add_response("get_bucket_location", {"LocationConstraint": "eu-west-1"}, {"Bucket": "b"})
+        location = client.get_bucket_location(bucket="b")
+
+    assert location.location_constraint == "eu-west-1"
@@ -0,0 +1,80 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from botogen.autoboto_template.core import Pipeline, PipelineCancelled
+
+
+def test_pipeline_runs_items_through_stages():
+    sunk = []
+    pipeline = (
+        Pipeline(max_queue_size=2)
+        .source([[1, 2, 3], [4, 5], [6, 7, 8, 9]])
+        .flat_map(lambda page: page)
+        .filter(lambda x: x % 2)
+        .map(lambda x: x * 10, concurrency=3)
+        .batch(2)
+        .sink(sunk.append)
+    )
+
+    assert pipeline.run() == []
+    assert sorted(x for batch in sunk for x in batch) == [10, 30, 50, 70, 90]
+    assert sorted(len(batch) for batch in sunk) == [1, 2, 2]
+
+    stats = {s.name: s for s in pipeline.stats}
+    assert stats["source"].num_out == 3
+    assert stats["flat_map"].num_out == 9
+    assert stats["filter"].num_out == 5
+    assert stats["map"].num_in == 5
+    assert stats["batch"].num_out == 3
+    assert stats["sink"].num_in == 3
+    assert all(s.max_queue_depth <= 2 for s in stats.values())
+
+
+def test_pipeline_returns_output_of_last_stage():
+    assert sorted(Pipeline().source(range(5)).map(lambda x: x + 1, concurrency=2).run()) == [1, 2, 3, 4, 5]
+
+
+def test_pipeline_results_can_be_iterated_without_collecting_them():
+    produced = []
+
+    def source():
+        for i in itertools.count():
+            produced.append(i)
+            yield i
+
+    pipeline = Pipeline(max_queue_size=2, poll_interval=0.01).source(source()).map(lambda x: x * 2)
+    results = pipeline.iter_results()
+    assert [next(results) for _ in range(3)] == [0, 2, 4]
+    time.sleep(0.05)
+    # At most the items in the queues and in the hands of the stages
+    assert len(produced) <= 3 + 2 * 2 + 3
+
+    results.close()
+    assert pipeline.is_cancelled
+
+
+def test_pipeline_can_be_cancelled():
+    def endless():
+        i = 0
+        while True:
+            i += 1
+            yield i
+
+    pipeline = Pipeline(max_queue_size=5, poll_interval=0.01).source(endless()).sink(lambda x: time.sleep(0.001))
+    threading.Timer(0.1, pipeline.cancel).start()
+
+    with pytest.raises(PipelineCancelled):
+        pipeline.run()
+
+
+def test_pipeline_stops_on_stage_error():
+    def fail(x):
+        if x == 3:
+            raise ValueError(x)
+        return x
+
+    with pytest.raises(ValueError):
+        Pipeline(poll_interval=0.01).source(range(100)).map(fail).run()
@@ -0,0 +1,73 @@
+import types
+
+from botocore.hooks import HierarchicalEmitter
+
+from botogen.autoboto_template.core import AdaptiveRateController
+
+
+def test_bucket_does_not_limit_until_throttled():
+    controller = AdaptiveRateController()
+    bucket = controller.get_bucket(("s3", "us-east-1", "GetObject"))
+
+    for _ in range(100):
+        assert bucket.acquire() == 0.0
+
+    assert bucket.get_metrics().rate is None
+    assert bucket.get_metrics().num_waits == 0
+
+
+def test_bucket_rate_is_aimd():
+    controller = AdaptiveRateController(min_rate=1.0, additive_increase=1.0, multiplicative_decrease=0.5)
+    bucket = controller.get_bucket(("s3", "us-east-1", "GetObject"))
+    bucket.rate = 10.0
+
+    bucket.on_throttle()
+    assert bucket.rate == 5.0
+
+    bucket.on_success()
+    bucket.on_success()
+    assert bucket.rate == 7.0
+
+    for _ in range(10):
+        bucket.on_throttle()
+    assert bucket.rate == 1.0
+
+
+def test_throttled_bucket_makes_callers_wait():
+    controller = AdaptiveRateController(min_rate=100.0)
+    key = ("s3", "us-east-1", "GetObject")
+    bucket = controller.get_bucket(key)
+    bucket.on_throttle()
+
+    waited = sum(bucket.acquire() for _ in range(5))
+    assert waited > 0
+
+    metrics = controller.get_metrics()[key]
+    assert metrics.num_throttles == 1
+    assert metrics.num_waits > 0
+    assert metrics.total_wait_time == waited
+
+
+def test_registers_on_boto_client_events():
+    controller = AdaptiveRateController()
+    boto_client = types.SimpleNamespace(
+        meta=types.SimpleNamespace(events=HierarchicalEmitter(), region_name="eu-west-1"),
+    )
+    controller.register(boto_client, "s3")
+
+    operation = types.SimpleNamespace(name="GetObject")
+    boto_client.meta.events.emit("before-send.s3.GetObject", request=None)
+    boto_client.meta.events.emit(
+        "needs-retry.s3.GetObject",
+        response=(None, {"Error": {"Code": "SlowDown"}}),
+        operation=operation,
+        attempts=1,
+        caught_exception=None,
+        request_dict={},
+        endpoint=None,
+    )
+
+    metrics = controller.get_metrics()[("s3", "eu-west-1", "GetObject")]
+    assert metrics.num_requests == 1
+    assert metrics.num_throttles == 1
+    assert metrics.rate is not None
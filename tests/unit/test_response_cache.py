@@ -0,0 +1,92 @@
+import time
+import types
+
+from botogen.autoboto_template.core import CachePolicy, ResponseCache
+
+
+class FakeClient:
+    _service_name = "cloudformation"
+    _boto_client = types.SimpleNamespace(meta=types.SimpleNamespace(region_name="eu-west-1"))
+    _read_only_operations = frozenset(["describe_stacks"])
+
+    def __init__(self):
+        self.requests = []
+
+    def _send_request(self, method_name, params):
+        self.requests.append((method_name, params))
+        return {"Version": len(self.requests)}
+
+
+class FakeOutput(dict):
+    @classmethod
+    def from_boto(cls, payload):
+        return cls(payload)
+
+
+def test_fresh_responses_are_served_from_cache():
+    client = FakeClient()
+    cache = ResponseCache(policies={"describe_stacks": CachePolicy(ttl=60)})
+
+    first = cache.get_response(client, "describe_stacks", {"StackName": "a"}, FakeOutput)
+    second = cache.get_response(client, "describe_stacks", {"StackName": "a"}, FakeOutput)
+    other = cache.get_response(client, "describe_stacks", {"StackName": "b"}, FakeOutput)
+
+    assert first is second
+    assert other["Version"] == 2
+    assert len(client.requests) == 2
+    assert cache.stats["describe_stacks"].hits == 1
+    assert cache.stats["describe_stacks"].misses == 2
+
+
+def test_raw_responses_are_converted_on_every_hit():
+    client = FakeClient()
+    cache = ResponseCache(policies={"describe_stacks": CachePolicy(ttl=60, store="raw")})
+
+    first = cache.get_response(client, "describe_stacks", {}, FakeOutput)
+    second = cache.get_response(client, "describe_stacks", {}, FakeOutput)
+
+    assert first == second
+    assert first is not second
+    assert len(client.requests) == 1
+
+
+def test_least_recently_used_responses_are_evicted():
+    client = FakeClient()
+    cache = ResponseCache(policies={"describe_stacks": CachePolicy(ttl=60, max_size=2)})
+
+    for name in ["a", "b", "a", "c", "a", "b"]:
+        cache.get_response(client, "describe_stacks", {"StackName": name}, FakeOutput)
+
+    assert [params["StackName"] for _, params in client.requests] == ["a", "b", "c", "b"]
+    assert cache.stats["describe_stacks"].evictions == 2
+
+
+def test_stale_response_is_served_while_revalidating():
+    client = FakeClient()
+    cache = ResponseCache(policies={"describe_stacks": CachePolicy(ttl=0.01, stale_while_revalidate=60)})
+
+    assert cache.get_response(client, "describe_stacks", {}, FakeOutput)["Version"] == 1
+    time.sleep(0.02)
+    assert cache.get_response(client, "describe_stacks", {}, FakeOutput)["Version"] == 1
+
+    for _ in range(100):
+        if len(client.requests) == 2:
+            break
+        time.sleep(0.01)
+    assert cache.get_response(client, "describe_stacks", {}, FakeOutput)["Version"] == 2
+    assert cache.stats["describe_stacks"].stale_hits == 1
+
+
+def test_mutating_calls_invalidate_related_responses():
+    client = FakeClient()
+    cache = ResponseCache(
+        policies={"describe_stacks": CachePolicy(ttl=60)},
+        invalidations={"update_stack": ["describe_stacks"]},
+    )
+
+    cache.get_response(client, "describe_stacks", {}, FakeOutput)
+    cache.get_response(client, "update_stack", {"StackName": "a"}, None)
+    cache.get_response(client, "describe_stacks", {}, FakeOutput)
+
+    assert [method_name for method_name, _ in client.requests] == ["describe_stacks", "update_stack", "describe_stacks"]
+    assert cache.stats["describe_stacks"].invalidations == 1
@@ -0,0 +1,47 @@
+import pytest
+from botocore.stub import Stubber
+
+
+@pytest.fixture
+def s3(botogen):
+    return botogen.import_generated_autoboto_module("services.s3")
+
+
+def test_read_only_operations(s3):
+    assert "get_object" in s3.Client._read_only_operations
+    assert "list_buckets" in s3.Client._read_only_operations
+    assert "put_object" not in s3.Client._read_only_operations
+
+
+def test_operation_returns_output_shape(s3):
+    client = s3.Client(region_name="us-east-1")
+    with Stubber(client._boto_client) as stubber:
+        stubber.add_response("get_bucket_location", {"LocationConstraint": "eu-west-1"}, {"Bucket": "b"})
+        location = client.get_bucket_location(bucket="b")
+
+    assert isinstance(location, s3.shapes.GetBucketLocationOutput)
+    assert location.location_constraint == "eu-west-1"
+
+
+def test_operation_with_hedging_policy(s3, autoboto):
+    client = s3.Client(region_name="us-east-1", hedging_policy=autoboto.HedgingPolicy(min_samples=1))
+    with Stubber(client._boto_client) as stubber:
+        for _ in range(2):
+            stubber.add_response("get_bucket_location", {"LocationConstraint": "eu-west-1"}, {"Bucket": "b"})
+        for _ in range(2):
+            assert client.get_bucket_location(bucket="b").location_constraint == "eu-west-1"
+
+    assert client._hedging_policy.num_requests == 2
+
+
+def test_operation_with_response_cache(s3, autoboto):
+    client = s3.Client(
+        region_name="us-east-1",
+        response_cache=autoboto.ResponseCache(policies={"get_bucket_location": autoboto.CachePolicy(ttl=60)}),
+    )
+    with Stubber(client._boto_client) as stubber:
+        stubber.add_response("get_bucket_location", {"LocationConstraint": "eu-west-1"}, {"Bucket": "b"})
+        for _ in range(3):
+            assert client.get_bucket_location(bucket="b").location_constraint == "eu-west-1"
+
+    assert client._response_cache.stats["get_bucket_location"].hits == 2
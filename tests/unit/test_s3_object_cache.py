@@ -0,0 +1,94 @@
+import io
+
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from botogen.autoboto_template.core import S3ObjectCache
+
+
+@pytest.fixture
+def s3_client(botogen):
+    return botogen.import_generated_autoboto_module("services.s3").Client(region_name="us-east-1")
+
+
+def add_object_response(stubber, data: bytes, e_tag: str, expected_params=None):
+    stubber.add_response(
+        "get_object",
+        {"Body": StreamingBody(io.BytesIO(data), len(data)), "ETag": e_tag, "ContentLength": len(data)},
+        expected_params or {"Bucket": "b", "Key": "k"},
+    )
+
+
+def test_downloads_and_revalidates(tmp_path, s3_client):
+    cache = S3ObjectCache(tmp_path)
+    with Stubber(s3_client._boto_client) as stubber:
+        add_object_response(stubber, b"hello", '"v1"')
+        stubber.add_client_error(
+            "get_object",
+            service_error_code="304",
+            http_status_code=304,
+            expected_params={"Bucket": "b", "Key": "k", "IfNoneMatch": '"v1"'},
+        )
+        add_object_response(stubber, b"hello world", '"v2"', {"Bucket": "b", "Key": "k", "IfNoneMatch": '"v1"'})
+
+        first = cache.get_object(s3_client, bucket="b", key="k")
+        assert first.read() == b"hello"
+        assert not first.not_modified
+
+        second = cache.get_object(s3_client, bucket="b", key="k")
+        assert second.not_modified
+        assert second.e_tag == '"v1"'
+        assert bytes(second.mmap()) == b"hello"
+
+        third = cache.get_object(s3_client, bucket="b", key="k")
+        assert third.e_tag == '"v2"'
+        assert third.size == 11
+        with third.open() as f:
+            assert f.read() == b"hello world"
+
+    stats = cache.stats
+    assert (stats.misses, stats.revalidations, stats.refreshes) == (1, 1, 1)
+
+
+def test_evicts_least_recently_used(tmp_path, s3_client):
+    cache = S3ObjectCache(tmp_path, max_bytes=10)
+    with Stubber(s3_client._boto_client) as stubber:
+        add_object_response(stubber, b"aaaaaa", '"a"', {"Bucket": "b", "Key": "a"})
+        add_object_response(stubber, b"bbbbbb", '"b"', {"Bucket": "b", "Key": "b"})
+        cache.get_object(s3_client, bucket="b", key="a")
+        cache.get_object(s3_client, bucket="b", key="b")
+
+    assert cache.stats.evictions == 1
+    assert len(list(tmp_path.glob("*.body"))) == 1
+
+
+def test_empty_object(tmp_path, s3_client):
+    cache = S3ObjectCache(tmp_path)
+    with Stubber(s3_client._boto_client) as stubber:
+        add_object_response(stubber, b"", '"e"')
+        assert cache.get_object(s3_client, bucket="b", key="k").mmap() == b""
+
+
+def test_returned_object_stays_readable_when_replaced_or_evicted(tmp_path, s3_client):
+    cache = S3ObjectCache(tmp_path)
+    other_cache = S3ObjectCache(tmp_path)
+    with Stubber(s3_client._boto_client) as stubber:
+        add_object_response(stubber, b"hello", '"v1"')
+        add_object_response(stubber, b"hello world", '"v2"', {"Bucket": "b", "Key": "k", "IfNoneMatch": '"v1"'})
+
+        with cache.get_object(s3_client, bucket="b", key="k") as first:
+            second = other_cache.get_object(s3_client, bucket="b", key="k")
+            assert first.read() == b"hello"
+            assert second.read() == b"hello world"
+
+            other_cache.clear()
+            assert not list(tmp_path.glob("*.body"))
+            assert bytes(first.mmap()) == b"hello"
+            assert second.read() == b"hello world"
+
+            # Readers of the same object keep their own positions.
+            with first.open() as a, first.open() as b:
+                assert a.read(2) == b"he"
+                assert b.read() == b"hello"
+                assert a.read() == b"llo"
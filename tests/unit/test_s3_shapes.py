@@ -180,3 +180,20 @@ def test_create_bucket_request(s3_shapes, bucket_name, location_constraint):
 def test_paginate_method_added_to_output_shapes_that_support_it(s3_shapes):
     assert hasattr(s3_shapes.ListObjectsV2Output, "paginate")
     assert not hasattr(s3_shapes.ListBucketsOutput, "paginate")
+
+
+def test_shapes_behave_as_dataclasses(s3_shapes):
+    bucket = s3_shapes.Bucket(name="a")
+    assert [f.name for f in dataclasses.fields(bucket)] == ["name", "creation_date"]
+    assert [f.name for f in dataclasses.fields(s3_shapes.ListBucketsOutput)] == [
+        "response_metadata", "buckets", "owner",
+    ]
+    assert dataclasses.fields(bucket)[0].default is s3_shapes.ShapeBase.NOT_SET
+    assert not dataclasses.is_dataclass(s3_shapes.ShapeBase)
+
+    assert repr(bucket) == "Bucket(name='a', creation_date=NOT_SET)"
+    assert bucket == s3_shapes.Bucket("a")
+    assert bucket != s3_shapes.Bucket(name="b")
+    assert bucket != s3_shapes.Owner()
+    assert dataclasses.replace(bucket, name="b") == s3_shapes.Bucket(name="b")
+    assert dataclasses.asdict(s3_shapes.Owner(id="1"))["id"] == "1"
@@ -15,3 +15,37 @@ def test_shapes_lookup(botogen):
 
     assert s3.shapes["MFADelete"].is_enum
     assert s3.type_annotation_for_shape("MFADelete") == "typing.Union[str, \"MFADelete\"]"
+
+
+def test_finds_batchable_operations(botogen):
+    ec2 = ServiceGenerator(service_name="ec2", botogen=botogen)
+    batchable = ec2.find_batchable_operations()
+
+    assert batchable["describe_volumes"] == {
+        "id_param": "volume_ids",
+        "result_path": ["volumes"],
+        "result_id_attr": "volume_id",
+        "max_ids": None,
+    }
+    assert batchable["describe_instances"]["result_path"] == ["reservations", "instances"]
+    assert "terminate_instances" not in batchable
+
+
+def test_prunes_shapes_unreachable_from_operations(botogen):
+    apigatewayv2 = ServiceGenerator(service_name="apigatewayv2", botogen=botogen)
+
+    # Shapes of the REST model which the operations don't use
+    assert "CreateApiInput" in apigatewayv2.pruned_shape_names
+    assert "CreateApiInput" not in apigatewayv2.shapes
+    assert "CreateApiRequest" in apigatewayv2.shapes
+    assert "ResponseMetadata" in apigatewayv2.shapes
+
+    # Error shapes are kept
+    assert "NotFoundException" in apigatewayv2.shapes
+
+    for shape in apigatewayv2.shapes.values():
+        assert all(dependency.name in apigatewayv2.shapes for dependency in apigatewayv2._shape_dependencies(shape))
+
+    s3 = ServiceGenerator(service_name="s3", botogen=botogen)
+    assert s3.pruned_shape_names == []
+    assert "NoSuchKey" in s3.shapes
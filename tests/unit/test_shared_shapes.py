@@ -0,0 +1,114 @@
+import typing
+
+import pytest
+from botocore.stub import Stubber
+
+from botogen import Botogen, ServiceGenerator
+from botogen.shared_shapes import SharedShapes
+
+from .doc_helpers import words
+
+
+@pytest.fixture(scope="module", params=[0, 40], ids=["unchunked", "chunked"])
+def dedup_botogen(request, tmp_path_factory, target_dir, target_package) -> Botogen:
+    botogen = Botogen(
+        services=["s3", "sqs"],
+        yapf_style=None,
+        build_dir=tmp_path_factory.mktemp("dedup"),
+        target_dir=target_dir,
+        target_package=f"{target_package}_dedup_{request.param}",
+        dedup_shapes=True,
+        shapes_chunk_size=request.param,
+    )
+    botogen.run()
+    return botogen
+
+
+@pytest.fixture(scope="module")
+def services(dedup_botogen):
+    return dedup_botogen.import_generated_autoboto_module("services")
+
+
+def test_finds_structurally_identical_shapes(botogen):
+    s3 = ServiceGenerator(service_name="s3", botogen=botogen)
+    sqs = ServiceGenerator(service_name="sqs", botogen=botogen)
+    SharedShapes([s3, sqs])
+
+    assert s3.shape_key("ObjectLockMode") == s3.shape_key("ObjectLockRetentionMode")
+    assert s3.shape_key("Bucket") != s3.shape_key("Owner")
+    assert s3.shared_shape_names["ObjectLockRetentionMode"] == "ObjectLockMode"
+
+    # Across services
+    assert sqs.shared_shape_names["QueueDoesNotExist"] == s3.shared_shape_names["NoSuchKey"]
+
+    # Shared structures only refer to shared classes
+    assert "BatchResultErrorEntry" in sqs.shared_shape_names
+    assert "ChangeMessageVisibilityBatchResult" in sqs.shared_shape_names
+
+    # Unique shapes are not shared
+    assert "Bucket" not in s3.shared_shape_names
+
+
+def test_shared_shapes_are_reexported(services):
+    s3_shapes = services.s3.shapes
+    sqs_shapes = services.sqs.shapes
+
+    assert s3_shapes.ObjectLockRetentionMode is s3_shapes.ObjectLockMode
+    assert s3_shapes.ObjectLockMode.__module__.startswith(f"{services.__name__}._shared_shapes")
+    assert s3_shapes.ObjectLockMode.GOVERNANCE == "GOVERNANCE"
+    assert sqs_shapes.QueueDoesNotExist is s3_shapes.NoSuchKey
+    assert "PutObjectAclOutput" in dir(s3_shapes)
+
+
+def test_shared_shapes_behave_as_own_shapes(services, s3_shapes):
+    shapes = services.s3.shapes
+    for name in dir(shapes):
+        shape_type = getattr(shapes, name)
+        if hasattr(shape_type, "_get_boto_mapping") and shape_type.__module__.startswith(services.__name__):
+            typing.get_type_hints(shape_type)
+            for _, _, type_info in shape_type._get_cached_boto_mapping():
+                assert type_info.type is not None
+
+    response = {"Successful": [{"Id": "a"}], "Failed": []}
+    output = services.sqs.shapes.ChangeMessageVisibilityBatchResult.from_boto(response)
+    assert output.successful[0].id == "a"
+    assert output.to_boto() == {"Successful": [{"Id": "a"}], "Failed": []}
+
+    retention = shapes.ObjectLockRetention(mode="GOVERNANCE")
+    assert retention.to_boto() == s3_shapes.ObjectLockRetention(mode="GOVERNANCE").to_boto()
+
+
+def test_client_returns_shared_shapes(services):
+    client = services.s3.Client(region_name="us-east-1")
+    with Stubber(client._boto_client) as stubber:
+        stubber.add_response("put_object_acl", {}, {"Bucket": "b", "Key": "k"})
+        output = client.put_object_acl(bucket="b", key="k")
+
+    assert isinstance(output, services.s3.shapes.PutObjectAclOutput)
+    assert typing.get_type_hints(services.s3.Client.put_object_acl)["return"] is services.s3.shapes.PutObjectAclOutput
+
+
+def test_docs_of_shared_shapes_are_external(tmp_path_factory, target_dir, target_package):
+    botogen = Botogen(
+        services=["s3", "sqs"],
+        yapf_style=None,
+        build_dir=tmp_path_factory.mktemp("dedup_external_docs"),
+        target_dir=target_dir,
+        target_package=f"{target_package}_dedup_external_docs",
+        dedup_shapes=True,
+        external_docs=True,
+    )
+    botogen.run()
+    services = botogen.import_generated_autoboto_module("services")
+    shared_shapes = botogen.import_generated_autoboto_module("services._shared_shapes")
+    docs = botogen.import_generated_autoboto_module("core.docs").load_docs(services.__name__)
+    services_dir = botogen.get_autoboto_path("services")
+
+    # Which shared classes are documented depends on the version of the models.
+    class_names = [name.split(".")[1] for name, doc in docs.items() if name.count(".") == 1 and doc]
+    assert class_names
+    for class_name in class_names:
+        doc = docs[f"shapes.{class_name}"]
+        assert getattr(shared_shapes, class_name).__doc__ == doc
+        assert words(doc) not in words((services_dir / "_shared_shapes.py").read_text())
+        assert words(doc) in words((services_dir / "_shared_shapes.pyi").read_text())
@@ -0,0 +1,101 @@
+import stat
+import types
+
+import pytest
+
+from botogen.autoboto_template.core import CachePolicy, SqliteResponseCache
+
+from .test_response_cache import FakeClient, FakeOutput
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "responses.sqlite"
+
+
+def test_responses_are_shared_between_cache_instances(cache_path):
+    policies = {"describe_stacks": CachePolicy(ttl=60)}
+    client = FakeClient()
+
+    first = SqliteResponseCache(cache_path, policies=policies).get_response(
+        client, "describe_stacks", {"StackName": "a"}, FakeOutput,
+    )
+    second_cache = SqliteResponseCache(cache_path, policies=policies)
+    second = second_cache.get_response(client, "describe_stacks", {"StackName": "a"}, FakeOutput)
+
+    assert first == second == {"Version": 1}
+    assert len(client.requests) == 1
+    assert second_cache.stats["describe_stacks"].hits == 1
+
+
+def test_least_recently_used_responses_are_evicted(cache_path):
+    cache = SqliteResponseCache(cache_path, policies={"describe_stacks": CachePolicy(ttl=60, max_size=2)})
+    client = FakeClient()
+
+    for name in ["a", "b", "a", "c", "a", "b"]:
+        cache.get_response(client, "describe_stacks", {"StackName": name}, FakeOutput)
+
+    assert [params["StackName"] for _, params in client.requests] == ["a", "b", "c", "b"]
+    assert cache.stats["describe_stacks"].evictions == 2
+
+
+def test_total_size_is_capped(cache_path):
+    cache = SqliteResponseCache(cache_path, policies={"describe_stacks": CachePolicy(ttl=60)}, max_bytes=1)
+    client = FakeClient()
+
+    cache.get_response(client, "describe_stacks", {"StackName": "a"}, FakeOutput)
+    cache.get_response(client, "describe_stacks", {"StackName": "a"}, FakeOutput)
+
+    assert len(client.requests) == 2
+
+
+def test_invalidation(cache_path):
+    cache = SqliteResponseCache(
+        cache_path,
+        policies={"describe_stacks": CachePolicy(ttl=60)},
+        invalidations={"update_stack": ["describe_stacks"]},
+    )
+    client = FakeClient()
+
+    cache.get_response(client, "describe_stacks", {}, FakeOutput)
+    cache.get_response(client, "update_stack", {}, None)
+    cache.get_response(client, "describe_stacks", {}, FakeOutput)
+
+    assert len(client.requests) == 3
+    assert cache.stats["describe_stacks"].invalidations == 1
+
+
+def test_invalidation_is_scoped_to_service_and_region_of_client(cache_path):
+    cache = SqliteResponseCache(
+        cache_path,
+        policies={"describe_stacks": CachePolicy(ttl=60)},
+        invalidations={"update_stack": ["describe_stacks"], "delete_stack": ["*"]},
+    )
+    client = FakeClient()
+    other_region_client = FakeClient()
+    other_region_client._boto_client = types.SimpleNamespace(meta=types.SimpleNamespace(region_name="us-east-1"))
+
+    for c in (client, other_region_client):
+        cache.get_response(c, "describe_stacks", {}, FakeOutput)
+    cache.get_response(client, "update_stack", {}, None)
+    cache.get_response(client, "delete_stack", {}, None)
+    for c in (client, other_region_client):
+        cache.get_response(c, "describe_stacks", {}, FakeOutput)
+
+    assert [method_name for method_name, _ in client.requests].count("describe_stacks") == 2
+    assert len(other_region_client.requests) == 1
+    assert cache.stats["describe_stacks"].invalidations == 1
+
+
+def test_database_is_private_to_owner(tmp_path):
+    cache_path = tmp_path / "cache" / "responses.sqlite"
+    cache = SqliteResponseCache(cache_path, policies={"describe_stacks": CachePolicy(ttl=60)})
+    cache.get_response(FakeClient(), "describe_stacks", {"StackName": "a"}, FakeOutput)
+
+    assert stat.S_IMODE(cache_path.parent.stat().st_mode) == 0o700
+    for path in cache_path.parent.iterdir():
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600, path
+
+    cache_path.chmod(0o666)
+    with pytest.raises(PermissionError):
+        SqliteResponseCache(cache_path, policies={})
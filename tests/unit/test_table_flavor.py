@@ -0,0 +1,92 @@
+import dataclasses
+import inspect
+import pydoc
+import typing
+
+import pytest
+from botocore.stub import Stubber
+
+from botogen import Botogen
+
+from .doc_helpers import doc_text, words
+
+
+@pytest.fixture(scope="module")
+def table_botogen(tmp_path_factory, target_dir, target_package) -> Botogen:
+    botogen = Botogen(
+        services=["s3"],
+        yapf_style=None,
+        build_dir=tmp_path_factory.mktemp("table"),
+        target_dir=target_dir,
+        target_package=f"{target_package}_table",
+        flavor="table",
+    )
+    botogen.run()
+    return botogen
+
+
+@pytest.fixture(scope="module")
+def s3(table_botogen):
+    return table_botogen.import_generated_autoboto_module("services.s3")
+
+
+def test_modules_are_generated_from_table(table_botogen):
+    service_dir = table_botogen.get_autoboto_path("services/s3")
+    assert (service_dir / "table.marshal").exists()
+    assert "class Bucket(ShapeBase)" in (service_dir / "shapes.pyi").read_text()
+    assert "def list_buckets(self" in (service_dir / "client.pyi").read_text()
+    assert "class " not in (service_dir / "shapes.py").read_text()
+    assert "class " not in (service_dir / "client.py").read_text()
+
+
+def test_shapes_behave_as_generated_classes(s3, s3_shapes, s3_model):
+    response = {
+        "Buckets": [{"Name": "a"}, {"Name": "b"}],
+        "Owner": {"DisplayName": "x", "ID": "1"},
+    }
+    output = s3.shapes.ListBucketsOutput.from_boto(response)
+    assert output.to_boto() == s3_shapes.ListBucketsOutput.from_boto(response).to_boto()
+    assert output.owner == s3.shapes.Owner(display_name="x", id="1")
+    assert output.owner != s3.shapes.Owner(display_name="x")
+    assert repr(s3.shapes.Bucket("a")) == repr(s3_shapes.Bucket("a"))
+    assert s3.shapes.BucketVersioningStatus.Enabled == "Enabled"
+    assert issubclass(s3.shapes.ListBucketsOutput, s3.shapes.OutputShapeBase)
+
+    assert [f.name for f in dataclasses.fields(s3.shapes.ListBucketsOutput)] == [
+        "response_metadata", "buckets", "owner",
+    ]
+    assert typing.get_type_hints(s3.shapes.ListBucketsOutput)["buckets"] == typing.List[s3.shapes.Bucket]
+    assert words(s3.shapes.CORSRule.__doc__) == doc_text(s3_model, s3_model.shapes["CORSRule"].documentation)
+
+    with pytest.raises(TypeError):
+        s3.shapes.Bucket(nme="a")
+    with pytest.raises(AttributeError):
+        s3.shapes.NoSuchShape
+
+
+def test_client_dispatches_operations(s3):
+    client = s3.Client(region_name="us-east-1")
+    with Stubber(client._boto_client) as stubber:
+        stubber.add_response("get_bucket_location", {"LocationConstraint": "eu-west-1"}, {"Bucket": "b"})
+        location = client.get_bucket_location(bucket="b")
+
+    assert isinstance(location, s3.shapes.GetBucketLocationOutput)
+    assert location.location_constraint == "eu-west-1"
+    assert "get_object" in s3.Client._read_only_operations
+
+    with pytest.raises(TypeError):
+        client.get_bucket_location()
+
+
+def test_client_methods_are_introspectable(s3, botogen, s3_model):
+    assert typing.get_type_hints(s3.Client.list_buckets)["return"] is s3.shapes.ListBucketsOutput
+
+    classes_s3 = botogen.import_generated_autoboto_module("services.s3")
+    signature = inspect.signature(s3.Client(region_name="us-east-1").get_bucket_location)
+    classes_signature = inspect.signature(classes_s3.Client(region_name="us-east-1").get_bucket_location)
+    assert [(p.name, p.kind) for p in signature.parameters.values()] == [
+        (p.name, p.kind) for p in classes_signature.parameters.values()
+    ]
+    assert signature.parameters["bucket"].default is inspect.Parameter.empty
+    list_buckets_doc = doc_text(s3_model, s3_model.operations["ListBuckets"].documentation)
+    assert list_buckets_doc in words(pydoc.render_doc(s3.Client, renderer=pydoc.plaintext))
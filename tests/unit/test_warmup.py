@@ -0,0 +1,11 @@
+def test_warmup(autoboto, s3_shapes):
+    report = autoboto.warmup(services=["s3"], freeze_gc=False)
+
+    assert report.services == ["s3"]
+    assert report.num_shapes > 100
+    assert not report.gc_frozen
+    assert "_boto_mapping" in s3_shapes.ListBucketsOutput.__dict__
+
+
+def test_warmup_all_services(autoboto):
+    assert autoboto.warmup(freeze_gc=False).services == ["s3"]